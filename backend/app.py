@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -7,6 +7,22 @@ import time
 import logging
 from datetime import datetime
 import os
+import atexit
+import threading
+import json
+
+from browser_profile import HEADLESS_ARGUMENT, apply_lean_profile, block_requests
+from cache import ResultCache, playlist_id
+from driver_pool import DriverPool, PoolExhausted
+from jobs import DONE, JobManager, QueueFull
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, Registry, chrome_processes
+from phase_timer import PhaseTimer
+from playlist_catalog import PlaylistCatalog
+from playlist_dom import (
+    RENDERER_SELECTOR, ScrollStats, harvest_and_prune, harvest_rows, playlist_counts,
+    prepare_adaptive_wait, scroll_and_wait
+)
+from youtube_http import PlaylistHTTPClient
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -15,105 +31,398 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Permitir requests desde cualquier dominio
 
+# Motor por defecto: 'selenium' (Chrome headless) o 'http' (sin navegador)
+DEFAULT_ENGINE = os.environ.get('EXTRACTOR_ENGINE', 'selenium')
+
+# Perfil lean de Chrome: sin imágenes, media, fuentes ni anuncios (LEAN_BROWSER=0 lo desactiva)
+LEAN_BROWSER = os.environ.get('LEAN_BROWSER', '1') != '0'
+
+# Lectura de videos en Chrome: 'prune' quita del DOM lo ya leído (memoria acotada
+# en playlists enormes), 'incremental' lo deja
+HARVEST_MODE = os.environ.get('HARVEST_MODE', 'incremental')
+
+# Pool de navegadores pre-arrancados (DRIVER_POOL_SIZE=0 lo desactiva)
+DRIVER_POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', 2))
+DRIVER_MAX_USES = int(os.environ.get('DRIVER_MAX_USES', 20))
+DRIVER_LEASE_TIMEOUT = float(os.environ.get('DRIVER_LEASE_TIMEOUT', 30))
+
+# Extracciones en segundo plano (POST /jobs)
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', max(DRIVER_POOL_SIZE, 1)))
+JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', 20))
+JOB_TTL = int(os.environ.get('JOB_TTL', 3600))
+
+# Caché de resultados por playlist (CACHE_TTL=0 la desactiva)
+CACHE_TTL = int(os.environ.get('CACHE_TTL', 3600))
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 100))
+CACHE_MAX_MB = float(os.environ.get('CACHE_MAX_MB', 64))
+CACHE_DIR = os.environ.get('CACHE_DIR') or None
+
+# Catálogo SQLite de playlists extraídas (vacío = desactivado)
+CATALOG_PATH = os.environ.get('CATALOG_PATH') or None
+
 class PlaylistExtractor:
     """Extractor de playlists usando Selenium"""
     
-    def __init__(self):
+    def __init__(self, harvest_mode=HARVEST_MODE, scroll_wait='adaptive', scroll_timeout=10,
+                 driver_pool=None):
+        """
+        Args:
+            harvest_mode: 'incremental' (videos nuevos tras cada scroll),
+                'prune' (como incremental, quitando del DOM lo ya cosechado),
+                'bulk' (un solo execute_script al final) o 'elements' (por elemento)
+            scroll_wait: 'adaptive' (espera hasta que carguen videos nuevos o
+                desaparezca la continuación) o 'fixed' (2 segundos por scroll)
+            scroll_timeout: Espera máxima por scroll en modo 'adaptive' (segundos)
+            driver_pool: DriverPool del que tomar prestado el navegador; sin
+                pool se arranca y cierra un Chrome por extracción
+        """
+        self.harvest_mode = harvest_mode
+        self.driver_pool = driver_pool
+        self.scroll_wait = scroll_wait
+        self.scroll_timeout = scroll_timeout
+        self.scroll_stats = None
         self.videos = []
         self.duplicates = set()
+        self.on_video = None
+        self.on_progress = None
+        self.phase_timer = PhaseTimer()
+        self._harvested = 0
+        self.reported_total = None  # Total según la cabecera de la playlist
+        self.hidden_videos = 0  # Videos no disponibles que la playlist oculta
         
-    def _init_driver(self):
-        """Inicializa Chrome en modo headless"""
+    @staticmethod
+    def _init_driver():
+        """Inicializa Chrome en modo headless (con el perfil lean si LEAN_BROWSER)"""
         options = Options()
-        options.add_argument('--headless')
+        options.add_argument(HEADLESS_ARGUMENT if LEAN_BROWSER else '--headless')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--disable-gpu')
         options.add_argument('--disable-software-rasterizer')
         options.add_argument('--disable-extensions')
         options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        if LEAN_BROWSER:
+            apply_lean_profile(options)
         
         # Para Render/Railway
         options.binary_location = os.environ.get('GOOGLE_CHROME_BIN', '/usr/bin/google-chrome')
         
         driver = webdriver.Chrome(options=options)
+        if LEAN_BROWSER:
+            block_requests(driver)
         return driver
     
-    def extract(self, playlist_url, max_scrolls=20):
+    def extract(self, playlist_url, max_scrolls=None, on_video=None, on_progress=None):
         """
         Extrae todos los videos de una playlist
         
+        El scroll termina al cargar el total de la cabecera de la playlist
+        (menos los videos no disponibles ocultos) o cuando ya no hay
+        continuación, lo que ocurra primero.
+        
         Args:
             playlist_url: URL de la playlist
-            max_scrolls: Máximo de scrolls (para evitar loops infinitos)
+            max_scrolls: Tope de scrolls (None = sin tope)
+            on_video: Callback que recibe cada video en cuanto se cosecha
+            on_progress: Callback con argumentos nombrados (scrolls, loaded,
+                videos) tras cada scroll
         
         Returns:
             dict con videos y metadata
+        
+        Raises:
+            PoolExhausted: Si hay pool y todos sus navegadores siguen ocupados
         """
         logger.info(f"Iniciando extracción de: {playlist_url}")
+        self.on_video = on_video
+        self.on_progress = on_progress
+        self._harvested = 0
+        self.phase_timer = PhaseTimer()
+        self._set_counts(None)
+        
+        if self.driver_pool is not None:
+            try:
+                lease_start = time.perf_counter()
+                with self.driver_pool.lease() as driver:
+                    # Espera de un navegador libre (o arranque de uno nuevo)
+                    self.phase_timer.add('driver_start', time.perf_counter() - lease_start)
+                    return self._extract_with_driver(driver, playlist_url, max_scrolls)
+            except PoolExhausted:
+                raise
+            except Exception as e:
+                logger.error(f"Error durante extracción: {e}")
+                return self._error_result(e)
         
         driver = None
         try:
-            driver = self._init_driver()
+            with self.phase_timer.phase('driver_start'):
+                driver = self._init_driver()
+            return self._extract_with_driver(driver, playlist_url, max_scrolls)
+        except Exception as e:
+            logger.error(f"Error durante extracción: {e}")
+            return self._error_result(e)
+        finally:
+            if driver:
+                driver.quit()
+    
+    def _extract_with_driver(self, driver, playlist_url, max_scrolls):
+        """
+        Carga la playlist en `driver`, hace scroll y cosecha los videos
+        
+        Los errores se propagan: con pool, lease() descarta el driver en lugar
+        de devolverlo a los libres, y extract() los convierte en el resultado
+        con success False.
+        """
+        timer = self.phase_timer
+        with timer.phase('page_load'):
             driver.get(playlist_url)
             logger.info("Página cargada, esperando contenido...")
             time.sleep(3)
-            
-            # Scroll infinito
-            last_height = driver.execute_script("return document.documentElement.scrollHeight")
+            self._set_counts(*playlist_counts(driver))
+        target = self._listed_total()
+        
+        # Scroll infinito
+        with timer.phase('scroll'):
+            adaptive = self.scroll_wait == 'adaptive'
+            self.scroll_stats = ScrollStats(self.scroll_wait)
+            if adaptive:
+                prepare_adaptive_wait(driver, self.scroll_timeout)
+            else:
+                last_height = driver.execute_script("return document.documentElement.scrollHeight")
             scroll_count = 0
             no_new_count = 0
             
-            while scroll_count < max_scrolls:
-                # Contar videos actuales
-                items = driver.find_elements(By.CSS_SELECTOR, "ytd-playlist-video-renderer")
-                current_count = len(items)
+            while max_scrolls is None or scroll_count < max_scrolls:
+                # Contar videos actuales (en modo incremental o prune, cosechando los nuevos)
+                if self.harvest_mode in ('incremental', 'prune'):
+                    self._harvest_new(driver)
+                    current_count = self._harvested
+                else:
+                    items = driver.find_elements(By.CSS_SELECTOR, RENDERER_SELECTOR)
+                    current_count = len(items)
                 
                 logger.info(f"Scroll {scroll_count + 1}: {current_count} videos")
                 
-                # Scroll
-                driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-                time.sleep(2)
+                # Lista completa según la cabecera: no hace falta otro scroll
+                if target and current_count >= target:
+                    logger.info(f"Se alcanzó el total de la cabecera: {target} videos")
+                    self.scroll_stats.end_reason = 'expected'
+                    break
                 
-                # Verificar nueva altura
-                new_height = driver.execute_script("return document.documentElement.scrollHeight")
+                step_start = time.perf_counter()
                 
-                if new_height == last_height:
-                    no_new_count += 1
-                    if no_new_count >= 5:
-                        logger.info("No hay más videos para cargar")
+                if adaptive:
+                    # Scroll y espera hasta que haya videos nuevos o termine la lista
+                    # En modo prune el DOM quedó vacío: cualquier renderer es nuevo
+                    known = 0 if self.harvest_mode == 'prune' else current_count
+                    state = scroll_and_wait(driver, known, self.scroll_timeout)
+                    self.scroll_stats.record(time.perf_counter() - step_start, state['reason'] == 'grew')
+                    
+                    if state['reason'] == 'end':
+                        logger.info("No hay más videos para cargar (sin continuación)")
+                        self.scroll_stats.end_reason = 'continuation'
                         break
+                    
+                    if state['reason'] == 'timeout':
+                        no_new_count += 1
+                        if no_new_count >= 2:
+                            logger.info("No hay más videos para cargar (timeout)")
+                            self.scroll_stats.end_reason = 'timeout'
+                            break
+                    else:
+                        no_new_count = 0
                 else:
-                    no_new_count = 0
+                    # Scroll
+                    driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
+                    time.sleep(2)
+                    
+                    # Verificar nueva altura
+                    new_height = driver.execute_script("return document.documentElement.scrollHeight")
+                    self.scroll_stats.record(time.perf_counter() - step_start, new_height != last_height)
+                    
+                    if new_height == last_height:
+                        no_new_count += 1
+                        if no_new_count >= 5:
+                            logger.info("No hay más videos para cargar")
+                            self.scroll_stats.end_reason = 'height'
+                            break
+                    else:
+                        no_new_count = 0
+                    
+                    last_height = new_height
                 
-                last_height = new_height
                 scroll_count += 1
+                if self.on_progress:
+                    self.on_progress(scrolls=scroll_count, loaded=current_count, videos=len(self.videos))
             
-            # Extraer información
-            items = driver.find_elements(By.CSS_SELECTOR, "ytd-playlist-video-renderer")
-            logger.info(f"Extrayendo información de {len(items)} videos...")
-            
-            for idx, item in enumerate(items, 1):
-                try:
-                    title_elem = item.find_element(By.ID, "video-title")
-                    title = title_elem.text.strip()
-                    url = title_elem.get_attribute("href")
-                    video_id = url.split('v=')[1].split('&')[0] if 'v=' in url else ""
-                    
-                    if video_id and video_id not in self.duplicates:
-                        self.videos.append({
-                            "index": idx,
-                            "title": title,
-                            "video_id": video_id,
-                            "url": f"https://www.youtube.com/watch?v={video_id}",
-                            "extracted_at": datetime.now().isoformat()
-                        })
-                        self.duplicates.add(video_id)
-                except Exception as e:
-                    logger.error(f"Error extrayendo video {idx}: {e}")
-                    continue
+            if self.scroll_stats.end_reason is None:
+                self.scroll_stats.end_reason = 'max_scrolls'
+            logger.info(f"Scroll: {self.scroll_stats.summary()}")
+        
+        # Extraer información
+        with timer.phase('parse'):
+            if self.harvest_mode in ('incremental', 'prune'):
+                # Solo lo que apareció después del último scroll
+                self._harvest_new(driver)
+            elif self.harvest_mode == 'bulk':
+                self._harvest_bulk(driver)
+            else:
+                self._harvest_elements(driver)
+        
+        logger.info(f"Extracción completada: {len(self.videos)} videos únicos")
+        logger.info(f"Fases: {timer.summary()}")
+        
+        return {
+            "success": True,
+            "total_videos": len(self.videos),
+            "videos": self.videos,
+            "metadata": {
+                "extraction_date": datetime.now().isoformat(),
+                "duplicates_removed": len(self.duplicates) - len(self.videos),
+                **self._header_metadata(),
+                "scroll": self.scroll_stats.as_dict(),
+                "timing": timer.as_dict(),
+                "engine": "selenium"
+            }
+        }
+    
+    def _set_counts(self, total, hidden=0):
+        """Guarda el total de la cabecera y los videos no disponibles ocultos"""
+        self.reported_total = total
+        self.hidden_videos = hidden
+        if total is not None:
+            logger.info(f"La playlist reporta {total} videos ({hidden} ocultos)")
+    
+    def _listed_total(self):
+        """Videos que la playlist muestra (None si la cabecera no trae el total)"""
+        if self.reported_total is None:
+            return None
+        return self.reported_total - self.hidden_videos
+    
+    def _header_metadata(self):
+        """Total de la cabecera, videos ocultos y los que faltan respecto de ella"""
+        missing = None
+        if self.reported_total is not None:
+            missing = self.reported_total - len(self.videos)
+            if missing > self.hidden_videos:
+                logger.warning(f"Faltan {missing} videos respecto de la cabecera "
+                               f"({self.reported_total}, {self.hidden_videos} ocultos)")
+        return {
+            "reported_total": self.reported_total,
+            "hidden_videos": self.hidden_videos,
+            "missing_videos": missing
+        }
+    
+    @staticmethod
+    def _error_result(error):
+        return {
+            "success": False,
+            "error": str(error),
+            "total_videos": 0,
+            "videos": []
+        }
+    
+    def _harvest_new(self, driver):
+        """Cosecha solo los renderers que aparecieron desde la última llamada"""
+        with self.phase_timer.phase('parse'):
+            if self.harvest_mode == 'prune':
+                rows = harvest_and_prune(driver, self._harvested)
+            else:
+                rows = harvest_rows(driver, self._harvested)
+            self._harvested += len(rows)
+            self._add_rows(rows)
+    
+    def _harvest_bulk(self, driver):
+        """Lee todos los videos con un único execute_script"""
+        rows = harvest_rows(driver)
+        logger.info(f"Extrayendo información de {len(rows)} videos...")
+        self._add_rows(rows)
+    
+    def _add_rows(self, rows):
+        """Convierte filas de HARVEST_SCRIPT en videos"""
+        for idx, title, _href, video_id, _duration, _thumbnail in rows:
+            if title is None:
+                logger.error(f"Error extrayendo video {idx}: #video-title no encontrado")
+                continue
+            self._add_video(idx, title, video_id)
+    
+    def _harvest_elements(self, driver):
+        """Lee cada video con find_element/.text (varios round-trips por video)"""
+        items = driver.find_elements(By.CSS_SELECTOR, RENDERER_SELECTOR)
+        logger.info(f"Extrayendo información de {len(items)} videos...")
+        
+        for idx, item in enumerate(items, 1):
+            try:
+                title_elem = item.find_element(By.ID, "video-title")
+                title = title_elem.text.strip()
+                url = title_elem.get_attribute("href")
+                video_id = url.split('v=')[1].split('&')[0] if 'v=' in url else ""
+                self._add_video(idx, title, video_id)
+            except Exception as e:
+                logger.error(f"Error extrayendo video {idx}: {e}")
+                continue
+    
+    def _add_video(self, idx, title, video_id):
+        """Agrega un video descartando IDs vacíos y duplicados"""
+        if video_id and video_id not in self.duplicates:
+            video = {
+                "index": idx,
+                "title": title,
+                "video_id": video_id,
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "extracted_at": datetime.now().isoformat()
+            }
+            self.videos.append(video)
+            self.duplicates.add(video_id)
+            if self.on_video:
+                self.on_video(video)
+
+class PlaylistHTTPExtractor(PlaylistExtractor):
+    """Extractor sin navegador: ytInitialData + continuaciones por HTTP"""
+    
+    # Una sesión HTTP por hilo: requests.Session no es segura entre hilos, y
+    # cada hilo de JobManager reutiliza la suya entre jobs (keep-alive)
+    _local = threading.local()
+    
+    @property
+    def client(self):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = PlaylistHTTPClient()
+        return client
+    
+    def extract(self, playlist_url, max_scrolls=None, on_video=None, on_progress=None):
+        """Igual que PlaylistExtractor.extract, sin arrancar Chrome (progreso por página)"""
+        logger.info(f"Iniciando extracción HTTP de: {playlist_url}")
+        self.on_video = on_video
+        self.phase_timer = timer = PhaseTimer()
+        self._set_counts(None)
+        
+        try:
+            pages = self.client.iter_pages(playlist_url, on_total=self._set_counts)
+            page = 0
+            while True:
+                # La primera página es el HTML de la playlist; las siguientes, continuaciones
+                with timer.phase('scroll' if page else 'page_load'):
+                    rows = next(pages, None)
+                if rows is None:
+                    break
+                page += 1
+                
+                with timer.phase('parse'):
+                    self._add_rows(rows)
+                logger.info(f"Página: {len(self.videos)} videos")
+                if on_progress:
+                    on_progress(pages=page, videos=len(self.videos))
+                
+                # Lista completa según la cabecera: no se pide otra continuación
+                target = self._listed_total()
+                if target and len(self.videos) >= target:
+                    logger.info(f"Se alcanzó el total de la cabecera: {target} videos")
+                    break
             
             logger.info(f"Extracción completada: {len(self.videos)} videos únicos")
+            logger.info(f"Fases: {timer.summary()}")
             
             return {
                 "success": True,
@@ -121,21 +430,226 @@ class PlaylistExtractor:
                 "videos": self.videos,
                 "metadata": {
                     "extraction_date": datetime.now().isoformat(),
-                    "duplicates_removed": len(self.duplicates) - len(self.videos)
+                    "duplicates_removed": len(self.duplicates) - len(self.videos),
+                    **self._header_metadata(),
+                    "timing": timer.as_dict(),
+                    "engine": "http"
                 }
             }
             
         except Exception as e:
             logger.error(f"Error durante extracción: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "total_videos": 0,
-                "videos": []
-            }
-        finally:
-            if driver:
-                driver.quit()
+            return self._error_result(e)
+
+EXTRACTORS = {
+    'selenium': PlaylistExtractor,
+    'http': PlaylistHTTPExtractor,
+}
+
+driver_pool = None
+if DRIVER_POOL_SIZE > 0:
+    driver_pool = DriverPool(
+        PlaylistExtractor._init_driver,
+        size=DRIVER_POOL_SIZE,
+        max_uses=DRIVER_MAX_USES,
+        lease_timeout=DRIVER_LEASE_TIMEOUT
+    )
+    driver_pool.warm_up()
+    atexit.register(driver_pool.close)
+
+result_cache = None
+if CACHE_TTL > 0:
+    result_cache = ResultCache(
+        ttl=CACHE_TTL,
+        max_entries=CACHE_MAX_ENTRIES,
+        max_bytes=int(CACHE_MAX_MB * 1024 * 1024),
+        directory=CACHE_DIR
+    )
+
+catalog = PlaylistCatalog(CATALOG_PATH) if CATALOG_PATH else None
+if catalog:
+    atexit.register(catalog.close)
+
+# Métricas de Prometheus (GET /metrics)
+metrics = Registry()
+PHASE_SECONDS = metrics.histogram(
+    'playlist_extraction_phase_seconds',
+    'Duración de cada fase de una extracción (driver_start, page_load, scroll, parse, serialize)',
+    ('engine', 'phase'))
+EXTRACTION_SECONDS = metrics.histogram(
+    'playlist_extraction_seconds', 'Duración total de una extracción', ('engine',))
+EXTRACTIONS_IN_FLIGHT = metrics.gauge(
+    'playlist_extractions_in_flight', 'Extracciones en curso')
+EXTRACTIONS_IN_FLIGHT.set(0)
+EXTRACTIONS = metrics.counter(
+    'playlist_extractions_total', 'Extracciones terminadas por resultado (ok, failed, cache)',
+    ('engine', 'outcome'))
+VIDEOS_EXTRACTED = metrics.counter(
+    'playlist_videos_extracted_total', 'Videos extraídos', ('engine',))
+EXTRACTION_ERRORS = metrics.counter(
+    'playlist_extraction_errors_total', 'Extracciones fallidas por tipo de error', ('engine', 'error'))
+REQUESTS_COALESCED = metrics.counter(
+    'playlist_requests_coalesced_total',
+    'Pedidos que se sumaron a una extracción en curso de la misma playlist en lugar de abrir otro navegador',
+    ('engine',))
+metrics.gauge('chrome_processes', 'Procesos de Chrome vivos', function=chrome_processes)
+metrics.gauge('driver_pool_browsers', 'Navegadores abiertos en el pool',
+              function=lambda: driver_pool.live if driver_pool else None)
+
+def observe_phases(engine, timer):
+    """Registra en los histogramas el tiempo de cada fase de una extracción"""
+    for phase, seconds in timer.seconds.items():
+        PHASE_SECONDS.observe(seconds, engine=engine, phase=phase)
+
+def run_job(job):
+    """Ejecuta la extracción de un job (en un hilo de JobManager)"""
+    key = playlist_id(job.url) if result_cache else None
+    if key and not job.refresh:
+        # Desde /extract la caché ya se consultó (y contó el miss): solo se mira,
+        # sin contar, si otro job guardó el resultado mientras tanto
+        entry = result_cache.peek(key) if job.cache_checked else result_cache.get(key)
+        if entry:
+            logger.info(f"Job {job.id}: resultado en caché para {key}")
+            EXTRACTIONS.inc(engine=job.engine, outcome='cache')
+            return entry.result()
+    
+    extractor = EXTRACTORS[job.engine](driver_pool=driver_pool)
+    EXTRACTIONS_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    try:
+        result = extractor.extract(job.url, on_video=job.add_video, on_progress=job.update_progress)
+    except Exception as e:
+        EXTRACTIONS.inc(engine=job.engine, outcome='failed')
+        EXTRACTION_ERRORS.inc(engine=job.engine, error=type(e).__name__)
+        raise
+    finally:
+        EXTRACTIONS_IN_FLIGHT.dec()
+    
+    EXTRACTION_SECONDS.observe(time.perf_counter() - start, engine=job.engine)
+    if result['success']:
+        EXTRACTIONS.inc(engine=job.engine, outcome='ok')
+        VIDEOS_EXTRACTED.inc(result['total_videos'], engine=job.engine)
+    else:
+        EXTRACTIONS.inc(engine=job.engine, outcome='failed')
+        EXTRACTION_ERRORS.inc(engine=job.engine, error='extraction')
+    
+    if key and result['success']:
+        # Serializa el JSON una vez; /extract responde con esos bytes
+        with extractor.phase_timer.phase('serialize'):
+            result_cache.put(key, result)
+    if catalog and result['success']:
+        with extractor.phase_timer.phase('serialize'):
+            try:
+                catalog.record_playlist(playlist_id(job.url), result['videos'], url=job.url)
+            except Exception as e:
+                # El catálogo es secundario: el job igual devuelve los videos
+                logger.warning(f"Job {job.id}: no se pudo actualizar el catálogo: {e}")
+    observe_phases(job.engine, extractor.phase_timer)
+    return result
+
+job_manager = JobManager(run_job, workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING, ttl=JOB_TTL,
+                         on_coalesced=lambda job: REQUESTS_COALESCED.inc(engine=job.engine))
+atexit.register(job_manager.shutdown)
+
+def parse_extract_request(data):
+    """
+    Valida el body de /extract y /jobs
+    
+    Returns:
+        (url, engine, None) o (None, None, respuesta de error 400)
+    """
+    if not data or 'url' not in data:
+        return None, None, (jsonify({
+            "success": False,
+            "error": "URL de playlist requerida"
+        }), 400)
+    
+    playlist_url = data['url']
+    
+    # Validar URL
+    if 'youtube.com/playlist' not in playlist_url or 'list=' not in playlist_url:
+        return None, None, (jsonify({
+            "success": False,
+            "error": "URL de playlist inválida"
+        }), 400)
+    
+    engine = data.get('engine', DEFAULT_ENGINE)
+    if engine not in EXTRACTORS:
+        return None, None, (jsonify({
+            "success": False,
+            "error": f"Motor inválido: {engine}"
+        }), 400)
+    
+    return playlist_url, engine, None
+
+def cached_response(entry, status):
+    """Respuesta con el JSON en caché, ETag y Last-Modified (304 si el cliente ya lo tiene)"""
+    # make_conditional() solo aplica a GET/HEAD y /extract es POST
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(entry.etag)
+    else:
+        since = request.if_modified_since
+        not_modified = since is not None and int(entry.created) <= since.timestamp()
+    
+    response = Response(b'' if not_modified else entry.body, mimetype='application/json')
+    response.status_code = 304 if not_modified else 200
+    response.set_etag(entry.etag)
+    response.last_modified = entry.created
+    response.cache_control.max_age = max(int(entry.created + result_cache.ttl - time.time()), 0)
+    response.headers['X-Cache'] = status
+    return response
+
+def wants_stream():
+    """True si el cliente pidió NDJSON (?stream=1 o Accept: application/x-ndjson)"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+    return best == 'application/x-ndjson'
+
+def ndjson_response(videos, trailer):
+    """
+    Respuesta NDJSON: un video por línea en cuanto está disponible y al final
+    un registro {"type": "trailer", ...} con el resultado y los metadatos
+    
+    Args:
+        videos: Iterable de videos; None produce una línea vacía (keep-alive)
+        trailer: Función sin argumentos que devuelve el registro final
+    """
+    def stream():
+        for video in videos:
+            if video is None:
+                yield "\n"
+                continue
+            yield json.dumps(video, ensure_ascii=False) + "\n"
+        yield json.dumps({"type": "trailer", **trailer()}, ensure_ascii=False) + "\n"
+    
+    return Response(stream(), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+def job_trailer(job):
+    """Registro final del stream NDJSON de un job"""
+    trailer = {
+        "success": job.status == DONE,
+        "total_videos": len(job.videos),
+        "metadata": (job.result or {}).get('metadata', {})
+    }
+    if job.error:
+        trailer["error"] = job.error
+        if isinstance(job.exception, PoolExhausted):
+            trailer["retry_after"] = 10
+    return trailer
+
+def busy_response(error):
+    """503 con Retry-After cuando no quedan navegadores o la cola está llena"""
+    logger.warning(f"Servidor ocupado: {error}")
+    response = jsonify({
+        "success": False,
+        "error": "Servidor ocupado, intenta de nuevo en unos segundos"
+    })
+    response.headers['Retry-After'] = '10'
+    return response, 503
 
 @app.route('/')
 def home():
@@ -144,52 +658,148 @@ def home():
         "service": "YouTube Playlist Extractor API",
         "version": "1.0.0",
         "endpoints": {
-            "/extract": "POST - Extrae videos de una playlist",
-            "/health": "GET - Verifica el estado del servicio"
+            "/extract": "POST - Extrae videos de una playlist (espera el resultado; ?stream=1 para NDJSON)",
+            "/jobs": "POST - Encola una extracción y devuelve su job_id",
+            "/jobs/<job_id>": "GET - Estado y videos extraídos hasta ahora",
+            "/jobs/<job_id>/events": "GET - Progreso en vivo (server-sent events)",
+            "/cache/stats": "GET - Aciertos y fallos de la caché de resultados",
+            "/catalog/search?q=": "GET - Busca videos extraídos por título (con CATALOG_PATH)",
+            "/catalog/videos/<video_id>": "GET - Playlists que contienen un video",
+            "/catalog/playlists/<playlist_id>": "GET - Videos de una playlist según el catálogo",
+            "/health": "GET - Verifica el estado del servicio",
+            "/metrics": "GET - Métricas de Prometheus (tiempos por fase, extracciones en curso, errores)"
         }
     })
 
 @app.route('/health')
 def health():
     """Health check para Render"""
-    return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
+    return jsonify({
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "lean_browser": LEAN_BROWSER,
+        "harvest_mode": HARVEST_MODE,
+        "driver_pool": driver_pool.stats() if driver_pool else None,
+        "jobs": job_manager.stats(),
+        "cache": result_cache.stats() if result_cache else None
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Métricas en formato de texto de Prometheus"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Contadores de la caché para ajustar CACHE_TTL"""
+    if result_cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **result_cache.stats()})
+
+def catalog_disabled():
+    return jsonify({"success": False, "error": "Catálogo desactivado (definir CATALOG_PATH)"}), 404
+
+@app.route('/catalog/search')
+def catalog_search():
+    """Videos del catálogo cuyo título contiene ?q= (búsqueda de texto completo)"""
+    if catalog is None:
+        return catalog_disabled()
+    limit = min(request.args.get('limit', 20, type=int), 200)
+    return jsonify({"success": True, "videos": catalog.search(request.args.get('q', ''), limit)})
+
+@app.route('/catalog/videos/<video_id>')
+def catalog_video(video_id):
+    """Playlists del catálogo que contienen un video"""
+    if catalog is None:
+        return catalog_disabled()
+    return jsonify({"success": True, "video_id": video_id, "playlists": catalog.playlists_with(video_id)})
+
+@app.route('/catalog/playlists/<list_id>')
+def catalog_playlist(list_id):
+    """Videos de una playlist según su última extracción guardada en el catálogo"""
+    if catalog is None:
+        return catalog_disabled()
+    return jsonify({"success": True, "playlist_id": list_id,
+                    "videos": catalog.playlist_videos(list_id)})
 
 @app.route('/extract', methods=['POST'])
 def extract_playlist():
     """
-    Endpoint principal para extraer playlists
+    Endpoint principal para extraer playlists (espera a que termine el job)
     
     Body JSON:
     {
-        "url": "https://www.youtube.com/playlist?list=..."
+        "url": "https://www.youtube.com/playlist?list=...",
+        "engine": "selenium" | "http",  (opcional, default EXTRACTOR_ENGINE)
+        "refresh": true  (opcional, ignora el resultado en caché)
     }
+    
+    Responde con ETag/Last-Modified; con If-None-Match responde 304.
+    Con ?stream=1 o Accept: application/x-ndjson responde NDJSON: un video
+    por línea en cuanto se cosecha y un registro final {"type": "trailer"}
+    con success, total_videos, metadata y error.
+    
+    Los pedidos que llegan mientras la misma playlist (mismo list=) ya se
+    está extrayendo con el mismo motor se suman a ese job: reciben el mismo resultado o el
+    mismo stream (desde el primer video) sin abrir otro navegador.
     """
     try:
         data = request.get_json()
+        playlist_url, engine, error = parse_extract_request(data)
+        if error:
+            return error
         
-        if not data or 'url' not in data:
-            return jsonify({
-                "success": False,
-                "error": "URL de playlist requerida"
-            }), 400
+        logger.info(f"Request recibido para: {playlist_url} (motor: {engine})")
         
-        playlist_url = data['url']
+        stream = wants_stream()
+        key = playlist_id(playlist_url) if result_cache else None
+        if key and not data.get('refresh'):
+            entry = result_cache.get(key)
+            if entry and stream:
+                cached = entry.result()
+                response = ndjson_response(cached['videos'], lambda: {
+                    "success": True,
+                    "total_videos": cached['total_videos'],
+                    "metadata": cached.get('metadata', {})
+                })
+                response.headers['X-Cache'] = 'HIT'
+                return response
+            if entry:
+                return cached_response(entry, 'HIT')
+        
+        # Extraer playlist (la caché ya se consultó arriba)
+        try:
+            # Si la misma playlist ya se está extrayendo con el mismo motor, se
+            # espera ese job (con refresh, solo si ese job también lo pidió)
+            job = job_manager.submit(playlist_url, engine, refresh=bool(data.get('refresh')),
+                                     key=playlist_id(playlist_url), cache_checked=bool(key))
+        except QueueFull as e:
+            return busy_response(e)
         
-        # Validar URL
-        if 'youtube.com/playlist' not in playlist_url or 'list=' not in playlist_url:
-            return jsonify({
-                "success": False,
-                "error": "URL de playlist inválida"
-            }), 400
+        if stream:
+            return ndjson_response(job.iter_videos(), lambda: job_trailer(job))
         
-        logger.info(f"Request recibido para: {playlist_url}")
+        job.wait()
         
-        # Extraer playlist
-        extractor = PlaylistExtractor()
-        result = extractor.extract(playlist_url)
+        if isinstance(job.exception, PoolExhausted):
+            return busy_response(job.exception)
+        
+        result = job.result or {
+            "success": False,
+            "error": job.error,
+            "total_videos": 0,
+            "videos": []
+        }
         
         if result['success']:
-            return jsonify(result), 200
+            entry = result_cache.peek(key) if key else None
+            if entry:
+                return cached_response(entry, 'MISS')
+            # Sin caché, la serialización ocurre aquí
+            start = time.perf_counter()
+            response = jsonify(result)
+            PHASE_SECONDS.observe(time.perf_counter() - start, engine=engine, phase='serialize')
+            return response, 200
         else:
             return jsonify(result), 500
             
@@ -200,6 +810,78 @@ def extract_playlist():
             "error": str(e)
         }), 500
 
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    """
+    Encola una extracción y responde 202 sin esperar
+    
+    Body JSON: igual que /extract
+    
+    Si la playlist ya se está extrayendo con el mismo motor devuelve el
+    job_id del job en curso (con refresh, solo si ese job también lo pidió).
+    """
+    data = request.get_json(silent=True)
+    playlist_url, engine, error = parse_extract_request(data)
+    if error:
+        return error
+    
+    try:
+        job = job_manager.submit(playlist_url, engine, refresh=bool(data.get('refresh')),
+                                 key=playlist_id(playlist_url))
+    except QueueFull as e:
+        return busy_response(e)
+    
+    response = jsonify({
+        "success": True,
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/jobs/{job.id}",
+        "events_url": f"/jobs/{job.id}/events"
+    })
+    response.headers['Location'] = f"/jobs/{job.id}"
+    return response, 202
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """
+    Estado del job y videos extraídos hasta ahora
+    
+    Query: ?since=N omite los N primeros videos (polling incremental)
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Job no encontrado"}), 404
+    
+    since = request.args.get('since', 0, type=int)
+    return jsonify(job.as_dict(since=max(since, 0))), 200
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Progreso del job como server-sent events
+    
+    Eventos: status (running), progress (scrolls/pages, videos) y done.
+    Respeta Last-Event-ID para reconectar sin repetir eventos.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Job no encontrado"}), 404
+    
+    after = request.headers.get('Last-Event-ID', 0, type=int)
+    
+    def stream():
+        yield "retry: 3000\n\n"
+        for event_id, event, data in job.events(after=after):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+    
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,180 @@
+"""
+Caché de resultados de extracción
+
+Las mismas playlists populares se piden una y otra vez y cada petición
+arranca un scrape completo. ResultCache guarda el JSON de cada extracción
+exitosa por ID de playlist durante `ttl` segundos, con desalojo LRU por
+número de entradas y por bytes, y opcionalmente en disco (`directory`) para
+sobrevivir a reinicios. Cada entrada lleva su ETag y fecha para responder
+304 a los clientes que ya la tienen.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+_PLAYLIST_ID = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def playlist_id(url):
+    """ID normalizado de la playlist (parámetro list=), o None si no hay"""
+    values = parse_qs(urlparse(url.strip()).query).get('list')
+    if not values or not _PLAYLIST_ID.match(values[0]):
+        return None
+    return values[0]
+
+
+class CacheEntry:
+    """Resultado serializado de una extracción"""
+
+    def __init__(self, body, created):
+        self.body = body
+        self.created = created
+        self.etag = hashlib.sha1(body).hexdigest()
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def result(self) -> dict:
+        return json.loads(self.body)
+
+
+class ResultCache:
+    """Caché TTL + LRU en memoria con copia opcional en disco"""
+
+    def __init__(self, ttl=3600, max_entries=100, max_bytes=64 * 1024 * 1024, directory=None):
+        """
+        Args:
+            ttl: Segundos que un resultado se considera fresco
+            max_entries: Máximo de playlists en memoria
+            max_bytes: Máximo de bytes de JSON en memoria
+            directory: Carpeta para el nivel en disco (None = solo memoria)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self._entries = OrderedDict()  # Del menos al más recientemente usado
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """Entrada fresca para `key` o None (cuenta como hit o miss)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self._fresh(entry):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if entry:
+                self._remove(key)
+
+        entry = self._load(key)
+        with self._lock:
+            if entry:
+                self.hits += 1
+                self.disk_hits += 1
+                self._store(key, entry)
+            else:
+                self.misses += 1
+        return entry
+
+    def peek(self, key):
+        """Entrada fresca en memoria sin contar hit/miss ni cambiar el orden LRU"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry if entry and self._fresh(entry) else None
+
+    def put(self, key, result):
+        """Guarda un resultado (dict) y devuelve su CacheEntry"""
+        entry = CacheEntry(json.dumps(result, ensure_ascii=False).encode('utf-8'), time.time())
+        with self._lock:
+            self._store(key, entry)
+        self._save(key, entry)
+        return entry
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "ttl": self.ttl,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "disk": bool(self.directory),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "evictions": self.evictions,
+            }
+
+    def _fresh(self, entry) -> bool:
+        return time.time() - entry.created < self.ttl
+
+    def _store(self, key, entry):
+        # Llamar con self._lock adquirido
+        if key in self._entries:
+            self._remove(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        # Llamar con self._lock adquirido
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            created = os.path.getmtime(path)
+            if time.time() - created >= self.ttl:
+                os.remove(path)
+                return None
+            with open(path, 'rb') as f:
+                return CacheEntry(f.read(), created)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"No se pudo leer la caché en disco de {key}: {e}")
+            return None
+
+    def _save(self, key, entry):
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(entry.body)
+            os.utime(tmp, (entry.created, entry.created))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar la caché en disco de {key}: {e}")
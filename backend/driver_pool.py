@@ -0,0 +1,170 @@
+"""
+Pool de drivers de Chrome pre-arrancados
+
+Arrancar Chrome cuesta segundos y cientos de MB por request. El pool mantiene
+hasta `size` drivers vivos, los presta uno por request, los limpia al
+devolverlos y los recicla tras `max_uses` usos, si dejan de responder o si
+la extracción que los usaba falló.
+Si todos están ocupados, lease() espera hasta `lease_timeout` y luego lanza
+PoolExhausted para que el endpoint responda 503 en lugar de arrancar más
+Chromes de los que caben en memoria.
+"""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class PoolExhausted(Exception):
+    """No se liberó ningún driver dentro del tiempo de espera"""
+
+
+class DriverPool:
+    """Pool acotado de WebDrivers reutilizables"""
+
+    def __init__(self, factory, size=2, max_uses=20, lease_timeout=30):
+        """
+        Args:
+            factory: Función sin argumentos que crea un WebDriver
+            size: Máximo de drivers vivos a la vez
+            max_uses: Usos tras los que un driver se cierra y se reemplaza
+            lease_timeout: Segundos que lease() espera un driver libre
+        """
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        self._idle = queue.LifoQueue()  # LIFO: reutiliza el driver más reciente
+        self._slots = threading.BoundedSemaphore(size)
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+
+    @property
+    def live(self) -> int:
+        """Drivers vivos (prestados + libres)"""
+        with self._lock:
+            return len(self._uses)
+
+    def warm_up(self, count=None):
+        """Arranca `count` drivers (por defecto `size`) en segundo plano"""
+        def run():
+            for _ in range(count or self.size):
+                # Ocupa un slot mientras arranca para no pasar de `size` drivers vivos
+                if self._closed or not self._slots.acquire(blocking=False):
+                    break
+                try:
+                    if self.live >= self.size:
+                        break
+                    self._idle.put(self._create())
+                except Exception as e:
+                    logger.error(f"No se pudo pre-arrancar un driver: {e}")
+                    break
+                finally:
+                    self._slots.release()
+
+        threading.Thread(target=run, name="driver-pool-warmup", daemon=True).start()
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Presta un driver durante el bloque `with`
+
+        Si el bloque lanza una excepción, el driver se descarta en lugar de
+        volver a los libres: un error a mitad de la extracción (timeout,
+        sesión caída) puede dejarlo en un estado que _reset no detecta. La
+        excepción se propaga.
+
+        Raises:
+            PoolExhausted: Si no hay driver libre en `timeout` segundos
+        """
+        if not self._slots.acquire(timeout=self.lease_timeout if timeout is None else timeout):
+            raise PoolExhausted(f"Los {self.size} navegadores están ocupados")
+
+        driver = None
+        failed = False
+        replace = False
+        try:
+            driver = self._checkout()
+            yield driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if driver is not None:
+                replace = not self._checkin(driver, failed)
+            self._slots.release()
+            if replace and not self._closed:
+                # Reponer en segundo plano (con el slot ya libre) para que el
+                # próximo request no pague el arranque
+                self.warm_up(1)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "live": self.live,
+            "idle": self._idle.qsize(),
+            "max_uses": self.max_uses,
+            "created": self.created,
+            "recycled": self.recycled,
+        }
+
+    def close(self):
+        """Cierra todos los drivers libres; los prestados se cierran al devolverse"""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def _create(self):
+        driver = self.factory()
+        with self._lock:
+            self._uses[id(driver)] = 0
+            self.created += 1
+        logger.info(f"Driver creado para el pool ({self.live}/{self.size})")
+        return driver
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._create()
+
+    def _checkin(self, driver, failed=False) -> bool:
+        """Devuelve el driver a los libres; False si se descartó"""
+        with self._lock:
+            self._uses[id(driver)] = uses = self._uses.get(id(driver), 0) + 1
+
+        if failed:
+            logger.warning("El driver falló durante el préstamo, se recicla")
+        if failed or self._closed or uses >= self.max_uses or not self._reset(driver):
+            self._discard(driver)
+            self.recycled += 1
+            return False
+        self._idle.put(driver)
+        return True
+
+    def _reset(self, driver) -> bool:
+        """Limpia el estado entre usos; devuelve False si el driver no responde"""
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return driver.execute_script("return 1") == 1
+        except Exception as e:
+            logger.warning(f"Driver no saludable, se recicla: {e}")
+            return False
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
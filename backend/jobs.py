@@ -0,0 +1,299 @@
+"""
+Extracciones en segundo plano
+
+Una extracción con Selenium tarda de 30 a 120 segundos; mantener la conexión
+abierta todo ese tiempo choca con el timeout del proxy de Render y ocupa un
+worker de gunicorn. JobManager ejecuta las extracciones en un pool acotado de
+hilos y guarda el estado de cada job (videos parciales incluidos) para
+consultarlo por polling o seguirlo como eventos (server-sent events).
+
+Con `key` (el ID normalizado de la playlist), los pedidos que llegan
+mientras esa playlist ya se está extrayendo con el mismo motor se suman al
+job en curso (single-flight): reciben el mismo resultado y el mismo stream de
+videos en lugar de abrir otro navegador para hacer el mismo trabajo. Un
+pedido con refresh no se suma a un job sin refresh, que puede responder con
+el resultado en caché.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class QueueFull(Exception):
+    """Hay demasiados jobs pendientes"""
+
+
+class Job:
+    """Estado de una extracción; seguro para leer desde otros hilos"""
+
+    def __init__(self, url, engine, refresh=False, key=None, cache_checked=False):
+        self.id = uuid.uuid4().hex
+        self.url = url
+        self.engine = engine
+        self.refresh = refresh  # Ignorar resultados en caché
+        self.cache_checked = cache_checked  # El llamador ya consultó la caché (y contó el miss)
+        self.key = key  # Clave de single-flight: (ID de la playlist, motor)
+        self.coalesced = 0  # Pedidos que se sumaron a este job en curso
+        self.status = QUEUED
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.progress = {"scrolls": 0, "videos": 0}
+        self.videos = []
+        self.result = None
+        self.error = None
+        self.exception = None
+        self._finished_monotonic = None
+        self._events = []
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def add_video(self, video):
+        """Callback on_video del extractor"""
+        with self._changed:
+            self.videos.append(video)
+            self.progress["videos"] = len(self.videos)
+            self._changed.notify_all()
+
+    def update_progress(self, **progress):
+        """Callback on_progress del extractor (p. ej. scrolls=3, videos=300)"""
+        with self._changed:
+            self.progress.update(progress)
+            self._emit('progress', dict(self.progress))
+
+    def start(self):
+        with self._changed:
+            self.status = RUNNING
+            self.started_at = datetime.now().isoformat()
+            self._emit('status', {"status": RUNNING})
+
+    def finish(self, result):
+        with self._changed:
+            self.result = result
+            if result.get('success'):
+                self.status = DONE
+                self.videos = result['videos']
+            else:
+                self.status = FAILED
+                self.error = result.get('error')
+            self.progress["videos"] = len(self.videos)
+            self._finish_locked()
+
+    def fail(self, exception):
+        with self._changed:
+            self.status = FAILED
+            self.error = str(exception)
+            self.exception = exception
+            self._finish_locked()
+
+    def wait(self, timeout=None) -> bool:
+        """Bloquea hasta que el job termine; devuelve False si vence `timeout`"""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.finished, timeout)
+
+    def events(self, after=0, keepalive=15):
+        """
+        Produce (id, evento, datos) desde el evento `after` hasta que el job termine
+
+        Cada `keepalive` segundos sin eventos produce (None, None, None) para
+        que el llamador pueda mandar un comentario y mantener viva la conexión.
+        """
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: len(self._events) > after or self.finished, keepalive)
+                pending = self._events[after:]
+                finished = self.finished
+            if not pending and not finished:
+                yield None, None, None
+                continue
+            for event in pending:
+                yield event
+            after += len(pending)
+            if finished and after >= len(self._events):
+                return
+
+    def iter_videos(self, keepalive=15):
+        """
+        Produce los videos en cuanto se cosechan, hasta que el job termine
+
+        Como events(), produce None cada `keepalive` segundos sin videos nuevos.
+        """
+        sent = 0
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda: len(self.videos) > sent or self.finished, keepalive)
+                pending = self.videos[sent:]
+                finished = self.finished
+            if not pending and not finished:
+                yield None
+                continue
+            yield from pending
+            sent += len(pending)
+            if finished and sent >= len(self.videos):
+                return
+
+    def as_dict(self, since=0) -> dict:
+        """
+        Estado del job para la API
+
+        Args:
+            since: Omite los primeros `since` videos (polling incremental)
+        """
+        with self._changed:
+            data = {
+                "job_id": self.id,
+                "status": self.status,
+                "url": self.url,
+                "engine": self.engine,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "progress": dict(self.progress),
+                "total_videos": len(self.videos),
+                "coalesced_requests": self.coalesced,
+                "videos": self.videos[since:],
+            }
+            if self.error:
+                data["error"] = self.error
+            if self.result and self.result.get('metadata'):
+                data["metadata"] = self.result['metadata']
+            return data
+
+    def _emit(self, event, data):
+        # Llamar con self._changed adquirido
+        self._events.append((len(self._events) + 1, event, data))
+        self._changed.notify_all()
+
+    def _finish_locked(self):
+        self.finished_at = datetime.now().isoformat()
+        self._finished_monotonic = time.monotonic()
+        done = {"status": self.status, "total_videos": len(self.videos)}
+        if self.error:
+            done["error"] = self.error
+        self._emit('done', done)
+
+
+class JobManager:
+    """Pool acotado de hilos que ejecuta jobs y los recuerda durante `ttl` segundos"""
+
+    def __init__(self, run, workers=2, max_pending=20, ttl=3600, on_coalesced=None):
+        """
+        Args:
+            run: Función run(job) que hace la extracción y devuelve el dict
+                resultado; debe llamar a job.add_video / job.update_progress
+            workers: Extracciones simultáneas
+            max_pending: Jobs en cola o en curso antes de rechazar nuevos
+            ttl: Segundos que se conserva un job terminado
+            on_coalesced: Función on_coalesced(job) llamada cada vez que un
+                pedido se suma a un job en curso (p. ej. para métricas)
+        """
+        self.run = run
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.on_coalesced = on_coalesced
+        self.coalesced = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._in_flight = {}  # (key, motor) -> último job sin terminar
+        self._lock = threading.Lock()
+
+    def submit(self, url, engine, refresh=False, key=None, cache_checked=False) -> Job:
+        """
+        Encola una extracción y devuelve el job sin esperar
+
+        Si ya hay un job sin terminar con la misma `key` y el mismo `engine`,
+        devuelve ese job en lugar de crear otro. Un pedido con `refresh` solo
+        se suma a un job que también tiene refresh: uno sin refresh puede
+        terminar con el resultado en caché, que es justo lo que se quiere evitar.
+
+        Args:
+            url: URL de la playlist
+            engine: Motor de extracción ('selenium' o 'http')
+            refresh: Extraer de nuevo aunque haya un resultado en caché
+            key: Clave de single-flight (ID normalizado de la playlist; se
+                combina con `engine`); None para no compartir el job
+            cache_checked: El llamador ya consultó la caché sin encontrar el
+                resultado; run(job) no debería contar otra consulta
+
+        Raises:
+            QueueFull: Si ya hay `max_pending` jobs sin terminar
+        """
+        with self._lock:
+            self._prune()
+            flight = (key, engine) if key else None
+            running = self._in_flight.get(flight) if flight else None
+            if (running is not None and not running.finished
+                    and (running.refresh or not refresh)):
+                running.coalesced += 1
+                self.coalesced += 1
+            else:
+                running = None
+                pending = sum(1 for job in self._jobs.values() if not job.finished)
+                if pending >= self.max_pending:
+                    raise QueueFull(f"{pending} extracciones pendientes")
+                job = Job(url, engine, refresh, flight, cache_checked)
+                self._jobs[job.id] = job
+                if flight:
+                    # Los pedidos siguientes se suman al job más nuevo
+                    self._in_flight[flight] = job
+
+        if running is not None:
+            logger.info(f"Job {running.id}: pedido sumado a la extracción en curso de {key} "
+                        f"con {engine} ({running.coalesced} en total)")
+            if self.on_coalesced:
+                self.on_coalesced(running)
+            return running
+
+        logger.info(f"Job {job.id} encolado: {url} (motor: {engine})")
+        self._executor.submit(self._execute, job)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return {"workers": self.workers, "max_pending": self.max_pending,
+                "coalesced": self.coalesced, **counts}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _execute(self, job):
+        job.start()
+        try:
+            job.finish(self.run(job))
+        except Exception as e:
+            logger.error(f"Job {job.id} falló: {e}")
+            job.fail(e)
+        logger.info(f"Job {job.id} {job.status}: {len(job.videos)} videos")
+        with self._lock:
+            if self._in_flight.get(job.key) is job:
+                del self._in_flight[job.key]
+
+    def _prune(self):
+        # Llamar con self._lock adquirido
+        limit = time.monotonic() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and job._finished_monotonic < limit]
+        for job_id in expired:
+            del self._jobs[job_id]
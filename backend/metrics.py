@@ -0,0 +1,201 @@
+"""
+Métricas en el formato de texto de Prometheus
+
+Registro mínimo de contadores, gauges e histogramas con etiquetas, sin
+dependencias. GET /metrics devuelve Registry.render(). Los valores viven en
+memoria del proceso: con gunicorn --workers 1 (el despliegue actual) cada
+scrape ve todas las extracciones.
+"""
+
+import os
+import threading
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Segundos: desde un parseo de milisegundos hasta un scroll de varios minutos
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base: nombre, ayuda, etiquetas y un valor por combinación de etiquetas"""
+
+    kind = 'untyped'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels) -> tuple:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} espera las etiquetas {self.labels}, no {tuple(labels)}")
+        return tuple(labels[name] for name in self.labels)
+
+    def samples(self):
+        """(sufijo, etiquetas, valor) de cada serie"""
+        with self._lock:
+            return [('', key, value) for key, value in self._values.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, value, *extra in self.samples():
+            labels = _format_labels(self.labels, key, extra[0] if extra else ())
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Valor que solo crece (extracciones, videos, errores)"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """
+    Valor que sube y baja
+
+    Con `function`, el valor se calcula en cada scrape (sin etiquetas);
+    si devuelve None la serie se omite.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labels=(), function=None):
+        super().__init__(name, documentation, labels)
+        self.function = function
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        if self.function is None:
+            return super().samples()
+        value = self.function()
+        return [] if value is None else [('', (), value)]
+
+
+class Histogram(Metric):
+    """Distribución de duraciones en buckets acumulados, con _sum y _count"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[position] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            series = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        samples = []
+        for key, counts, total in series:
+            for bound, count in zip(self.buckets, counts):
+                samples.append(('_bucket', key, count, [('le', _format_value(float(bound)))]))
+            samples.append(('_sum', key, total))
+            samples.append(('_count', key, counts[-1]))
+        return samples
+
+
+class Registry:
+    """Conjunto de métricas que se exponen juntas"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=(), function=None):
+        return self.register(Gauge(name, documentation, labels, function))
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self._metrics) + '\n'
+
+
+def chrome_processes():
+    """
+    Procesos de Chrome descendientes de este proceso (sin contar chromedriver)
+
+    Lee /proc; devuelve None donde no existe (fuera de Linux).
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    parents = {}
+    names = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # El nombre va entre paréntesis y puede tener espacios
+        name = stat[stat.find('(') + 1:stat.rfind(')')]
+        try:
+            ppid = int(stat[stat.rfind(')') + 1:].split()[1])
+        except (IndexError, ValueError):
+            continue
+        pid = int(entry)
+        names[pid] = name
+        parents.setdefault(ppid, []).append(pid)
+
+    count = 0
+    pending = [os.getpid()]
+    while pending:
+        for child in parents.get(pending.pop(), []):
+            if 'chrom' in names[child] and 'chromedriver' not in names[child]:
+                count += 1
+            pending.append(child)
+    return count
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: catálogo SQLite con millones de pertenencias
+
+Llena un catálogo temporal con playlists sintéticas que comparten videos
+(como las exportaciones reales de un mismo canal o género), mide las
+escrituras en lote y la latencia de cada consulta del subcomando catalog:
+en qué playlists está un video, los videos de una playlist, búsqueda por
+título y videos compartidos.
+
+    python benchmarks/bench_catalog.py --playlists 2000 --videos-per-playlist 500
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+from playlist_catalog import PlaylistCatalog
+
+WORDS = ("lofi", "beats", "study", "live", "remix", "official", "video", "music", "mix", "piano",
+         "guitar", "tutorial", "python", "selenium", "playlist", "chill", "jazz", "rock", "cover",
+         "acoustic", "session", "concierto", "en", "vivo", "canción", "clásica", "noche", "día")
+
+
+def synthetic_videos(pool: int, rng: random.Random) -> list:
+    return [{
+        "video_id": f"v{number:010d}",
+        "title": " ".join(rng.choice(WORDS) for _ in range(5)) + f" #{number}",
+        "duration": f"{rng.randint(1, 59)}:{rng.randint(0, 59):02d}",
+    } for number in range(pool)]
+
+
+def timed(function, *args, repeat: int = 20) -> dict:
+    """Mediana y p95 (ms) de `repeat` llamadas con argumentos ya elegidos"""
+    samples = []
+    rows = 0
+    for call_args in args[:repeat]:
+        start = time.perf_counter()
+        rows = len(function(*call_args))
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "rows_last_call": rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--playlists", type=int, default=2000, help="Playlists sintéticas")
+    parser.add_argument("--videos-per-playlist", type=int, default=500, help="Videos por playlist")
+    parser.add_argument("--pool", type=int, default=400000,
+                        help="Videos distintos entre los que se reparten las playlists")
+    parser.add_argument("--queries", type=int, default=50, help="Consultas por tipo")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    videos = synthetic_videos(args.pool, rng)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.db")
+        with PlaylistCatalog(path) as catalog:
+            start = time.perf_counter()
+            for number in range(args.playlists):
+                members = rng.sample(videos, args.videos_per_playlist)
+                for position, video in enumerate(members, 1):
+                    video["index"] = position
+                catalog.record_playlist(f"PL{number:08d}", members)
+            write_seconds = time.perf_counter() - start
+            memberships = args.playlists * args.videos_per_playlist
+
+            video_ids = [(rng.choice(videos)["video_id"],) for _ in range(args.queries)]
+            playlist_ids = [(f"PL{rng.randrange(args.playlists):08d}",) for _ in range(args.queries)]
+            searches = [(" ".join(rng.sample(WORDS, 2)),) for _ in range(args.queries)]
+            report = {
+                "full_text_search": catalog.full_text,
+                "rows": catalog.stats(),
+                "write_seconds": round(write_seconds, 2),
+                "memberships_per_second": round(memberships / write_seconds),
+                "database_mb": round(os.path.getsize(path) / 1024 / 1024, 1),
+                "queries": {
+                    "contains": timed(catalog.playlists_with, *video_ids, repeat=args.queries),
+                    "playlist": timed(catalog.playlist_videos, *playlist_ids, repeat=args.queries),
+                    "search": timed(catalog.search, *searches, repeat=args.queries),
+                    "shared": timed(catalog.shared_videos, (2, 50), repeat=1),
+                },
+            }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
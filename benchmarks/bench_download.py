@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: orquestador de descargas (playlist_download.py) contra /files/
+
+Exporta una playlist sintética a JSON (como save_json) y la descarga con el
+backend http desde el servidor de fixtures, que limita cada conexión a
+--file-rate (como un CDN). Reporta el tiempo con 1 worker y con --workers,
+la velocidad observada con --max-rate (debe quedar por debajo del límite),
+una segunda corrida con el mismo estado (todo saltado) y una corrida en la
+que cada archivo falla --failures veces antes de servirse.
+
+    python benchmarks/bench_download.py --videos 40 --file-size 1M --file-rate 2M --workers 8
+"""
+
+import argparse
+import json
+import os
+import tempfile
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+from fixture_server import FixtureServer, fixture_video
+from playlist_download import DownloadOrchestrator, HTTPDownloader, load_items, parse_rate
+from playlist_export import PlaylistExporter, default_paths
+
+
+def write_export(directory: str, count: int) -> str:
+    """playlist.json con el mismo formato que save_json"""
+    videos = []
+    for index in range(1, count + 1):
+        video = fixture_video(index)
+        url = f"https://www.youtube.com/watch?v={video['video_id']}"
+        videos.append({"index": index, "title": video["title"], "video_id": video["video_id"],
+                       "url": url, "url_simple": url, "duration": video["duration"]})
+    paths = default_paths(os.path.join(directory, "playlist"))
+    with PlaylistExporter(paths, formats=("json",),
+                          json_header={"metadata": {"total_videos": count}}) as exporter:
+        exporter.write_all(videos)
+    return paths["json"]
+
+
+def run(server: FixtureServer, items: list, directory: str, name: str, **options) -> dict:
+    output_dir = os.path.join(directory, name)
+    backend = HTTPDownloader(server.file_url())
+    summary = DownloadOrchestrator(backend, output_dir, **options).run(items)
+    summary.pop("failures")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=40, help="Videos de la exportación")
+    parser.add_argument("--file-size", default="1M", help="Tamaño de cada archivo")
+    parser.add_argument("--file-rate", default="2M", help="Velocidad por conexión del servidor")
+    parser.add_argument("--workers", type=int, default=8, help="Descargas simultáneas")
+    parser.add_argument("--max-rate", default="4M", help="Límite global de la corrida limitada")
+    parser.add_argument("--failures", type=int, default=2, help="Fallos de cada archivo en la corrida con reintentos")
+    args = parser.parse_args()
+
+    file_size = int(parse_rate(args.file_size))
+    file_rate = int(parse_rate(args.file_rate))
+    max_rate = parse_rate(args.max_rate)
+    with tempfile.TemporaryDirectory() as directory:
+        items = load_items(write_export(directory, args.videos))
+        with FixtureServer(file_size=file_size, file_rate=file_rate) as server:
+            serial = run(server, items, directory, "serial", workers=1)
+            concurrent = run(server, items, directory, "concurrent", workers=args.workers)
+            capped = run(server, items, directory, "capped", workers=args.workers, max_rate=max_rate)
+            resumed = run(server, items, directory, "capped", workers=args.workers, max_rate=max_rate)
+        with FixtureServer(file_size=file_size, file_failures=args.failures) as server:
+            retried = run(server, items, directory, "retried", workers=args.workers,
+                          retries=args.failures, backoff=0.05)
+
+    print(json.dumps({
+        "videos": args.videos,
+        "file_mb": round(file_size / 1024 / 1024, 2),
+        "file_rate_mb_s": round(file_rate / 1024 / 1024, 2),
+        "serial": serial,
+        "concurrent": {**concurrent, "speedup": round(serial["seconds"] / max(concurrent["seconds"], 1e-9), 2)},
+        "capped": {**capped, "max_rate_mb_s": round(max_rate / 1024 / 1024, 2),
+                   "within_cap": capped["mb_per_second"] <= max_rate / 1024 / 1024 * 1.05},
+        "resumed": resumed,
+        "retried": retried,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
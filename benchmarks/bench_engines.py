@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: motor Selenium vs. motor HTTP (sin navegador)
+
+Extrae la misma playlist sintética con YouTubePlaylistExtractor y
+YouTubePlaylistHTTPExtractor y reporta tiempo total y si los videos
+coinciden.
+
+    python benchmarks/bench_engines.py --videos 1000 --latency 100
+"""
+
+import argparse
+import json
+import time
+
+from common import comparable
+from fixture_server import FixtureServer
+from extract_playlist_advanced import YouTubePlaylistExtractor, YouTubePlaylistHTTPExtractor
+
+ENGINES = {
+    "selenium": YouTubePlaylistExtractor,
+    "http": YouTubePlaylistHTTPExtractor,
+}
+
+
+def run_engine(engine: str, url: str) -> dict:
+    extractor = ENGINES[engine]()
+    start = time.perf_counter()
+    videos = extractor.extract(url)
+    return {
+        "seconds": round(time.perf_counter() - start, 3),
+        "total_videos": len(videos),
+        "videos": videos,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=1000, help="Videos en la playlist sintética")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote de continuación")
+    parser.add_argument("--latency", type=int, default=100, help="Latencia de cada lote (ms)")
+    args = parser.parse_args()
+
+    with FixtureServer(total=args.videos, batch=args.batch, latency_ms=args.latency) as server:
+        url = server.playlist_url()
+        results = {engine: run_engine(engine, url) for engine in ENGINES}
+
+    selenium, http = results["selenium"], results["http"]
+    report = {
+        "videos": args.videos,
+        "identical_records": comparable(selenium.pop("videos")) == comparable(http.pop("videos")),
+        "selenium": selenium,
+        "http": http,
+        "speedup": round(selenium["seconds"] / max(http["seconds"], 1e-9), 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
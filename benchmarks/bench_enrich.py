@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: enriquecimiento de metadatos (--enrich) contra /watch
+
+Pide la página /watch de cada video de una playlist sintética, con una
+demora fija por página, de a una (como un bucle de requests.get) y con
+varias concurrencias sobre una sola sesión aiohttp. Después repite la misma
+playlist con la caché llena (no debería pedir nada) y con TTL 0 (se descarta
+todo y se vuelve a pedir).
+
+    python benchmarks/bench_enrich.py --videos 500 --latency 100 --concurrency 1,16,64
+"""
+
+import argparse
+import json
+import os
+import tempfile
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+from fixture_server import FixtureServer, fixture_video
+from playlist_enrich import MetadataEnricher
+
+
+def playlist(count: int) -> list:
+    return [{"index": index, "video_id": fixture_video(index)["video_id"], "title": fixture_video(index)["title"]}
+            for index in range(1, count + 1)]
+
+
+def run(server: FixtureServer, cache_path: str, count: int, **options) -> dict:
+    videos = playlist(count)
+    requests_before = server.watch_requests
+    stats = MetadataEnricher(cache_path, watch_url=server.watch_url(), **options).enrich(videos)
+    return {
+        **stats,
+        "requests": server.watch_requests - requests_before,
+        "complete": all(video["channel"] and video["view_count"] for video in videos),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=500, help="Videos de la playlist")
+    parser.add_argument("--latency", type=int, default=100, help="Demora de cada página /watch (ms)")
+    parser.add_argument("--concurrency", default="1,16,64", help="Concurrencias a probar")
+    args = parser.parse_args()
+
+    levels = [int(value) for value in args.concurrency.split(",") if value.strip()]
+    with tempfile.TemporaryDirectory() as directory, \
+            FixtureServer(watch_latency_ms=args.latency) as server:
+        runs = {}
+        for concurrency in levels:
+            # Caché nueva en cada nivel: se mide la descarga completa
+            cache_path = os.path.join(directory, f"cache_{concurrency}.db")
+            runs[concurrency] = run(server, cache_path, args.videos, concurrency=concurrency)
+        cached = run(server, cache_path, args.videos, concurrency=levels[-1])
+        expired = run(server, cache_path, args.videos, concurrency=levels[-1], ttl=0)
+
+    baseline = runs[levels[0]]["seconds"]
+    print(json.dumps({
+        "videos": args.videos,
+        "latency_ms": args.latency,
+        "cold": {str(level): {**result, "speedup": round(baseline / max(result["seconds"], 1e-9), 2)}
+                 for level, result in runs.items()},
+        "cached": cached,
+        "expired_ttl_0": expired,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
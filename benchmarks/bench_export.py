@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark: guardado anterior (lista en memoria, un recorrido por formato y
+DLC con += de strings) vs. PlaylistExporter (una sola pasada en streaming)
+
+Genera N videos sintéticos y reporta tiempo, videos/s y pico de memoria
+(tracemalloc) de cada variante, y si JSON, TXT y DLC coinciden.
+
+    python benchmarks/bench_export.py --videos 100000
+    python benchmarks/bench_export.py --videos 100000 --gzip
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import common  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+from playlist_export import PlaylistExporter, default_paths
+
+FORMATS = ("json", "txt", "csv", "dlc")
+
+
+def synthetic_videos(total: int):
+    """Genera los videos de uno en uno, como llegan durante una extracción"""
+    for index in range(1, total + 1):
+        video_id = f"vid{index:08d}"
+        yield {
+            "index": index,
+            "title": f'Video sintético #{index} "demo", más',
+            "video_id": video_id,
+            "url": f"https://www.youtube.com/watch?v={video_id}&list=PLBENCH&index={index}",
+            "url_simple": f"https://www.youtube.com/watch?v={video_id}",
+            "duration": f"{index % 60}:{index % 60:02d}",
+            "extracted_at": "2024-01-01T00:00:00",
+        }
+
+
+def legacy_save(videos, base: str, playlist_url: str):
+    """Implementación anterior de extract_playlist.save_results"""
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "playlist_url": playlist_url,
+            "total_videos": len(videos),
+            "videos": videos
+        }, f, ensure_ascii=False, indent=2)
+
+    with open(f"{base}_urls.txt", "w", encoding="utf-8") as f:
+        for video in videos:
+            f.write(f"{video['url_simple']}\n")
+
+    with open(f"{base}.csv", "w", encoding="utf-8") as f:
+        f.write("Index,Title,Video ID,URL\n")
+        for video in videos:
+            title = video['title'].replace('"', '""')
+            f.write(f'{video["index"]},"{title}",{video["video_id"]},{video["url_simple"]}\n')
+
+    dlc_content = """<dlc>
+<header>
+<generator>YouTube Playlist Extractor</generator>
+<tribute>Created with Python + Selenium</tribute>
+</header>
+<content>
+<package name="YouTube Playlist PLBENCH" passwords="" comment="">
+"""
+    for video in videos:
+        url_encoded = base64.b64encode(video['url_simple'].encode()).decode()
+        dlc_content += f'<file><url>{url_encoded}</url></file>\n'
+    dlc_content += """</package>
+</content>
+</dlc>"""
+    with open(f"{base}.dlc", "w", encoding="utf-8") as f:
+        f.write(dlc_content)
+
+
+def stream_save(videos, total: int, base: str, playlist_url: str, compress: bool):
+    with PlaylistExporter(
+        default_paths(base), FORMATS, compress,
+        json_header={"playlist_url": playlist_url, "total_videos": total},
+        csv_fields=[("Index", "index"), ("Title", "title"), ("Video ID", "video_id"), ("URL", "url_simple")],
+        csv_quoted=("title",),
+        csv_lineterminator="\n",
+        dlc_package="YouTube Playlist PLBENCH",
+    ) as exporter:
+        exporter.write_all(videos)
+
+
+def measure(fn) -> dict:
+    """Tiempo sin tracemalloc (lo ralentiza) y pico de memoria en una segunda corrida"""
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 3), "peak_mb": round(peak / 1024 / 1024, 2)}
+
+
+def read(path: str) -> str:
+    opener = gzip.open if path.endswith(".gz") else open
+    # newline="": sin traducir \r\n, para comparar los bytes tal cual
+    with opener(path, "rt", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=100000, help="Videos sintéticos")
+    parser.add_argument("--gzip", action="store_true", help="Exportar comprimido con gzip")
+    args = parser.parse_args()
+    url = "https://www.youtube.com/playlist?list=PLBENCH"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_base = os.path.join(tmp, "legacy")
+        stream_base = os.path.join(tmp, "stream")
+
+        # La versión anterior necesita la lista completa en memoria
+        legacy = measure(lambda: legacy_save(list(synthetic_videos(args.videos)), legacy_base, url))
+        stream = measure(lambda: stream_save(synthetic_videos(args.videos), args.videos,
+                                             stream_base, url, args.gzip))
+
+        suffix = ".gz" if args.gzip else ""
+        identical = {
+            fmt: read(default_paths(legacy_base)[fmt]) == read(default_paths(stream_base)[fmt] + suffix)
+            for fmt in FORMATS
+        }
+        sizes = {fmt: os.path.getsize(default_paths(stream_base)[fmt] + suffix) for fmt in FORMATS}
+
+    for result in (legacy, stream):
+        result["videos_per_second"] = round(args.videos / max(result["seconds"], 1e-9))
+
+    report = {
+        "videos": args.videos,
+        "gzip": args.gzip,
+        "identical_output": identical,
+        "legacy": legacy,
+        "stream": stream,
+        "stream_bytes": sizes,
+        "speedup": round(legacy["seconds"] / max(stream["seconds"], 1e-9), 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: carga por scroll vs. continuaciones pedidas desde la página (--load fetch)
+
+Extrae la misma playlist sintética con YouTubePlaylistExtractor en modo
+'scroll' (scroll adaptativo y lectura incremental de los renderers) y en
+modo 'fetch' (fetch a /youtubei/v1/browse desde la página, sin renderizar
+nada) y reporta tiempo total, tiempo de las fases scroll y parse,
+round-trips WebDriver y si los videos coinciden.
+
+    python benchmarks/bench_fetch.py --videos 5000 --batch 100 --latency 100
+"""
+
+import argparse
+import json
+import time
+
+from common import RoundTripCounter, comparable
+from fixture_server import FixtureServer
+from extract_playlist_advanced import YouTubePlaylistExtractor
+
+
+def run_mode(mode: str, url: str) -> dict:
+    extractor = YouTubePlaylistExtractor(load_mode=mode)
+    with RoundTripCounter() as counter:
+        start = time.perf_counter()
+        videos = extractor.extract(url)
+        elapsed = time.perf_counter() - start
+    phases = extractor.phase_timer.as_dict()["phases"]
+    return {
+        "seconds": round(elapsed, 3),
+        "scroll_seconds": phases.get("scroll"),
+        "parse_seconds": phases.get("parse"),
+        "round_trips": counter.total,
+        "total_videos": len(videos),
+        "load": extractor.scroll_stats.as_dict(),
+        "videos": videos,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=5000, help="Videos en la playlist sintética")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote de continuación")
+    parser.add_argument("--latency", type=int, default=100, help="Latencia de cada lote (ms)")
+    args = parser.parse_args()
+
+    with FixtureServer(total=args.videos, batch=args.batch, latency_ms=args.latency) as server:
+        url = server.playlist_url()
+        results = {mode: run_mode(mode, url) for mode in YouTubePlaylistExtractor.LOAD_MODES}
+
+    scroll, fetch = results["scroll"], results["fetch"]
+    report = {
+        "videos": args.videos,
+        "batch": args.batch,
+        "latency_ms": args.latency,
+        "identical_records": comparable(scroll.pop("videos")) == comparable(fetch.pop("videos")),
+        "scroll": scroll,
+        "fetch": fetch,
+        "speedup": round(scroll["seconds"] / max(fetch["seconds"], 1e-9), 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
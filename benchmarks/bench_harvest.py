@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lectura de videos por elemento vs. un solo execute_script
+
+Carga una playlist sintética con todos los renderers ya presentes y mide
+_extract_video_details de YouTubePlaylistExtractor en ambos modos:
+round-trips WebDriver, tiempo total y si los registros coinciden.
+
+    python benchmarks/bench_harvest.py --videos 2000
+"""
+
+import argparse
+import json
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from common import RoundTripCounter, comparable
+from fixture_server import FixtureServer
+from extract_playlist_advanced import YouTubePlaylistExtractor
+from playlist_dom import RENDERER_SELECTOR
+
+
+def run_mode(mode: str, url: str, total: int) -> dict:
+    extractor = YouTubePlaylistExtractor(harvest_mode=mode)
+    extractor._init_driver()
+    try:
+        extractor.driver.get(url)
+        WebDriverWait(extractor.driver, 60).until(
+            lambda d: len(d.find_elements(By.CSS_SELECTOR, RENDERER_SELECTOR)) >= total
+        )
+
+        with RoundTripCounter() as counter:
+            start = time.perf_counter()
+            extractor._extract_video_details()
+            elapsed = time.perf_counter() - start
+
+        return {
+            "round_trips": counter.total,
+            "commands": dict(counter.counts),
+            "seconds": round(elapsed, 3),
+            "videos": extractor.videos,
+        }
+    finally:
+        extractor.driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=2000, help="Videos en la playlist sintética")
+    args = parser.parse_args()
+
+    with FixtureServer(total=args.videos, batch=args.videos) as server:
+        url = server.playlist_url()
+        results = {mode: run_mode(mode, url, args.videos) for mode in ("elements", "bulk")}
+
+    elements, bulk = results["elements"], results["bulk"]
+    report = {
+        "videos": args.videos,
+        "identical_records": comparable(elements.pop("videos")) == comparable(bulk.pop("videos")),
+        "elements": elements,
+        "bulk": bulk,
+        "round_trip_ratio": round(elements["round_trips"] / max(bulk["round_trips"], 1), 1),
+        "speedup": round(elements["seconds"] / max(bulk["seconds"], 1e-9), 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
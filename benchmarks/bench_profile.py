@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: perfil normal de Chrome vs. perfil lean (--lean)
+
+Extrae una playlist sintética que, como la real, pide miniaturas, una
+fuente web, un preview de video y un script de anuncios (con latencia), y
+reporta por perfil: lo que tarda driver.get (carga de la página), los
+tiempos de Navigation Timing, la extracción completa, los recursos pedidos
+al servidor y la memoria de Chrome al terminar (suma de RSS y de PSS de
+todos sus procesos, leída de /proc: solo Linux).
+
+    python benchmarks/bench_profile.py --videos 500 --asset-latency 50 --runs 3
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from common import comparable, process_tree, tree_memory_mb
+from fixture_server import FixtureServer
+from extract_playlist_advanced import YouTubePlaylistExtractor
+
+NAVIGATION_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+return nav ? [nav.domContentLoadedEventEnd, nav.loadEventEnd] : [0, 0];
+"""
+
+
+def chrome_memory(driver) -> dict:
+    """Memoria de chromedriver y de todos los procesos de Chrome que arrancó"""
+    root = driver.service.process.pid
+    return {
+        "processes": len(process_tree(root)),
+        "rss_mb": round(tree_memory_mb(root, "VmRSS:"), 1),
+        "pss_mb": round(tree_memory_mb(root, "Pss:"), 1),
+    }
+
+
+def run_profile(lean: bool, server: FixtureServer) -> dict:
+    extractor = YouTubePlaylistExtractor(lean_browser=lean, reuse_driver=True)
+    extractor._init_driver()
+    driver = extractor.driver
+    timings = {}
+    original_get = driver.get
+
+    def timed_get(url):
+        start = time.perf_counter()
+        original_get(url)
+        timings["page_load_seconds"] = time.perf_counter() - start
+
+    driver.get = timed_get
+    server.asset_requests = 0
+    try:
+        start = time.perf_counter()
+        videos = extractor.extract(server.playlist_url())
+        timings["extract_seconds"] = time.perf_counter() - start
+        dom_content_loaded, load = driver.execute_script(NAVIGATION_SCRIPT)
+        timings["dom_content_loaded_ms"] = dom_content_loaded
+        timings["load_event_ms"] = load
+        memory = chrome_memory(driver)
+    finally:
+        extractor.close()
+    return {**timings, **memory, "asset_requests": server.asset_requests, "videos": videos}
+
+
+def summarize(runs: list) -> dict:
+    """Mediana de cada métrica numérica"""
+    summary = {}
+    for key in runs[0]:
+        if key != "videos":
+            summary[key] = round(statistics.median(run[key] for run in runs), 3)
+    summary["total_videos"] = len(runs[0]["videos"])
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=500, help="Videos en la playlist sintética")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote de continuación")
+    parser.add_argument("--latency", type=int, default=100, help="Latencia de cada lote (ms)")
+    parser.add_argument("--asset-latency", type=int, default=50,
+                        help="Latencia de cada miniatura, fuente, video o script (ms)")
+    parser.add_argument("--runs", type=int, default=3, help="Corridas por perfil (se reporta la mediana)")
+    args = parser.parse_args()
+
+    with FixtureServer(total=args.videos, batch=args.batch, latency_ms=args.latency,
+                       assets=True, asset_latency_ms=args.asset_latency) as server:
+        # Alternar los perfiles reparte por igual el efecto de cachés del sistema
+        runs = {"full": [], "lean": []}
+        for _ in range(args.runs):
+            for profile in runs:
+                runs[profile].append(run_profile(profile == "lean", server))
+        results = {profile: summarize(profile_runs) for profile, profile_runs in runs.items()}
+
+    full, lean = results["full"], results["lean"]
+    report = {
+        "videos": args.videos,
+        "asset_latency_ms": args.asset_latency,
+        "runs": args.runs,
+        "identical_records": (comparable(runs["full"][0]["videos"])
+                              == comparable(runs["lean"][0]["videos"])),
+        "full": full,
+        "lean": lean,
+        "page_load_speedup": round(full["page_load_seconds"] / max(lean["page_load_seconds"], 1e-9), 1),
+        "rss_saved_mb": round(full["rss_mb"] - lean["rss_mb"], 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: --harvest incremental vs. --harvest prune en playlists enormes
+
+Extrae la misma playlist sintética con los dos modos y, a lo largo del
+scroll, muestrea el tiempo de cada paso (cosecha + scroll + espera), los
+nodos del DOM, el heap de JavaScript y la memoria de Chrome (suma de RSS de
+todos sus procesos, leída de /proc: solo Linux). Reporta si los registros
+son idénticos y cuánto crece cada métrica entre el primer y el último
+cuarto de la lista: con prune debería quedarse en ~1x.
+
+    python benchmarks/bench_prune.py --videos 20000
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from common import comparable, tree_memory_mb
+from fixture_server import FixtureServer
+from extract_playlist_advanced import YouTubePlaylistExtractor
+
+PAGE_STATS_SCRIPT = """
+return [
+    document.getElementsByTagName('*').length,
+    performance.memory ? performance.memory.usedJSHeapSize : 0
+];
+"""
+
+
+def run_mode(mode: str, server: FixtureServer, sample_every: int) -> dict:
+    extractor = YouTubePlaylistExtractor(harvest_mode=mode, reuse_driver=True)
+    extractor._init_driver()
+    driver = extractor.driver
+    root = driver.service.process.pid
+    samples = []
+    steps = []
+    original_harvest = extractor._harvest_new
+    last = [None]
+
+    def sampled_harvest():
+        # Se llama una vez por paso de scroll: mide el paso anterior completo
+        now = time.perf_counter()
+        if last[0] is not None:
+            steps.append(now - last[0])
+        count = original_harvest()
+        if len(steps) % sample_every == 0:
+            nodes, heap = driver.execute_script(PAGE_STATS_SCRIPT)
+            samples.append({
+                "videos": extractor._harvested,
+                "dom_nodes": nodes,
+                "js_heap_mb": round(heap / 1024 / 1024, 1),
+                "chrome_rss_mb": round(tree_memory_mb(root), 1),
+            })
+        last[0] = time.perf_counter()
+        return count
+
+    extractor._harvest_new = sampled_harvest
+    try:
+        start = time.perf_counter()
+        videos = extractor.extract(server.playlist_url())
+        seconds = time.perf_counter() - start
+    finally:
+        extractor.close()
+    return {"seconds": seconds, "steps": steps, "samples": samples, "videos": videos}
+
+
+def quarters(values: list) -> tuple:
+    """Mediana del primer y del último cuarto de una serie"""
+    quarter = max(len(values) // 4, 1)
+    return statistics.median(values[:quarter]), statistics.median(values[-quarter:])
+
+
+def growth(values: list) -> float:
+    """Último cuarto / primer cuarto (1.0 = plano)"""
+    first, last = quarters(values)
+    return round(last / max(first, 1e-9), 2)
+
+
+def summarize(run: dict) -> dict:
+    first_step, last_step = quarters(run["steps"])
+    summary = {
+        "seconds": round(run["seconds"], 2),
+        "total_videos": len(run["videos"]),
+        "scroll_steps": len(run["steps"]),
+        "step_ms_first_quarter": round(first_step * 1000, 1),
+        "step_ms_last_quarter": round(last_step * 1000, 1),
+        "step_time_growth": growth(run["steps"]),
+    }
+    for key in ("dom_nodes", "js_heap_mb", "chrome_rss_mb"):
+        values = [sample[key] for sample in run["samples"]]
+        summary[f"{key}_max"] = max(values)
+        summary[f"{key}_growth"] = growth(values)
+    summary["samples"] = run["samples"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=20000, help="Videos en la playlist sintética")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote de continuación")
+    parser.add_argument("--latency", type=int, default=0, help="Latencia de cada lote (ms)")
+    parser.add_argument("--sample-every", type=int, default=10,
+                        help="Pasos de scroll entre muestras de memoria")
+    parser.add_argument("--modes", default="incremental,prune", help="Modos a comparar")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    with FixtureServer(total=args.videos, batch=args.batch, latency_ms=args.latency) as server:
+        runs = {mode: run_mode(mode, server, args.sample_every) for mode in modes}
+
+    reference = comparable(runs[modes[0]]["videos"])
+    report = {
+        "videos": args.videos,
+        "batch": args.batch,
+        "identical_records": all(comparable(run["videos"]) == reference for run in runs.values()),
+        **{mode: summarize(run) for mode, run in runs.items()},
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
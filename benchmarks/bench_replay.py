@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: extracción desde una grabación (--record / --replay) como línea base de tiempos
+
+Graba una extracción de la playlist sintética con PlaylistRecorder, apaga el
+servidor de fixtures y repite la extracción --runs veces desde la grabación
+con ReplayServer, sin red. Reporta el tiempo de cada corrida (mínimo y
+mediana, para comparar entre versiones en CI), si todas las corridas
+produjeron los mismos videos que la grabada y las peticiones que no estaban
+grabadas.
+
+    python benchmarks/bench_replay.py --videos 2000 --runs 5 --engine http
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+
+from common import comparable
+from fixture_server import FixtureServer
+from extract_playlist_advanced import YouTubePlaylistExtractor, YouTubePlaylistHTTPExtractor
+from playlist_replay import ReplayServer
+
+
+def extractor_for(engine: str, load: str):
+    if engine == "http":
+        return YouTubePlaylistHTTPExtractor()
+    return YouTubePlaylistExtractor(load_mode=load)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=2000, help="Videos en la playlist sintética")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote de continuación")
+    parser.add_argument("--latency", type=int, default=100, help="Latencia de cada lote al grabar (ms)")
+    parser.add_argument("--runs", type=int, default=5, help="Corridas desde la grabación")
+    parser.add_argument("--engine", choices=("selenium", "http"), default="selenium")
+    parser.add_argument("--load", choices=YouTubePlaylistExtractor.LOAD_MODES, default="scroll",
+                        help="Con --engine selenium, modo de carga")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        with FixtureServer(total=args.videos, batch=args.batch, latency_ms=args.latency) as server:
+            extractor = extractor_for(args.engine, args.load)
+            recorder = extractor.enable_recording(directory, server.playlist_url())
+            start = time.perf_counter()
+            recorded = extractor.extract(server.playlist_url())
+            live_seconds = time.perf_counter() - start
+            recorder.save()
+
+        runs, identical, misses = [], True, 0
+        for _ in range(args.runs):
+            with ReplayServer(directory) as replay:
+                extractor = extractor_for(args.engine, args.load)
+                extractor.offline = True
+                start = time.perf_counter()
+                videos = extractor.extract(replay.playlist_url())
+                runs.append(time.perf_counter() - start)
+                for video in videos:
+                    video["url"] = replay.original_url(video["url"])
+                identical = identical and comparable(videos) == comparable(recorded)
+                misses += len(replay.misses)
+
+    print(json.dumps({
+        "videos": args.videos,
+        "engine": args.engine if args.engine == "http" else f"selenium/{args.load}",
+        "responses": len(recorder.entries),
+        "live_seconds": round(live_seconds, 3),
+        "replay_seconds": [round(seconds, 3) for seconds in runs],
+        "replay_min": round(min(runs), 3),
+        "replay_median": round(statistics.median(runs), 3),
+        "identical_records": identical,
+        "unrecorded_requests": misses,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
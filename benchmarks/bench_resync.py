@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: extracción completa vs. re-sincronización con --since
+
+Extrae una playlist sintética, le agrega videos nuevos al principio y la
+vuelve a extraer de las dos formas: completa y con resync() contra el JSON
+anterior. Reporta tiempos, videos realmente cargados y si la lista
+combinada coincide con la extracción completa.
+
+    python benchmarks/bench_resync.py --videos 5000 --added 20 --latency 300
+    python benchmarks/bench_resync.py --engine http
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from common import comparable
+from fixture_server import FixtureServer
+from extract_playlist_advanced import YouTubePlaylistExtractor, YouTubePlaylistHTTPExtractor
+
+ENGINES = {
+    "selenium": YouTubePlaylistExtractor,
+    "http": YouTubePlaylistHTTPExtractor,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=2000, help="Videos en la extracción anterior")
+    parser.add_argument("--added", type=int, default=20, help="Videos nuevos al principio de la lista")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote de continuación")
+    parser.add_argument("--latency", type=int, default=300, help="Latencia de cada lote (ms)")
+    parser.add_argument("--engine", choices=tuple(ENGINES), default="selenium")
+    args = parser.parse_args()
+    engine = ENGINES[args.engine]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        previous_file = os.path.join(tmp, "playlist.json")
+        with FixtureServer(total=args.videos, batch=args.batch) as server:
+            extractor = engine()
+            extractor.extract(server.playlist_url())
+            extractor.save_json(previous_file)
+
+        total = args.videos + args.added
+        with FixtureServer(total=total, batch=args.batch, latency_ms=args.latency,
+                           added=args.added) as server:
+            url = server.playlist_url()
+
+            full = engine()
+            start = time.perf_counter()
+            full.extract(url)
+            full_seconds = time.perf_counter() - start
+
+            incremental = engine()
+            start = time.perf_counter()
+            delta = incremental.resync(url, previous_file)
+            resync_seconds = time.perf_counter() - start
+
+    report = {
+        "engine": args.engine,
+        "previous_videos": args.videos,
+        "added": args.added,
+        # Los videos no recargados conservan la URL anterior (con su index= viejo)
+        "identical_records": (comparable(full.videos, ignore=("extracted_at", "url"))
+                              == comparable(incremental.videos, ignore=("extracted_at", "url"))),
+        "full": {"seconds": round(full_seconds, 3), "loaded": len(full.videos)},
+        "resync": {
+            "seconds": round(resync_seconds, 3),
+            "loaded": delta["metadata"]["loaded"],
+            "stop_reason": delta["metadata"]["stop_reason"],
+            "added": len(delta["added"]),
+            "removed": len(delta["removed"]),
+            "reordered": len(delta["reordered"]),
+        },
+        "speedup": round(full_seconds / max(resync_seconds, 1e-9), 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
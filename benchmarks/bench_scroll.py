@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark: espera fija (--pause) vs. espera adaptativa tras cada scroll
+
+Ejecuta YouTubePlaylistExtractor.extract completo contra una playlist
+sintética que carga por lotes con latencia, y reporta el tiempo total y el
+desglose de ScrollStats (tiempo esperando y tiempo esperando sin videos
+nuevos, que es el que la espera adaptativa elimina).
+
+    python benchmarks/bench_scroll.py --videos 500 --batch 100 --latency 300
+"""
+
+import argparse
+import json
+import time
+
+from common import comparable
+from fixture_server import FixtureServer
+from extract_playlist_advanced import YouTubePlaylistExtractor
+
+
+def run_mode(mode: str, url: str, pause: float) -> dict:
+    extractor = YouTubePlaylistExtractor(scroll_wait=mode, scroll_pause_time=pause)
+    start = time.perf_counter()
+    videos = extractor.extract(url)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 3),
+        "total_videos": len(videos),
+        "scroll": extractor.scroll_stats.as_dict(),
+        "videos": videos,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=500, help="Videos en la playlist sintética")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote de continuación")
+    parser.add_argument("--latency", type=int, default=300, help="Latencia de cada lote (ms)")
+    parser.add_argument("--pause", type=float, default=2, help="Pausa del modo fixed (segundos)")
+    args = parser.parse_args()
+
+    with FixtureServer(total=args.videos, batch=args.batch, latency_ms=args.latency) as server:
+        url = server.playlist_url()
+        results = {mode: run_mode(mode, url, args.pause) for mode in ("fixed", "adaptive")}
+
+    fixed, adaptive = results["fixed"], results["adaptive"]
+    report = {
+        "videos": args.videos,
+        "batch": args.batch,
+        "latency_ms": args.latency,
+        "identical_records": comparable(fixed.pop("videos")) == comparable(adaptive.pop("videos")),
+        "fixed": fixed,
+        "adaptive": adaptive,
+        "seconds_saved": round(fixed["seconds"] - adaptive["seconds"], 3),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
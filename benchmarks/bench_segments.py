@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: extracción serial vs. segmentada (--segments)
+
+La playlist sintética acepta index=N en la URL, como la real, así cada
+segmento empieza a cargar en su propia posición. Reporta el tiempo de la
+extracción serial y de la segmentada con 2, 4... navegadores, si los
+registros unidos son idénticos a los de la serial y los huecos y
+solapamientos de cada corrida.
+
+    python benchmarks/bench_segments.py --videos 5000 --latency 300 --segments 2,4
+"""
+
+import argparse
+import json
+import time
+
+from common import comparable
+from fixture_server import FixtureServer
+from extract_playlist_advanced import YouTubePlaylistExtractor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--videos", type=int, default=5000, help="Videos en la playlist sintética")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote de continuación")
+    parser.add_argument("--latency", type=int, default=300, help="Latencia de cada lote (ms)")
+    parser.add_argument("--segments", default="2,4", help="Cantidades de segmentos a probar")
+    args = parser.parse_args()
+
+    with FixtureServer(total=args.videos, batch=args.batch, latency_ms=args.latency) as server:
+        url = server.playlist_url()
+
+        start = time.perf_counter()
+        serial = YouTubePlaylistExtractor().extract(url)
+        serial_seconds = time.perf_counter() - start
+        reference = comparable(serial)
+
+        runs = []
+        for segments in [int(value) for value in args.segments.split(",") if value.strip()]:
+            extractor = YouTubePlaylistExtractor()
+            start = time.perf_counter()
+            videos = extractor.extract_segmented(url, segments)
+            seconds = time.perf_counter() - start
+            report = extractor.segment_report
+            runs.append({
+                "segments": segments,
+                "seconds": round(seconds, 2),
+                "speedup": round(serial_seconds / max(seconds, 1e-9), 2),
+                "total_videos": len(videos),
+                "identical_records": comparable(videos) == reference,
+                "gaps": report["gaps"],
+                "overlaps": len(report["overlaps"]),
+                "per_segment": [
+                    {key: segment[key] for key in ("start", "end", "videos", "first_index", "seconds")}
+                    for segment in report["segments"]
+                ],
+            })
+
+    print(json.dumps({
+        "videos": args.videos,
+        "latency_ms": args.latency,
+        "serial": {"seconds": round(serial_seconds, 2), "total_videos": len(serial)},
+        "segmented": runs,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
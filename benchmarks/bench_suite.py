@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks: los tres extractores contra playlists sintéticas
+
+Para cada tamaño de playlist levanta el servidor de fixtures (carga por
+lotes al hacer scroll, con latencia) y ejecuta
+extract_playlist.extract_playlist, YouTubePlaylistExtractor.extract y el
+PlaylistExtractor.extract del backend, cada uno en un proceso nuevo (así el
+pico de memoria de una corrida no se hereda en la siguiente). Reporta como
+JSON el tiempo total, los round-trips WebDriver, el pico de RSS (Python +
+chromedriver + Chrome, leído de /proc: solo Linux) y los videos por segundo.
+
+Guardar los reportes con --output permite comparar corridas en el tiempo:
+
+    python benchmarks/bench_suite.py --sizes 100,1000,5000,20000 --output base.json
+    python benchmarks/bench_suite.py --sizes 100,1000 --compare base.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Optional
+
+from common import ROOT_DIR, PeakRSS, RoundTripCounter, process_tree
+from fixture_server import FixtureServer
+
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+EXTRACTORS = ("basic", "advanced", "backend")
+
+
+def _load_extractor(extractor: str, max_scrolls: Optional[int]):
+    """Función url -> videos de cada extractor"""
+    if extractor == "basic":
+        import extract_playlist
+        return lambda url: extract_playlist.extract_playlist(url)
+
+    if extractor == "advanced":
+        from extract_playlist_advanced import YouTubePlaylistExtractor
+        return lambda url: YouTubePlaylistExtractor().extract(url)
+
+    # Backend: sin pool (un Chrome por extracción, como DRIVER_POOL_SIZE=0) y sin caché
+    os.environ["DRIVER_POOL_SIZE"] = "0"
+    os.environ["CACHE_TTL"] = "0"
+    sys.path.insert(0, BACKEND_DIR)
+    from app import PlaylistExtractor
+
+    def run(url):
+        result = PlaylistExtractor().extract(url, max_scrolls=max_scrolls)
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+        return result["videos"]
+    return run
+
+
+def run_case(extractor: str, url: str, max_scrolls: Optional[int]) -> dict:
+    """Ejecuta un extractor en este proceso y mide tiempo, round-trips y memoria"""
+    extract = _load_extractor(extractor, max_scrolls)
+    with PeakRSS() as peak, RoundTripCounter() as counter:
+        start = time.perf_counter()
+        videos = extract(url)
+        seconds = time.perf_counter() - start
+    return {
+        "items": len(videos),
+        "seconds": round(seconds, 3),
+        "items_per_second": round(len(videos) / max(seconds, 1e-9), 1),
+        "round_trips": counter.total,
+        "round_trips_per_item": round(counter.total / max(len(videos), 1), 3),
+        "top_commands": dict(counter.counts.most_common(5)),
+        "peak_rss_mb": round(peak.mb, 1),
+    }
+
+
+def _case_process(conn, verbose: bool, *args):
+    if not verbose:
+        # Antes de importar los extractores: sus handlers de logging toman sys.stderr
+        sys.stdout = sys.stderr = open(os.devnull, "w")
+    try:
+        result = run_case(*args)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    conn.send(result)
+    conn.close()
+
+
+def run_isolated(timeout: float, verbose: bool, *args) -> dict:
+    """run_case en un proceso nuevo; si pasa `timeout`, lo mata junto con sus Chromes"""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_case_process, args=(sender, verbose, *args))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = {"error": f"el proceso terminó con código {process.exitcode}"}
+    else:
+        for pid in reversed(process_tree(process.pid)):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        result = {"error": f"timeout ({timeout} s)"}
+    process.join()
+    return result
+
+
+def environment() -> dict:
+    """Datos para saber qué se midió al comparar reportes"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        from selenium import __version__ as selenium_version
+    except ImportError:
+        selenium_version = None
+    return {
+        "date": datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "selenium": selenium_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results: list, baseline: dict) -> list:
+    """Cambio de tiempo y de videos/s respecto a un reporte anterior"""
+    previous = {(r["extractor"], r["videos"]): r for r in baseline["results"] if "error" not in r}
+    rows = []
+    for result in results:
+        before = previous.get((result["extractor"], result["videos"]))
+        if not before or "error" in result:
+            continue
+        rows.append({
+            "extractor": result["extractor"],
+            "videos": result["videos"],
+            "seconds": [before["seconds"], result["seconds"]],
+            "speedup": round(before["seconds"] / max(result["seconds"], 1e-9), 2),
+            "round_trips": [before["round_trips"], result["round_trips"]],
+            "peak_rss_mb": [before["peak_rss_mb"], result["peak_rss_mb"]],
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,5000,20000",
+                        help="Tamaños de playlist separados por comas")
+    parser.add_argument("--extractors", default=",".join(EXTRACTORS),
+                        help=f"Extractores separados por comas ({','.join(EXTRACTORS)})")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote de continuación")
+    parser.add_argument("--latency", type=int, default=100, help="Latencia de cada lote (ms)")
+    parser.add_argument("--max-scrolls", type=int,
+                        help="Tope de scrolls del backend (default: sin tope, como en producción)")
+    parser.add_argument("--timeout", type=float, default=1800, help="Tiempo máximo por corrida (s)")
+    parser.add_argument("--output", help="Guardar el reporte JSON en este archivo")
+    parser.add_argument("--compare", metavar="JSON", help="Reporte anterior con el que comparar")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar los logs de los extractores")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    extractors = [name.strip() for name in args.extractors.split(",") if name.strip()]
+    unknown = set(extractors) - set(EXTRACTORS)
+    if unknown:
+        parser.error(f"extractores desconocidos: {', '.join(sorted(unknown))}")
+
+    results = []
+    for size in sizes:
+        with FixtureServer(total=size, batch=args.batch, latency_ms=args.latency) as server:
+            for extractor in extractors:
+                print(f"{extractor} × {size} videos...", file=sys.stderr)
+                result = run_isolated(args.timeout, args.verbose, extractor,
+                                      server.playlist_url(), args.max_scrolls)
+                result = {"extractor": extractor, "videos": size, **result}
+                if "items" in result:
+                    result["complete"] = result["items"] == size
+                results.append(result)
+
+    report = {
+        "environment": environment(),
+        "config": {"sizes": sizes, "batch": args.batch, "latency_ms": args.latency,
+                   "max_scrolls": args.max_scrolls},
+        "results": results,
+    }
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["comparison"] = compare(results, json.load(f))
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Utilidades compartidas por los benchmarks
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Permite importar los extractores desde la raíz del repositorio
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+class RoundTripCounter:
+    """
+    Cuenta los comandos WebDriver (un round-trip HTTP cada uno) emitidos
+    por cualquier driver mientras el contexto está activo
+
+    Uso:
+        with RoundTripCounter() as counter:
+            extractor._extract_video_details()
+        print(counter.total, counter.counts)
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self._original = None
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def __enter__(self):
+        counts = self.counts
+        original = self._original = WebDriver.execute
+
+        def execute(driver, driver_command, params=None):
+            counts[driver_command] += 1
+            return original(driver, driver_command, params)
+
+        WebDriver.execute = execute
+        return self
+
+    def __exit__(self, *exc):
+        WebDriver.execute = self._original
+
+
+def comparable(videos, ignore=("extracted_at",)):
+    """Registros sin los campos que cambian entre corridas"""
+    return [{k: v for k, v in video.items() if k not in ignore} for video in videos]
+
+
+def process_tree(pid: int) -> list:
+    """`pid` y los PIDs de todos sus descendientes (lee /proc: solo Linux)"""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # El nombre del proceso va entre paréntesis y puede tener espacios
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry))
+    found, pending = [pid], [pid]
+    while pending:
+        for child in parents.get(pending.pop(), []):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+def memory_kb(pid: int, field: str = "VmRSS:") -> int:
+    """Campo de memoria de un proceso: VmRSS: (de status) o Pss: (de smaps_rollup)"""
+    path = f"/proc/{pid}/smaps_rollup" if field == "Pss:" else f"/proc/{pid}/status"
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def tree_memory_mb(pid: int, field: str = "VmRSS:") -> float:
+    """Suma de `field` de `pid` y sus descendientes, en MB"""
+    return sum(memory_kb(child, field) for child in process_tree(pid)) / 1024
+
+
+class PeakRSS:
+    """
+    Pico de RSS de un proceso y sus descendientes (Chrome, chromedriver)
+    mientras el contexto está activo, muestreado cada `interval` segundos
+
+    Uso:
+        with PeakRSS() as peak:
+            extractor.extract(url)
+        print(peak.mb)
+    """
+
+    def __init__(self, pid: int = None, interval: float = 0.1):
+        self.pid = pid or os.getpid()
+        self.interval = interval
+        self.mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        self.mb = max(self.mb, tree_memory_mb(self.pid))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
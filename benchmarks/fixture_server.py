@@ -0,0 +1,612 @@
+"""
+Servidor HTTP local con páginas de playlist sintéticas
+
+Imita el marcado de YouTube que leen los extractores
+(ytd-playlist-video-renderer, #video-title, duración y miniatura) para poder
+medir cambios de rendimiento sin depender de YouTube.
+
+Como en YouTube, la página trae solo el primer lote de videos y un
+ytd-continuation-item-renderer al final; al hacer scroll hasta él, la página
+pide el siguiente lote a /youtubei/v1/browse con el token de continuación.
+El mismo primer lote va incrustado como JSON en ytInitialData, junto con
+ytcfg, para el motor sin navegador (youtube_http.py).
+
+Con assets=True la página además pide lo que la real descarga y los
+extractores no necesitan: miniaturas, una fuente web, un preview de video y
+un script de anuncios (/pagead/), para medir el perfil lean de Chrome.
+
+Con index=N en la URL la lista empieza en la posición N (cada renderer
+lleva su posición absoluta en #index), para el modo segmentado.
+
+/files/<nombre> sirve un archivo sintético de `file_size` bytes (con Range)
+a `file_rate` bytes/s por conexión, como un CDN que limita cada descarga,
+para medir el orquestador de descargas (playlist_download.py); las primeras
+`file_failures` peticiones de cada archivo responden 503.
+
+/watch?v=ID sirve una página de video con ytInitialPlayerResponse (canal,
+vistas, fecha de subida y miniaturas) tras `watch_latency_ms`, para medir el
+enriquecimiento de metadatos (playlist_enrich.py).
+
+La ruta de la playlist incluye "youtube.com/playlist" para pasar la
+validación de URL de los extractores:
+    http://127.0.0.1:PUERTO/youtube.com/playlist?list=PLFIXTURE
+"""
+
+import base64
+import html
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{list_id} - YouTube</title>
+<script>
+window.ytcfg = {{
+    data_: {{}},
+    set(values) {{ Object.assign(this.data_, values); }},
+    get(key) {{ return this.data_[key]; }}
+}};
+ytcfg.set({ytcfg});
+var ytInitialData = {initial_data};
+</script>
+<style>
+  ytd-playlist-video-renderer {{ display: block; height: 90px; }}
+  ytd-continuation-item-renderer {{ display: block; height: 40px; }}
+</style>
+</head>
+<body>
+{assets}
+<ytd-playlist-video-list-renderer>
+<div id="contents">
+{items}
+</div>
+</ytd-playlist-video-list-renderer>
+<script>
+{script}
+</script>
+</body>
+</html>
+"""
+
+ASSETS_MARKUP = """<style>
+  @font-face { font-family: "YouTube Sans"; src: url("/s/fonts/youtube-sans.woff2") format("woff2"); }
+  body { font-family: "YouTube Sans", sans-serif; }
+</style>
+<script src="/pagead/ads.js" async></script>
+<video src="/media/preview.mp4" autoplay muted preload="auto" width="320" height="180"></video>"""
+
+# Script de anuncios: algo de CPU y memoria como los de verdad
+ADS_SCRIPT = b"""
+window.__ads = [];
+const until = performance.now() + 200;
+while (performance.now() < until) {
+    window.__ads.push({slot: window.__ads.length, html: '<div class="ad">' + Math.random() + '</div>'});
+}
+"""
+
+
+def _png(width: int, height: int) -> bytes:
+    """PNG RGB con ruido (no se comprime, pesa como una miniatura real)"""
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+    rows = b"".join(b"\x00" + os.urandom(width * 3) for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows))
+            + chunk(b"IEND", b""))
+
+
+RENDERER_TEMPLATE = """<ytd-playlist-video-renderer class="style-scope ytd-playlist-video-list-renderer">
+<div id="index-container"><yt-formatted-string id="index">{index}</yt-formatted-string></div>
+<ytd-thumbnail><a id="thumbnail" href="/watch?v={video_id}&amp;list={list_id}&amp;index={index}">
+<img src="/vi/{video_id}/hqdefault.jpg" width="160" height="90">
+<ytd-thumbnail-overlay-time-status-renderer><span class="style-scope ytd-thumbnail-overlay-time-status-renderer">
+{duration}
+</span></ytd-thumbnail-overlay-time-status-renderer>
+</a></ytd-thumbnail>
+<div id="meta"><h3><a id="video-title" href="/watch?v={video_id}&amp;list={list_id}&amp;index={index}&amp;pp=sAQB" title="{title}">
+{title}
+</a></h3></div>
+</ytd-playlist-video-renderer>"""
+
+CONTINUATION_TEMPLATE = """<ytd-continuation-item-renderer data-token="{token}">
+<tp-yt-paper-spinner active></tp-yt-paper-spinner>
+</ytd-continuation-item-renderer>"""
+
+# Mismo marcado que RENDERER_TEMPLATE/CONTINUATION_TEMPLATE, generado en el
+# navegador a partir de la respuesta JSON de /youtubei/v1/browse
+PAGE_SCRIPT = r"""
+(function () {
+    const contents = document.querySelector('ytd-playlist-video-list-renderer #contents');
+    const esc = (s) => String(s).replace(/&/g, '&amp;').replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+    let loading = false;
+
+    function renderItem(item) {
+        if (item.continuationItemRenderer) {
+            const token = item.continuationItemRenderer.continuationEndpoint
+                .continuationCommand.token;
+            return '<ytd-continuation-item-renderer data-token="' + esc(token) + '">' +
+                '<tp-yt-paper-spinner active></tp-yt-paper-spinner>' +
+                '</ytd-continuation-item-renderer>';
+        }
+        const v = item.playlistVideoRenderer;
+        const index = v.index.simpleText;
+        const listId = v.navigationEndpoint.watchEndpoint.playlistId;
+        const title = esc(v.title.runs[0].text);
+        const watch = '/watch?v=' + v.videoId + '&amp;list=' + esc(listId) + '&amp;index=' + index;
+        return '<ytd-playlist-video-renderer class="style-scope ytd-playlist-video-list-renderer">' +
+            '<div id="index-container"><yt-formatted-string id="index">' + index + '</yt-formatted-string></div>' +
+            '<ytd-thumbnail><a id="thumbnail" href="' + watch + '">' +
+            '<img src="' + esc(v.thumbnail.thumbnails[0].url) + '" width="160" height="90">' +
+            '<ytd-thumbnail-overlay-time-status-renderer><span class="style-scope ytd-thumbnail-overlay-time-status-renderer">' +
+            esc(v.lengthText.simpleText) + '</span></ytd-thumbnail-overlay-time-status-renderer>' +
+            '</a></ytd-thumbnail>' +
+            '<div id="meta"><h3><a id="video-title" href="' + watch + '&amp;pp=sAQB" title="' + title + '">' +
+            title + '</a></h3></div>' +
+            '</ytd-playlist-video-renderer>';
+    }
+
+    async function loadMore() {
+        const continuation = contents.querySelector('ytd-continuation-item-renderer');
+        if (!continuation || loading) return;
+        if (continuation.getBoundingClientRect().top > window.innerHeight + 200) return;
+        loading = true;
+        try {
+            const url = '/youtubei/v1/browse?key=' + ytcfg.get('INNERTUBE_API_KEY') +
+                '&prettyPrint=false';
+            const response = await fetch(url, {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({
+                    context: ytcfg.get('INNERTUBE_CONTEXT'),
+                    continuation: continuation.dataset.token
+                })
+            });
+            const data = await response.json();
+            const items = data.onResponseReceivedActions[0]
+                .appendContinuationItemsAction.continuationItems;
+            continuation.remove();
+            contents.insertAdjacentHTML('beforeend', items.map(renderItem).join(''));
+        } finally {
+            loading = false;
+        }
+    }
+
+    window.addEventListener('scroll', loadMore, {passive: true});
+})();
+"""
+
+
+YTCFG = {
+    "INNERTUBE_API_KEY": "fixture-api-key",
+    "INNERTUBE_CLIENT_VERSION": "2.20240101.00.00",
+    "INNERTUBE_CONTEXT": {"client": {"clientName": "WEB", "clientVersion": "2.20240101.00.00"}},
+}
+
+
+def fixture_video(index: int, added: int = 0) -> dict:
+    """
+    Datos deterministas del video en la posición `index` (1-based)
+
+    Con `added` > 0 las primeras `added` posiciones son videos nuevos y el
+    resto es la playlist original desplazada (como una playlist que creció
+    por arriba desde la última extracción).
+    """
+    if index <= added:
+        return {
+            "index": index,
+            "video_id": f"new{index:08d}",
+            "title": f"Video nuevo #{index}",
+            "duration": f"{index % 60}:{index % 60:02d}",
+            "length_seconds": (index % 60) * 61,
+        }
+    number = index - added
+    return {
+        "index": index,
+        "video_id": f"vid{number:08d}",
+        "title": f'Video sintético #{number} "demo" & más',
+        "duration": f"{number % 60}:{number % 60:02d}",
+        "length_seconds": (number % 60) * 61,
+    }
+
+
+def encode_token(list_id: str, start: int) -> str:
+    return base64.urlsafe_b64encode(f"{list_id}:{start}".encode()).decode()
+
+
+def decode_token(token: str):
+    list_id, start = base64.urlsafe_b64decode(token.encode()).decode().rsplit(":", 1)
+    return list_id, int(start)
+
+
+def fixture_item(list_id: str, index: int, added: int = 0) -> dict:
+    """Video en el formato playlistVideoRenderer de las respuestas de YouTube"""
+    video = fixture_video(index, added)
+    video_id = video["video_id"]
+    return {
+        "playlistVideoRenderer": {
+            "videoId": video_id,
+            "index": {"simpleText": str(index)},
+            "title": {"runs": [{"text": video["title"]}]},
+            "lengthText": {"simpleText": video["duration"]},
+            "lengthSeconds": str(video["length_seconds"]),
+            "thumbnail": {"thumbnails": [
+                {"url": f"/vi/{video_id}/hqdefault.jpg", "width": 168, "height": 94}
+            ]},
+            "shortBylineText": {"runs": [{"text": "Canal sintético"}]},
+            "navigationEndpoint": {
+                "commandMetadata": {"webCommandMetadata": {
+                    "url": f"/watch?v={video_id}&list={list_id}&index={index}&pp=sAQB"
+                }},
+                "watchEndpoint": {"videoId": video_id, "playlistId": list_id, "index": index - 1},
+            },
+            "isPlayable": True,
+        }
+    }
+
+
+def continuation_item(list_id: str, start: int) -> dict:
+    return {
+        "continuationItemRenderer": {
+            "trigger": "CONTINUATION_TRIGGER_ON_ITEM_SHOWN",
+            "continuationEndpoint": {
+                "continuationCommand": {"token": encode_token(list_id, start)}
+            },
+        }
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    # La cola de listen() por defecto (5) pierde conexiones cuando muchos
+    # clientes conectan a la vez y el reintento del SYN tarda ~1 s
+    request_queue_size = 128
+
+
+def _script_json(data) -> str:
+    """JSON seguro para incrustar dentro de <script>"""
+    return json.dumps(data, ensure_ascii=False).replace("</", "<\\/")
+
+
+def render_items(list_id: str, start: int, end: int, added: int = 0) -> str:
+    """Marcado HTML de los renderers con posiciones [start, end]"""
+    parts = []
+    for index in range(start, end + 1):
+        video = fixture_video(index, added)
+        parts.append(RENDERER_TEMPLATE.format(
+            index=index,
+            list_id=list_id,
+            video_id=video["video_id"],
+            title=html.escape(video["title"]),
+            duration=video["duration"],
+        ))
+    return "\n".join(parts)
+
+
+class FixtureServer:
+    """
+    Servidor de fixtures en un hilo de fondo
+
+    Uso:
+        with FixtureServer(total=2000, batch=100, latency_ms=300) as server:
+            driver.get(server.playlist_url())
+    """
+
+    def __init__(self, total: int = 100, batch: int = 100, latency_ms: int = 0,
+                 host: str = "127.0.0.1", port: int = 0, added: int = 0,
+                 assets: bool = False, asset_latency_ms: int = 0,
+                 file_size: int = 1024 * 1024, file_rate: int = 0, file_failures: int = 0,
+                 watch_latency_ms: int = 0, hidden: int = 0):
+        """
+        Args:
+            total: Número de videos de la playlist sintética
+            batch: Videos por página (inicial y por continuación)
+            latency_ms: Demora de cada respuesta de continuación
+            host: Interfaz donde escuchar
+            port: Puerto (0 = elegir uno libre)
+            added: Videos nuevos al principio de la lista (ver fixture_video)
+            assets: Servir miniaturas, fuente, preview de video y script de anuncios
+            asset_latency_ms: Demora de cada uno de esos recursos
+            file_size: Bytes de cada archivo de /files/
+            file_rate: Bytes/s por conexión al servir /files/ (0 = sin límite)
+            file_failures: Peticiones de cada archivo que fallan con 503 antes de servirlo
+            watch_latency_ms: Demora de cada página /watch
+            hidden: Videos no disponibles que la cabecera cuenta además de
+                `total` y que la lista oculta (con el aviso de alerts)
+        """
+        self.total = total
+        self.added = added
+        self.batch = batch
+        self.latency_ms = latency_ms
+        self.assets = assets
+        self.asset_latency_ms = asset_latency_ms
+        self.asset_requests = 0
+        self._asset_bodies = {}
+        self.file_size = file_size
+        self.file_rate = file_rate
+        self.file_failures = file_failures
+        self.file_requests = {}
+        self._file_body = None
+        self._file_lock = threading.Lock()
+        self.watch_latency_ms = watch_latency_ms
+        self.watch_requests = 0
+        self.hidden = hidden
+        self.httpd = _Server((host, port), self._handler_class())
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def playlist_url(self, list_id: str = "PLFIXTURE") -> str:
+        return f"{self.base_url}/youtube.com/playlist?list={list_id}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def page_items(self, list_id: str, start: int) -> list:
+        """Lote de items (formato JSON de YouTube) que empieza en `start`"""
+        end = min(start + self.batch - 1, self.total)
+        items = [fixture_item(list_id, index, self.added) for index in range(start, end + 1)]
+        if end < self.total:
+            items.append(continuation_item(list_id, end + 1))
+        return items
+
+    def initial_data(self, list_id: str, items: list) -> dict:
+        """ytInitialData con la misma forma que la página real de una playlist"""
+        data = {
+            "contents": {"twoColumnBrowseResultsRenderer": {"tabs": [{"tabRenderer": {
+                "selected": True,
+                "content": {"sectionListRenderer": {"contents": [{"itemSectionRenderer": {
+                    "contents": [{"playlistVideoListRenderer": {
+                        "contents": items,
+                        "playlistId": list_id,
+                        "isEditable": False,
+                    }}]
+                }}]}},
+            }}]}},
+            "header": {"playlistHeaderRenderer": {
+                "playlistId": list_id,
+                "title": {"simpleText": f"Playlist sintética {list_id}"},
+                "numVideosText": {"runs": [{"text": str(self.total + self.hidden)}, {"text": " videos"}]},
+            }},
+        }
+        if self.hidden:
+            data["alerts"] = [{"alertWithButtonRenderer": {
+                "type": "INFO",
+                "text": {"simpleText": f"{self.hidden} unavailable videos are hidden"},
+            }}]
+        return data
+
+    def page(self, list_id: str, start: int = 1) -> str:
+        """
+        Página inicial: primer lote y continuación si quedan videos
+
+        Con `start` (parámetro index= de la URL) la lista empieza en esa
+        posición, como al abrir la playlist desde un video intermedio.
+        """
+        start = max(1, min(start, self.total))
+        end = min(start + self.batch - 1, self.total)
+        markup = render_items(list_id, start, end, self.added)
+        if end < self.total:
+            markup += "\n" + CONTINUATION_TEMPLATE.format(token=encode_token(list_id, end + 1))
+        initial_data = self.initial_data(list_id, self.page_items(list_id, start))
+        return PAGE_TEMPLATE.format(
+            list_id=html.escape(list_id),
+            ytcfg=_script_json(YTCFG),
+            initial_data=_script_json(initial_data),
+            items=markup,
+            script=PAGE_SCRIPT,
+            assets=ASSETS_MARKUP if self.assets else "",
+        )
+
+    def asset(self, path: str):
+        """(content type, cuerpo) del recurso en `path`, o None si no es un recurso"""
+        if path.endswith(".jpg"):
+            kind = ("image/png", lambda: _png(168, 94))
+        elif path.endswith(".woff2"):
+            kind = ("font/woff2", lambda: os.urandom(150 * 1024))
+        elif path.endswith(".mp4"):
+            kind = ("video/mp4", lambda: os.urandom(2 * 1024 * 1024))
+        elif path.startswith("/pagead/"):
+            kind = ("application/javascript", lambda: ADS_SCRIPT)
+        else:
+            return None
+        content_type, build = kind
+        # Todas las miniaturas comparten el mismo cuerpo
+        if content_type not in self._asset_bodies:
+            self._asset_bodies[content_type] = build()
+        return content_type, self._asset_bodies[content_type]
+
+    def watch_url(self) -> str:
+        """Plantilla de la página de cada video (para MetadataEnricher)"""
+        return f"{self.base_url}/watch?v={{video_id}}"
+
+    def watch_page(self, video_id: str) -> str:
+        """Página /watch con el ytInitialPlayerResponse del video"""
+        number = int(video_id[-8:]) if video_id[-8:].isdigit() else 0
+        player_response = {
+            "videoDetails": {
+                "videoId": video_id,
+                "title": f"Video sintético #{number}",
+                "author": f"Canal sintético {number % 7}",
+                "channelId": f"UCFIXTURE{number % 7:04d}",
+                "viewCount": str(number * 1000 + 7),
+                "lengthSeconds": str((number % 60) * 61),
+                "thumbnail": {"thumbnails": [
+                    {"url": f"/vi/{video_id}/default.jpg", "width": 120, "height": 90},
+                    {"url": f"/vi/{video_id}/maxresdefault.jpg", "width": 1280, "height": 720},
+                ]},
+            },
+            "microformat": {"playerMicroformatRenderer": {
+                "uploadDate": f"2020-{number % 12 + 1:02d}-{number % 28 + 1:02d}",
+                "publishDate": f"2020-{number % 12 + 1:02d}-{number % 28 + 1:02d}",
+            }},
+        }
+        return ("<!DOCTYPE html><html><head><meta charset=\"utf-8\"></head><body><script>"
+                f"var ytInitialPlayerResponse = {_script_json(player_response)};"
+                "</script></body></html>")
+
+    def file_url(self, name: str = "{video_id}.mp4") -> str:
+        """URL de /files/ (por defecto, plantilla para HTTPDownloader)"""
+        return f"{self.base_url}/files/{name}"
+
+    def file_body(self) -> bytes:
+        """Contenido de los archivos de /files/ (el mismo para todos)"""
+        if self._file_body is None:
+            self._file_body = os.urandom(self.file_size)
+        return self._file_body
+
+    def continuation(self, token: str) -> dict:
+        """Respuesta de /youtubei/v1/browse para un token de continuación"""
+        list_id, start = decode_token(token)
+        return {
+            "onResponseReceivedActions": [
+                {"appendContinuationItemsAction": {
+                    "continuationItems": self.page_items(list_id, start)
+                }}
+            ]
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Cabeceras y cuerpo salen en escrituras separadas: sin esto, Nagle
+            # y el ACK retardado del cliente suman ~40 ms a cada respuesta keep-alive
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+
+                if parsed.path.endswith("/playlist"):
+                    list_id = query.get("list", ["PLFIXTURE"])[0]
+                    try:
+                        start = int(query.get("index", ["1"])[0])
+                    except ValueError:
+                        start = 1
+                    body = server.page(list_id, start)
+                    self._send(200, "text/html; charset=utf-8", body.encode("utf-8"))
+                elif parsed.path == "/watch":
+                    with server._file_lock:
+                        server.watch_requests += 1
+                    if server.watch_latency_ms:
+                        time.sleep(server.watch_latency_ms / 1000)
+                    body = server.watch_page(query.get("v", [""])[0])
+                    self._send(200, "text/html; charset=utf-8", body.encode("utf-8"))
+                elif parsed.path.startswith("/files/"):
+                    self._send_file(parsed.path)
+                elif server.assets and server.asset(parsed.path):
+                    server.asset_requests += 1
+                    if server.asset_latency_ms:
+                        time.sleep(server.asset_latency_ms / 1000)
+                    self._send(200, *server.asset(parsed.path))
+                else:
+                    self._send(404, "text/plain", b"not found")
+
+            def do_POST(self):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+
+                if parsed.path == "/youtubei/v1/browse" and "continuation" in payload:
+                    if server.latency_ms:
+                        time.sleep(server.latency_ms / 1000)
+                    body = json.dumps(server.continuation(payload["continuation"]))
+                    self._send(200, "application/json", body.encode("utf-8"))
+                else:
+                    self._send(404, "text/plain", b"not found")
+
+            def _send_file(self, path):
+                with server._file_lock:
+                    count = server.file_requests[path] = server.file_requests.get(path, 0) + 1
+                if count <= server.file_failures:
+                    # El cliente no lee el cuerpo de un error: se cierra la conexión
+                    self.close_connection = True
+                    self.send_response(503)
+                    self.send_header("Connection", "close")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = server.file_body()
+                start = 0
+                match = self.headers.get("Range", "").partition("bytes=")[2].split("-")[0]
+                if match.isdigit():
+                    start = int(match)
+                    if start >= len(body):
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{len(body)}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", "video/mp4")
+                self.send_header("Content-Length", str(len(body) - start))
+                self.send_header("Accept-Ranges", "bytes")
+                self.end_headers()
+                # Trozos de 16 KB espaciados para no superar file_rate
+                chunk = 16 * 1024
+                for offset in range(start, len(body), chunk):
+                    self.wfile.write(body[offset:offset + chunk])
+                    if server.file_rate:
+                        time.sleep(chunk / server.file_rate)
+
+            def _send(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servidor de playlists sintéticas")
+    parser.add_argument("--videos", type=int, default=100, help="Videos en la playlist")
+    parser.add_argument("--batch", type=int, default=100, help="Videos por lote")
+    parser.add_argument("--latency", type=int, default=0, help="Demora de cada lote (ms)")
+    parser.add_argument("--port", type=int, default=8000, help="Puerto")
+    parser.add_argument("--added", type=int, default=0, help="Videos nuevos al principio")
+    parser.add_argument("--assets", action="store_true",
+                        help="Servir miniaturas, fuente, preview de video y anuncios")
+    parser.add_argument("--asset-latency", type=int, default=0, help="Demora de cada recurso (ms)")
+    args = parser.parse_args()
+
+    server = FixtureServer(total=args.videos, batch=args.batch,
+                           latency_ms=args.latency, port=args.port, added=args.added,
+                           assets=args.assets, asset_latency_ms=args.asset_latency)
+    print(f"Playlist sintética en {server.playlist_url()}")
+    server.httpd.serve_forever()
@@ -0,0 +1,90 @@
+"""
+Perfil "lean" de Chrome para extraer playlists
+
+Los extractores solo leen texto y hrefs, pero Chrome descarga y decodifica
+cada miniatura, las fuentes, los previews de video y los scripts de
+anuncios y telemetría. El perfil lean:
+
+- desactiva imágenes, autoplay y fuentes remotas con prefs y flags de Chrome
+- bloquea por CDP (Network.setBlockedURLs) imágenes, media, fuentes y
+  scripts de terceros que igual se pidan
+- usa page_load_strategy 'eager' (driver.get vuelve en DOMContentLoaded, sin
+  esperar a las imágenes) y el headless nuevo
+
+Las miniaturas se siguen extrayendo: se leen del atributo src o de
+ytInitialData, no hace falta descargarlas.
+
+Hay una copia idéntica en backend/ (el backend se despliega solo con esa
+carpeta y no puede importarlo desde la raíz); tests/test_backend_sync.py
+falla si las copias difieren.
+"""
+
+import logging
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+HEADLESS_ARGUMENT = '--headless=new'
+
+LEAN_ARGUMENTS = (
+    '--blink-settings=imagesEnabled=false',
+    '--disable-remote-fonts',
+    '--autoplay-policy=user-gesture-required',
+    '--mute-audio',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--no-first-run',
+)
+
+LEAN_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.geolocation': 2,
+    'profile.default_content_setting_values.media_stream': 2,
+}
+
+# Patrones de Network.setBlockedURLs (* es comodín)
+LEAN_BLOCKED_URLS = (
+    # Imágenes (miniaturas, avatares, banners)
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*i.ytimg.com/*', '*yt3.ggpht.com/*', '*yt3.googleusercontent.com/*',
+    # Video y audio (previews al pasar el mouse, reproductor)
+    '*.mp4', '*.webm', '*.m4a', '*.mp3', '*googlevideo.com/*',
+    # Fuentes
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*fonts.googleapis.com/*', '*fonts.gstatic.com/*',
+    # Anuncios y telemetría
+    '*doubleclick.net/*', '*googlesyndication.com/*', '*googleadservices.com/*',
+    '*google-analytics.com/*', '*googletagmanager.com/*', '*imasdk.googleapis.com/*',
+    '*/pagead/*', '*/ptracking*', '*/api/stats/*', '*/generate_204*', '*/log_event*',
+)
+
+
+def apply_lean_profile(options):
+    """
+    Agrega el perfil lean a unas ChromeOptions
+
+    No agrega --headless: el llamador decide (con HEADLESS_ARGUMENT).
+    """
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_experimental_option('prefs', dict(LEAN_PREFS))
+    options.page_load_strategy = 'eager'
+    return options
+
+
+def block_requests(driver, patterns: Iterable[str] = LEAN_BLOCKED_URLS) -> bool:
+    """
+    Bloquea por CDP las peticiones que coincidan con `patterns`
+
+    El bloqueo se aplica a la pestaña actual y se mantiene entre
+    navegaciones. Devuelve False si el driver no soporta CDP.
+    """
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+        return True
+    except Exception as e:
+        logger.warning(f"No se pudo activar el bloqueo de peticiones por CDP: {e}")
+        return False
@@ -8,19 +8,28 @@ No requiere API Key
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import time
-import json
 import sys
 
-def extract_playlist(playlist_url, expected_videos=None):
+from playlist_dom import (
+    RENDERER_SELECTOR, ScrollStats, harvest_rows, playlist_counts, prepare_adaptive_wait,
+    scroll_and_wait
+)
+from playlist_export import PlaylistExporter, default_paths
+
+def extract_playlist(playlist_url, expected_videos=None, bulk=True, on_video=None, adaptive=True):
     """
     Extrae todos los videos de una playlist de YouTube
     
     Args:
         playlist_url: URL de la playlist
-        expected_videos: Número esperado de videos (opcional)
+        expected_videos: Número esperado de videos (default: el total de la
+            cabecera de la playlist menos los videos no disponibles ocultos)
+        bulk: Leer los videos con execute_script tras cada scroll, solo los
+            nuevos (más rápido que leerlos uno por uno al final)
+        on_video: Callback que recibe cada video en cuanto se extrae (opcional)
+        adaptive: Esperar tras cada scroll solo hasta que carguen videos nuevos
+            o desaparezca la continuación, en lugar de 2 segundos fijos
     
     Returns:
         Lista de diccionarios con información de cada video
@@ -41,78 +50,152 @@ def extract_playlist(playlist_url, expected_videos=None):
     print("🚀 Iniciando navegador...")
     driver = webdriver.Chrome(options=chrome_options)
     
+    videos = []
+    harvested = 0  # Renderers del DOM ya leídos
+    
+    def add_video(idx, title, url, video_id):
+        video = {
+            "index": idx,
+            "title": title,
+            "video_id": video_id,
+            "url": url,
+            "url_simple": f"https://www.youtube.com/watch?v={video_id}"
+        }
+        videos.append(video)
+        print(f"   ✓ Video {idx}: {title[:50]}...")
+        if on_video:
+            on_video(video)
+    
+    def harvest_new():
+        """Lee solo los renderers que aparecieron desde la última llamada"""
+        nonlocal harvested
+        rows = harvest_rows(driver, harvested)
+        harvested += len(rows)
+        for idx, title, url, video_id, _duration, _thumbnail in rows:
+            if title is None:
+                print(f"   ✗ Error en video {idx}: #video-title no encontrado")
+                continue
+            add_video(idx, title, url, video_id)
+    
     try:
         # Navegar a la playlist
         driver.get(playlist_url)
         print("⏳ Cargando página inicial...")
         time.sleep(3)
         
+        # Total de la cabecera: la lista está completa al llegar a él
+        reported, hidden = playlist_counts(driver)
+        if reported is not None:
+            ocultos = f" ({hidden} no disponibles ocultos)" if hidden else ""
+            print(f"📊 La playlist reporta {reported} videos{ocultos}")
+            if not expected_videos:
+                expected_videos = reported - hidden
+        
         # Scroll infinito para cargar todos los videos
         print("📜 Ejecutando scroll infinito...\n")
-        last_height = driver.execute_script("return document.documentElement.scrollHeight")
         scroll_count = 0
         videos_loaded = 0
+        no_new_count = 0
+        stats = ScrollStats('adaptive' if adaptive else 'fixed')
+        
+        if not adaptive:
+            last_height = driver.execute_script("return document.documentElement.scrollHeight")
+        else:
+            prepare_adaptive_wait(driver, 10)
+            # La espera adaptativa necesita saber cuántos videos hay antes del scroll
+            if bulk:
+                harvest_new()
+                videos_loaded = harvested
+            else:
+                videos_loaded = len(driver.find_elements(By.CSS_SELECTOR, RENDERER_SELECTOR))
         
         while True:
+            if expected_videos and videos_loaded >= expected_videos:
+                print(f"\n✅ Se alcanzó el número esperado de videos ({expected_videos})")
+                stats.end_reason = 'expected'
+                break
+            
             scroll_count += 1
+            step_start = time.perf_counter()
             
             # Hacer scroll
-            driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
-            time.sleep(2)
+            if adaptive:
+                state = scroll_and_wait(driver, videos_loaded)
+            else:
+                driver.execute_script("window.scrollTo(0, document.documentElement.scrollHeight);")
+                time.sleep(2)
+            waited = time.perf_counter() - step_start
             
-            # Contar videos actuales
-            items = driver.find_elements(By.CSS_SELECTOR, "ytd-playlist-video-renderer")
-            videos_loaded = len(items)
+            # Contar videos actuales (con bulk, leyendo ya los nuevos)
+            if bulk:
+                harvest_new()
+                videos_loaded = harvested
+            else:
+                items = driver.find_elements(By.CSS_SELECTOR, RENDERER_SELECTOR)
+                videos_loaded = len(items)
             
             print(f"   Scroll {scroll_count}: {videos_loaded} videos cargados", end='\r')
             
             # Verificar si llegamos al final
-            new_height = driver.execute_script("return document.documentElement.scrollHeight")
+            if adaptive:
+                # Sin continuación la lista terminó; un timeout puede ser una
+                # respuesta lenta, así que hacen falta dos seguidos
+                no_new_count = no_new_count + 1 if state['reason'] == 'timeout' else 0
+                list_complete = state['reason'] == 'end' or no_new_count >= 2
+                stats.end_reason = state['reason']
+                stats.record(waited, state['reason'] == 'grew')
+            else:
+                new_height = driver.execute_script("return document.documentElement.scrollHeight")
+                list_complete = new_height == last_height
+                stats.end_reason = 'height'
+                last_height = new_height
+                stats.record(waited, not list_complete)
             
             # Condiciones de parada
-            if new_height == last_height:
+            if list_complete:
                 print(f"\n✅ Scroll completo - No hay más videos para cargar")
                 break
-            
-            if expected_videos and videos_loaded >= expected_videos:
-                print(f"\n✅ Se alcanzó el número esperado de videos ({expected_videos})")
-                break
-            
-            last_height = new_height
         
+        print(f"⏱️  Scroll: {stats.summary()}")
         print(f"\n📊 Extrayendo información de {videos_loaded} videos...\n")
         
         # Extraer información de cada video
-        videos = []
-        items = driver.find_elements(By.CSS_SELECTOR, "ytd-playlist-video-renderer")
-        
-        for idx, item in enumerate(items, 1):
-            try:
-                # Extraer título
-                title_element = item.find_element(By.ID, "video-title")
-                title = title_element.text.strip()
-                
-                # Extraer URL
-                url = title_element.get_attribute("href")
-                
-                # Extraer video ID
-                video_id = url.split("v=")[1].split("&")[0] if "v=" in url else ""
-                
-                videos.append({
-                    "index": idx,
-                    "title": title,
-                    "video_id": video_id,
-                    "url": url,
-                    "url_simple": f"https://www.youtube.com/watch?v={video_id}"
-                })
-                
-                print(f"   ✓ Video {idx}: {title[:50]}...")
-                
-            except Exception as e:
-                print(f"   ✗ Error en video {idx}: {str(e)}")
-                continue
+        if bulk:
+            # Solo lo que apareció después del último scroll
+            harvest_new()
+        else:
+            items = driver.find_elements(By.CSS_SELECTOR, RENDERER_SELECTOR)
+            
+            for idx, item in enumerate(items, 1):
+                try:
+                    # Extraer título
+                    title_element = item.find_element(By.ID, "video-title")
+                    title = title_element.text.strip()
+                    
+                    # Extraer URL
+                    url = title_element.get_attribute("href")
+                    
+                    # Extraer video ID
+                    video_id = url.split("v=")[1].split("&")[0] if "v=" in url else ""
+                    
+                    add_video(idx, title, url, video_id)
+                    
+                except Exception as e:
+                    print(f"   ✗ Error en video {idx}: {str(e)}")
+                    continue
         
-        print(f"\n✅ Extracción completada: {len(videos)} videos\n")
+        print(f"\n✅ Extracción completada: {len(videos)} videos")
+        if reported is not None:
+            gap = reported - len(videos)
+            if gap == 0:
+                print(f"✅ Coincide con la cabecera: {reported} videos")
+            elif 0 < gap <= hidden:
+                print(f"✅ Faltan {gap} de {reported} videos: la playlist oculta {hidden} no disponibles")
+            elif gap < 0:
+                print(f"⚠️  Extraídos {len(videos)} videos, más que los {reported} de la cabecera")
+            else:
+                print(f"⚠️  Faltan {gap} videos respecto de la cabecera ({reported}, {hidden} ocultos)")
+        print()
         return videos
         
     finally:
@@ -120,72 +203,35 @@ def extract_playlist(playlist_url, expected_videos=None):
         print("🔒 Navegador cerrado")
 
 def save_results(videos, playlist_url):
-    """Guarda los resultados en múltiples formatos"""
+    """Guarda los resultados en múltiples formatos (JSON, TXT, CSV y DLC en una sola pasada)"""
     
     # Extraer ID de playlist
     playlist_id = playlist_url.split("list=")[1].split("&")[0] if "list=" in playlist_url else "playlist"
     
-    # 1. Guardar JSON
-    json_file = f"playlist_{playlist_id}.json"
-    with open(json_file, "w", encoding="utf-8") as f:
-        json.dump({
-            "playlist_url": playlist_url,
-            "total_videos": len(videos),
-            "videos": videos
-        }, f, ensure_ascii=False, indent=2)
-    print(f"💾 JSON guardado: {json_file}")
+    base = f"playlist_{playlist_id}"
+    with PlaylistExporter(
+        default_paths(base),
+        formats=("json", "txt", "csv", "dlc"),
+        json_header={"playlist_url": playlist_url, "total_videos": len(videos)},
+        # Mismo CSV que antes: título siempre entre comillas y fin de línea \n
+        csv_fields=[("Index", "index"), ("Title", "title"), ("Video ID", "video_id"), ("URL", "url_simple")],
+        csv_quoted=("title",),
+        csv_lineterminator="\n",
+        dlc_package=f"YouTube Playlist {playlist_id}"
+    ) as exporter:
+        exporter.write_all(videos)
     
-    # 2. Guardar TXT (solo URLs)
-    txt_file = f"playlist_{playlist_id}_urls.txt"
-    with open(txt_file, "w", encoding="utf-8") as f:
-        for video in videos:
-            f.write(f"{video['url_simple']}\n")
-    print(f"💾 TXT guardado: {txt_file}")
-    
-    # 3. Guardar CSV
-    csv_file = f"playlist_{playlist_id}.csv"
-    with open(csv_file, "w", encoding="utf-8") as f:
-        f.write("Index,Title,Video ID,URL\n")
-        for video in videos:
-            # Escapar comillas en el título
-            title = video['title'].replace('"', '""')
-            f.write(f'{video["index"]},"{title}",{video["video_id"]},{video["url_simple"]}\n')
-    print(f"💾 CSV guardado: {csv_file}")
-    
-    # 4. Crear archivo DLC para JDownloader
-    dlc_file = f"playlist_{playlist_id}.dlc"
-    dlc_content = f"""<dlc>
-<header>
-<generator>YouTube Playlist Extractor</generator>
-<tribute>Created with Python + Selenium</tribute>
-</header>
-<content>
-<package name="YouTube Playlist {playlist_id}" passwords="" comment="">
-"""
-    for video in videos:
-        import base64
-        url_encoded = base64.b64encode(video['url_simple'].encode()).decode()
-        dlc_content += f'<file><url>{url_encoded}</url></file>\n'
-    
-    dlc_content += """</package>
-</content>
-</dlc>"""
-    
-    with open(dlc_file, "w", encoding="utf-8") as f:
-        f.write(dlc_content)
-    print(f"💾 DLC guardado: {dlc_file}")
+    for fmt in ("json", "txt", "csv", "dlc"):
+        print(f"💾 {fmt.upper()} guardado: {exporter.paths[fmt]}")
 
 if __name__ == "__main__":
     # URL de la playlist (puedes cambiarla aquí o pasarla como argumento)
     if len(sys.argv) > 1:
         playlist_url = sys.argv[1]
     else:
-        # URL por defecto (tu playlist de 119 videos)
+        # URL por defecto
         playlist_url = "https://www.youtube.com/playlist?list=PLCYBQp7vbvBHqtaozeouLD9ek-GuiMcjo"
     
-    # Número esperado de videos (opcional)
-    expected_videos = 119 if "PLCYBQp7vbvBHqtaozeouLD9ek-GuiMcjo" in playlist_url else None
-    
     print("=" * 60)
     print("🎬 YOUTUBE PLAYLIST EXTRACTOR - 100% COMPLETO")
     print("=" * 60)
@@ -193,7 +239,7 @@ if __name__ == "__main__":
     
     try:
         # Extraer videos
-        videos = extract_playlist(playlist_url, expected_videos)
+        videos = extract_playlist(playlist_url)
         
         if videos:
             # Guardar resultados
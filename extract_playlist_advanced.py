@@ -7,19 +7,44 @@ Con reintentos automáticos, validación y reportes detallados
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
 import json
-import csv
 import sys
 import os
 from datetime import datetime
 from collections import defaultdict
 import logging
-from typing import List, Dict, Optional
+import multiprocessing
+from multiprocessing.util import Finalize
+import queue
+import threading
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 import argparse
+import cProfile
+import io
+import pstats
+
+from browser_profile import HEADLESS_ARGUMENT, apply_lean_profile, block_requests
+from playlist_dom import (
+    RENDERER_SELECTOR, ScrollStats, fetch_continuations, first_index, harvest_and_prune, harvest_rows,
+    playlist_counts, prepare_adaptive_wait, prepare_fetch, scroll_and_wait
+)
+from playlist_catalog import PlaylistCatalog, main as catalog_main
+from playlist_checkpoint import CheckpointWriter, load_checkpoint
+from playlist_download import main as download_main
+from playlist_enrich import METADATA_FIELDS, MetadataEnricher
+from playlist_export import FORMATS, VIDEO_FIELDS, PlaylistExporter, default_paths
+from phase_timer import PhaseTimer
+from playlist_replay import (
+    OFFLINE_ARGUMENT, PlaylistRecorder, ReplayServer, enable_network_log, enlarge_network_buffers,
+    record_network
+)
+from playlist_sync import PlaylistResync, load_previous
+from webdriver_trace import CommandTracer, enable_chrome_trace, read_chrome_trace, save_chrome_trace
+from youtube_http import PlaylistHTTPClient, renderer_to_row, split_items
 
 # Configurar logging
 logging.basicConfig(
@@ -35,36 +60,107 @@ logger = logging.getLogger(__name__)
 class YouTubePlaylistExtractor:
     """Extractor avanzado de playlists con validaciones y reintentos"""
     
-    def __init__(self, headless=True, max_retries=3, scroll_pause_time=2):
+    ENGINE = 'selenium'
+    HARVEST_MODES = ('incremental', 'prune', 'bulk', 'elements')
+    SCROLL_WAITS = ('adaptive', 'fixed')
+    LOAD_MODES = ('scroll', 'fetch')
+    FETCH_REQUESTS = 10  # Continuaciones por llamada a fetch_continuations en modo 'fetch'
+    
+    def __init__(self, headless=True, max_retries=3, scroll_pause_time=2, harvest_mode='incremental',
+                 scroll_wait='adaptive', scroll_timeout=10, reuse_driver=False, lean_browser=False,
+                 load_mode='scroll'):
         """
         Inicializa el extractor
         
         Args:
             headless: Ejecutar sin interfaz gráfica
-            max_retries: Número máximo de reintentos en caso de error
+            max_retries: Reintentos de extract() si la extracción falla (cada
+                uno arranca otro Chrome y sigue desde la última posición cosechada)
             scroll_pause_time: Tiempo de pausa entre scrolls (segundos)
+            harvest_mode: 'incremental' (cosecha los videos nuevos tras cada scroll),
+                'prune' (como incremental, pero quita del DOM lo ya cosechado:
+                memoria acotada en playlists enormes), 'bulk' (un solo execute_script al final) o 'elements'
+                (find_element/.text por cada video)
+            scroll_wait: 'adaptive' (espera hasta que aparezcan videos nuevos o
+                desaparezca la continuación) o 'fixed' (scroll_pause_time por scroll)
+            scroll_timeout: Espera máxima por scroll en modo 'adaptive' (segundos)
+            reuse_driver: Mantener Chrome abierto entre llamadas a extract()
+                (usar reset() entre playlists y close() al terminar)
+            lean_browser: Perfil lean de Chrome (sin imágenes, media, fuentes ni
+                scripts de anuncios, carga 'eager' y headless nuevo)
+            load_mode: 'scroll' (scroll y lectura de los renderers) o 'fetch'
+                (las continuaciones se piden con fetch desde la página y se
+                leen del JSON, sin renderizarlas; harvest_mode y scroll_wait
+                no se usan)
         """
+        if harvest_mode not in self.HARVEST_MODES:
+            raise ValueError(f"harvest_mode inválido: {harvest_mode}")
+        if scroll_wait not in self.SCROLL_WAITS:
+            raise ValueError(f"scroll_wait inválido: {scroll_wait}")
+        if load_mode not in self.LOAD_MODES:
+            raise ValueError(f"load_mode inválido: {load_mode}")
         self.max_retries = max_retries
         self.scroll_pause_time = scroll_pause_time
+        self.harvest_mode = harvest_mode
+        self.scroll_wait = scroll_wait
+        self.scroll_timeout = scroll_timeout
+        self.scroll_stats = None
         self.videos = []
         self.duplicates = set()
         self.errors = []
         self.driver = None
         self.headless = headless
+        self.reuse_driver = reuse_driver
+        self.lean_browser = lean_browser
+        self.load_mode = load_mode
+        self.on_video = None
+        self.reported_total = None  # Total según la cabecera de la playlist
+        self.hidden_videos = 0  # Videos no disponibles que la playlist oculta
+        self.resync_state = None  # PlaylistResync durante resync()
+        self.phase_timer = PhaseTimer()  # Tiempos por fase de la última extracción
+        self._harvested = 0  # Renderers del DOM ya cosechados
+        self.segment = None  # (inicio, fin) en el modo segmentado; fin None = hasta el final
+        self.index_offset = 0  # Posiciones antes del primer renderer cargado
+        self.segment_report = None  # Resultado de extract_segmented()
+        self.enrich_stats = None  # Resultado de enrich_videos()
+        self.checkpoint = None  # CheckpointWriter (ver enable_checkpoint)
+        self.resume_index = None  # Posición tras la que continúa el próximo intento
+        self.attempts = 0  # Intentos de la última extracción
+        self.attempt_errors = []
+        self._attempt_start = 0  # Videos que ya había al empezar el intento
+        self.tracer = None  # CommandTracer (ver enable_profiling)
+        self.chrome_trace = False  # Grabar la traza de rendimiento de Chrome
+        self.trace_events = []  # Eventos de la traza de cada Chrome que se cerró
+        self.recorder = None  # PlaylistRecorder (ver enable_recording)
+        self.offline = False  # Chrome sin resolver hosts (reproducción con ReplayServer)
         
     def _init_driver(self):
         """Inicializa el driver de Selenium"""
         options = webdriver.ChromeOptions()
         if self.headless:
-            options.add_argument('--headless')
+            options.add_argument(HEADLESS_ARGUMENT if self.lean_browser else '--headless')
         options.add_argument('--disable-gpu')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--log-level=3')
         options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        if self.lean_browser:
+            apply_lean_profile(options)
+        if self.chrome_trace:
+            enable_chrome_trace(options)
+        if self.recorder:
+            enable_network_log(options)
+        if self.offline:
+            options.add_argument(OFFLINE_ARGUMENT)
         
         try:
             self.driver = webdriver.Chrome(options=options)
+            if self.tracer:
+                self.tracer.attach(self.driver, phase_of=lambda: self.phase_timer.current)
+            if self.recorder:
+                enlarge_network_buffers(self.driver)
+            if self.lean_browser:
+                block_requests(self.driver)
             logger.info("✅ Driver de Chrome inicializado correctamente")
         except Exception as e:
             logger.error(f"❌ Error al inicializar driver: {e}")
@@ -81,13 +177,20 @@ class YouTubePlaylistExtractor:
         except:
             return None
     
-    def extract(self, playlist_url: str, expected_videos: Optional[int] = None) -> List[Dict]:
+    def extract(self, playlist_url: str, expected_videos: Optional[int] = None,
+                on_video: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
         """
         Extrae todos los videos de la playlist
         
+        Si un intento falla (Chrome caído, timeout), reintenta hasta
+        max_retries veces abriendo la playlist con index= en la posición
+        siguiente a la última cosechada.
+        
         Args:
             playlist_url: URL de la playlist
             expected_videos: Número esperado de videos (opcional, para validación)
+            on_video: Callback que recibe cada video en cuanto se cosecha
+                (en modo 'incremental' se llama mientras continúa el scroll)
         
         Returns:
             Lista de diccionarios con información de videos
@@ -104,88 +207,616 @@ class YouTubePlaylistExtractor:
         if expected_videos:
             logger.info(f"📊 Esperando extraer: {expected_videos} videos")
         
-        # Inicializar driver
-        self._init_driver()
+        self.on_video = on_video
+        self.phase_timer = PhaseTimer()
+        self.attempts = 0
+        self.attempt_errors = []
+        segment = self.segment
         
         try:
-            # Navegar a la playlist
+            while True:
+                self.attempts += 1
+                try:
+                    self._extract_attempt(playlist_url, expected_videos)
+                    break
+                except Exception as e:
+                    logger.error(f"❌ Error durante la extracción (intento {self.attempts}): {e}")
+                    self.attempt_errors.append(f"Intento {self.attempts}: {e}")
+                    if self.checkpoint:
+                        self.checkpoint.flush()
+                    if self.attempts > self.max_retries:
+                        raise
+                    # Chrome pudo quedar en mal estado: se arranca otro y se sigue
+                    # desde la última posición cosechada en lugar de desde el video 1
+                    self.close()
+                    self.resume_index = self._last_index()
+                    wait = min(2 ** self.attempts, 30)
+                    logger.warning(f"🔁 Reintento {self.attempts}/{self.max_retries} en {wait}s "
+                                   f"desde la posición {self.resume_index + 1}")
+                    time.sleep(wait)
+        finally:
+            self.segment = segment
+            self.resume_index = None
+            if self.checkpoint:
+                self.checkpoint.flush()
+            if not self.reuse_driver:
+                self.close()
+        
+        if self.segment is None and not self.resync_state:
+            self._report_gap()
+        
+        logger.info(f"✅ Extracción completada: {len(self.videos)} videos")
+        logger.info(f"⏱️  Fases: {self.phase_timer.summary()}")
+        return self.videos
+    
+    def _extract_attempt(self, playlist_url: str, expected_videos: Optional[int] = None):
+        """Un intento de extract(); con resume_index continúa desde esa posición"""
+        timer = self.phase_timer
+        self._harvested = 0
+        self.index_offset = 0
+        self._attempt_start = len(self.videos)
+        scroll_target = expected_videos
+        
+        if self.resume_index:
+            # Como un segmento que empieza después de lo ya cosechado
+            start = self.resume_index + 1
+            self.segment = (start, self.segment[1] if self.segment else None)
+            playlist_url = segment_url(playlist_url, start)
+        
+        # Inicializar driver (o reutilizar el de la playlist anterior)
+        if self.driver is None:
+            with timer.phase('driver_start'):
+                self._init_driver()
+        
+        # Navegar a la playlist
+        with timer.phase('page_load'):
             self.driver.get(playlist_url)
             logger.info("⏳ Cargando playlist...")
             time.sleep(3)
-            
-            # Scroll infinito con reintentos
-            self._infinite_scroll(expected_videos)
+            self._set_reported_total(*playlist_counts(self.driver))
+        
+        if self.segment:
+            scroll_target = self._start_segment()
+        
+        listed = self._listed_total()
+        if scroll_target is None and listed and listed > self.index_offset:
+            # Sin --expected ni fin de segmento: la lista está completa al
+            # llegar al total de la cabecera, sin esperar más scrolls vacíos
+            scroll_target = listed - self.index_offset
+        
+        if self.load_mode == 'fetch':
+            # Continuaciones pedidas desde la página, sin scroll ni renderizado
+            with timer.phase('scroll'):
+                self._fetch_continuations(playlist_url, scroll_target)
+        else:
+            # Scroll infinito
+            with timer.phase('scroll'):
+                self._infinite_scroll(scroll_target)
             
             # Extraer información detallada de videos
-            self._extract_video_details()
-            
-            # Validar y reportar
-            self._validate_results(expected_videos)
-            
-            logger.info(f"✅ Extracción completada: {len(self.videos)} videos")
-            return self.videos
-            
+            with timer.phase('parse'):
+                self._extract_video_details()
+        
+        if self.segment:
+            with timer.phase('parse'):
+                self._trim_to_segment()
+        
+        self._record()
+        
+        # Validar y reportar
+        self._validate_results(expected_videos)
+    
+    def _last_index(self) -> int:
+        """Última posición cosechada (0 si todavía no hay videos)"""
+        return max((video['index'] for video in self.videos), default=0)
+    
+    def resume_from(self, checkpoint_file: str, playlist_url: str) -> bool:
+        """
+        Carga los videos de un checkpoint para que extract() siga desde ahí
+        
+        Returns:
+            True si el checkpoint ya marca la extracción como terminada
+        """
+        state = load_checkpoint(checkpoint_file)
+        if state is None:
+            logger.warning(f"⚠️  No existe {checkpoint_file}: se extrae desde el principio")
+            return False
+        if state["playlist_id"] and state["playlist_id"] != self._extract_playlist_id(playlist_url):
+            raise ValueError(f"{checkpoint_file} es de otra playlist ({state['playlist_id']})")
+        
+        self.videos = state["videos"]
+        self.duplicates = {video['video_id'] for video in self.videos}
+        self.resume_index = state["last_index"] or None
+        logger.info(f"♻️  Checkpoint {checkpoint_file}: {len(self.videos)} videos "
+                    f"hasta la posición {state['last_index']}")
+        return state["done"]
+    
+    def enable_checkpoint(self, checkpoint_file: str, playlist_url: str, every: int = 200):
+        """Guarda los videos cosechados en `checkpoint_file` cada `every` videos (ver playlist_checkpoint)"""
+        self.checkpoint = CheckpointWriter(checkpoint_file, playlist_url,
+                                           self._extract_playlist_id(playlist_url),
+                                           resume_from=self._last_index(), every=every)
+    
+    def enable_profiling(self, chrome_trace: bool = False) -> CommandTracer:
+        """
+        Registra los comandos WebDriver de cada Chrome que se abra (ver webdriver_trace)
+        
+        Args:
+            chrome_trace: Grabar también la traza de rendimiento de Chrome
+                (se lee al cerrar cada navegador, en trace_events)
+        """
+        self.tracer = CommandTracer()
+        self.chrome_trace = chrome_trace
+        return self.tracer
+    
+    def enable_recording(self, directory: str, playlist_url: str) -> PlaylistRecorder:
+        """Graba el HTML y las continuaciones que recibe el navegador (ver playlist_replay)"""
+        self.recorder = PlaylistRecorder(directory, playlist_url)
+        return self.recorder
+    
+    def _record(self):
+        """Pasa al recorder las respuestas que Chrome terminó de recibir"""
+        if not (self.recorder and self.driver):
+            return
+        try:
+            recorded = record_network(self.driver, self.recorder)
+            logger.info(f"📼 {recorded} respuestas grabadas")
         except Exception as e:
-            logger.error(f"❌ Error durante la extracción: {e}")
-            raise
-        finally:
-            if self.driver:
+            logger.warning(f"⚠️  No se pudieron grabar las respuestas: {e}")
+    
+    def reset(self):
+        """Descarta los resultados anteriores para extraer otra playlist con el mismo extractor"""
+        self.videos = []
+        self.duplicates = set()
+        self.errors = []
+        self.scroll_stats = None
+        self.reported_total = None
+        self.hidden_videos = 0
+        self.phase_timer = PhaseTimer()
+        self._harvested = 0
+        self.index_offset = 0
+        self.segment_report = None
+        self.enrich_stats = None
+        self.resume_index = None
+        self.attempts = 0
+        self.attempt_errors = []
+    
+    def close(self):
+        """Cierra el navegador (si hay uno abierto)"""
+        if self.driver:
+            self._record()
+            if self.chrome_trace:
+                try:
+                    self.trace_events.extend(read_chrome_trace(self.driver))
+                except Exception as e:
+                    logger.warning(f"⚠️  No se pudo leer la traza de Chrome: {e}")
+            try:
                 self.driver.quit()
+            except Exception as e:
+                logger.warning(f"⚠️  Error al cerrar el driver: {e}")
+            self.driver = None
+    
+    def iter_extract(self, playlist_url: str, expected_videos: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Igual que extract() pero como generador: produce cada video en cuanto
+        se cosecha, mientras la playlist sigue cargando
+        
+        Los errores de la extracción se relanzan en el consumidor.
+        """
+        results = queue.Queue()
+        done = object()
+        
+        def run():
+            try:
+                self.extract(playlist_url, expected_videos, on_video=results.put)
+            except Exception as e:
+                results.put(e)
+            finally:
+                results.put(done)
+        
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        
+        while True:
+            item = results.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        
+        worker.join()
+    
+    def resync(self, playlist_url: str, previous_file: str, known_run: int = 100,
+               on_video: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """
+        Re-sincroniza la playlist contra una extracción anterior
+        
+        Carga videos solo hasta que el resto de la lista coincide con la
+        extracción anterior (ver playlist_sync) y completa self.videos con
+        la lista entera.
+        
+        Args:
+            playlist_url: URL de la playlist
+            previous_file: JSON generado por save_json en la extracción anterior
+            known_run: Videos conocidos seguidos tras los que se deja de cargar
+            on_video: Callback que recibe cada video cargado
+        
+        Returns:
+            Delta con videos agregados, eliminados y reordenados
+        """
+        previous = load_previous(previous_file)
+        logger.info(f"🔁 Re-sincronizando contra {previous_file} ({len(previous)} videos)")
+        if self.load_mode == 'scroll' and self.harvest_mode not in ('incremental', 'prune'):
+            logger.warning("⚠️  Sin --harvest incremental o prune se carga la playlist completa")
+        
+        self.resync_state = PlaylistResync(previous, known_run)
+        try:
+            self.extract(playlist_url, on_video=on_video)
+            
+            self.videos = self.resync_state.merge(self.videos)
+            self.duplicates.update(video['video_id'] for video in self.videos)
+            delta = self.resync_state.delta(self.videos, self.reported_total)
+        finally:
+            self.resync_state = None
+        self._report_gap()
+        
+        delta['metadata']['previous_file'] = previous_file
+        logger.info(f"🔁 Delta: {len(delta['added'])} agregados, {len(delta['removed'])} eliminados, "
+                    f"{len(delta['reordered'])} reordenados "
+                    f"({delta['metadata']['assumed_unchanged']} videos sin recargar)")
+        return delta
+    
+    def extract_segmented(self, playlist_url: str, segments: int = 4,
+                          total: Optional[int] = None) -> List[Dict]:
+        """
+        Extrae la playlist en rangos de posiciones cargados en paralelo
+        
+        Cada rango se abre con el parámetro index= de la URL en su propio
+        Chrome, así ningún navegador recorre la lista entera desde el video 1.
+        Los resultados se unen por posición sin repetir video_id; los huecos
+        y solapamientos entre segmentos quedan en self.segment_report.
+        
+        Args:
+            playlist_url: URL de la playlist
+            segments: Rangos (y navegadores simultáneos)
+            total: Videos de la playlist (default: el total de la cabecera)
+        
+        Returns:
+            Lista de videos ordenada por posición
+        """
+        if not self._validate_url(playlist_url):
+            raise ValueError("URL de playlist inválida")
+        
+        if not total:
+            try:
+                total = PlaylistHTTPClient(max_retries=self.max_retries).fetch_total(playlist_url)
+            except Exception as e:
+                logger.warning(f"⚠️  No se pudo leer la cabecera de la playlist: {e}")
+            if not total:
+                raise ValueError("No se pudo leer el total de la playlist; indícalo con --expected")
+        self._set_reported_total(total)
+        
+        ranges = segment_ranges(total, segments)
+        logger.info(f"🧩 {len(ranges)} segmentos de ~{ranges[0][1] - ranges[0][0] + 1} videos en paralelo")
+        
+        def run(segment: Tuple[int, Optional[int]]) -> Dict:
+            extractor = self._segment_extractor()
+            extractor.segment = segment
+            start = time.perf_counter()
+            result = {"start": segment[0], "end": segment[1], "videos": [], "error": None}
+            try:
+                result["videos"] = extractor.extract(segment_url(playlist_url, segment[0]))
+            except Exception as e:
+                logger.error(f"❌ Segmento {segment[0]}-{segment[1] or ''}: {e}")
+                result["error"] = str(e)
+            result["first_index"] = extractor.index_offset + 1 if result["videos"] else None
+            result["seconds"] = round(time.perf_counter() - start, 3)
+            self.errors.extend(extractor.errors)
+            return result
+        
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            results = list(pool.map(run, ranges))
+        
+        self.videos, self.segment_report = merge_segments(results, total)
+        self.duplicates = {video['video_id'] for video in self.videos}
+        report = self.segment_report
+        logger.info(f"🧩 Segmentos unidos: {len(self.videos)} videos, {len(report['gaps'])} huecos, "
+                    f"{len(report['overlaps'])} solapamientos")
+        for start, end in report['gaps']:
+            logger.warning(f"⚠️  Faltan las posiciones {start}-{end}")
+        self._validate_results(total)
+        self._report_gap()
+        return self.videos
+    
+    def _segment_extractor(self) -> 'YouTubePlaylistExtractor':
+        """Extractor con la misma configuración para un segmento (con su propio Chrome)"""
+        extractor = type(self)(
+            headless=self.headless,
+            max_retries=self.max_retries,
+            scroll_pause_time=self.scroll_pause_time,
+            harvest_mode=self.harvest_mode,
+            scroll_wait=self.scroll_wait,
+            scroll_timeout=self.scroll_timeout,
+            lean_browser=self.lean_browser,
+            load_mode=self.load_mode
+        )
+        # Los comandos de todos los segmentos se suman en el mismo tracer
+        extractor.tracer = self.tracer
+        return extractor
+    
+    def _start_segment(self) -> Optional[int]:
+        """
+        Toma la posición real del primer video cargado como offset de index
+        
+        Returns:
+            Renderers a cargar para cubrir el segmento (None = hasta el final)
+        """
+        start, end = self.segment
+        first = first_index(self.driver)
+        self.index_offset = (first or start) - 1
+        if first is not None and first != start:
+            logger.warning(f"⚠️  El segmento {start}-{end or ''} empieza en la posición {first}")
+        return end - self.index_offset if end else None
+    
+    def _trim_to_segment(self):
+        """Descarta los videos cargados en este intento fuera del rango del segmento"""
+        start, end = self.segment
+        kept = []
+        for video in self.videos[self._attempt_start:]:
+            if video['index'] >= start and (end is None or video['index'] <= end):
+                kept.append(video)
+            else:
+                self.duplicates.discard(video['video_id'])
+        self.videos[self._attempt_start:] = kept
+    
+    def save_segment_report(self, filename: str = "playlist_segments.json"):
+        """Guarda el reporte de extract_segmented() en JSON"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.segment_report, f, ensure_ascii=False, indent=2)
+        
+        logger.info(f"💾 Reporte de segmentos guardado: {filename}")
+    
+    def _set_reported_total(self, total: Optional[int], hidden: int = 0):
+        """Guarda el total de la cabecera de la playlist y los videos ocultos"""
+        self.reported_total = total
+        self.hidden_videos = hidden
+        if total is not None:
+            ocultos = f" ({hidden} no disponibles ocultos)" if hidden else ""
+            logger.info(f"📊 La playlist reporta {total} videos{ocultos}")
+    
+    def _listed_total(self) -> Optional[int]:
+        """Videos que la playlist muestra: el total de la cabecera menos los ocultos"""
+        if self.reported_total is None:
+            return None
+        return self.reported_total - self.hidden_videos
+    
+    def header_gap(self) -> Optional[int]:
+        """Videos de la cabecera que no se extrajeron (negativo si sobran; None sin cabecera)"""
+        if self.reported_total is None:
+            return None
+        return self.reported_total - len(self.videos)
+    
+    def _report_gap(self):
+        """Compara los videos extraídos con el total de la cabecera"""
+        gap = self.header_gap()
+        if gap is None:
+            return
+        if gap == 0:
+            logger.info(f"✅ Coincide con la cabecera: {self.reported_total} videos")
+        elif 0 < gap <= self.hidden_videos:
+            logger.info(f"✅ Faltan {gap} de {self.reported_total} videos: la playlist oculta "
+                        f"{self.hidden_videos} no disponibles")
+        elif gap < 0:
+            logger.warning(f"⚠️  Extraídos {len(self.videos)} videos, más que los "
+                           f"{self.reported_total} de la cabecera")
+        else:
+            logger.warning(f"⚠️  Faltan {gap} videos respecto de la cabecera "
+                           f"({self.reported_total}, {self.hidden_videos} ocultos)")
+    
+    def _resync_done(self) -> bool:
+        """True si en una re-sincronización ya no hace falta cargar más videos"""
+        if self.resync_state and self.resync_state.should_stop(self._listed_total()):
+            logger.info(f"✅ El resto de la playlist coincide con la extracción anterior "
+                        f"({self.resync_state.stop_reason})")
+            return True
+        return False
     
     def _infinite_scroll(self, expected_videos: Optional[int] = None):
         """Scroll infinito con detección inteligente de nuevos videos"""
         logger.info("🔄 Iniciando scroll infinito...")
         
-        last_height = self.driver.execute_script("return document.documentElement.scrollHeight")
+        adaptive = self.scroll_wait == 'adaptive'
+        self.scroll_stats = ScrollStats(self.scroll_wait)
+        
+        if adaptive:
+            prepare_adaptive_wait(self.driver, self.scroll_timeout)
+            last_height = None
+        else:
+            last_height = self.driver.execute_script("return document.documentElement.scrollHeight")
         scroll_count = 0
         no_new_videos_count = 0
-        max_no_new = 5  # Máximo de scrolls sin nuevos videos antes de parar
+        max_no_new = 2 if adaptive else 5  # Máximo de scrolls sin nuevos videos antes de parar
         
         while True:
-            # Contar videos actuales
-            items = self.driver.find_elements(By.CSS_SELECTOR, "ytd-playlist-video-renderer")
-            current_count = len(items)
+            # Contar videos actuales (en modo incremental o prune, cosechando los nuevos)
+            if self.harvest_mode in ('incremental', 'prune'):
+                self._harvest_new()
+                current_count = self._harvested
+            else:
+                items = self.driver.find_elements(By.CSS_SELECTOR, RENDERER_SELECTOR)
+                current_count = len(items)
             
             logger.info(f"📽️  Videos cargados: {current_count}")
             
+            if self._resync_done():
+                self.scroll_stats.end_reason = 'resync'
+                break
+            
             # Si encontramos los videos esperados, parar
             if expected_videos and current_count >= expected_videos:
                 logger.info(f"✅ Se alcanzó el número esperado: {expected_videos}")
+                self.scroll_stats.end_reason = 'expected'
                 break
             
-            # Scroll
-            self.driver.execute_script(
-                "window.scrollTo(0, document.documentElement.scrollHeight);"
-            )
-            time.sleep(self.scroll_pause_time)
+            step_start = time.perf_counter()
             
-            # Verificar nueva altura
-            new_height = self.driver.execute_script("return document.documentElement.scrollHeight")
-            
-            if new_height == last_height:
-                no_new_videos_count += 1
-                logger.warning(f"⚠️  Sin cambios en altura (intento {no_new_videos_count}/{max_no_new})")
+            if adaptive:
+                # Scroll y espera hasta que haya videos nuevos o termine la lista
+                # En modo prune el DOM quedó vacío: cualquier renderer es nuevo
+                known = 0 if self.harvest_mode == 'prune' else current_count
+                state = scroll_and_wait(self.driver, known, self.scroll_timeout)
+                self.scroll_stats.record(time.perf_counter() - step_start, state['reason'] == 'grew')
                 
-                if no_new_videos_count >= max_no_new:
-                    logger.info("✅ Scroll completo - no hay más videos")
+                if state['reason'] == 'end':
+                    logger.info("✅ Scroll completo - no queda elemento de continuación")
+                    self.scroll_stats.end_reason = 'continuation'
                     break
+                
+                if state['reason'] == 'timeout':
+                    no_new_videos_count += 1
+                    logger.warning(f"⚠️  Sin videos nuevos en {self.scroll_timeout}s "
+                                   f"(intento {no_new_videos_count}/{max_no_new})")
+                    
+                    if no_new_videos_count >= max_no_new:
+                        logger.info("✅ Scroll completo - no hay más videos")
+                        self.scroll_stats.end_reason = 'timeout'
+                        break
+                else:
+                    no_new_videos_count = 0
             else:
-                no_new_videos_count = 0
+                # Scroll
+                self.driver.execute_script(
+                    "window.scrollTo(0, document.documentElement.scrollHeight);"
+                )
+                time.sleep(self.scroll_pause_time)
+                
+                # Verificar nueva altura
+                new_height = self.driver.execute_script("return document.documentElement.scrollHeight")
+                self.scroll_stats.record(time.perf_counter() - step_start, new_height != last_height)
+                
+                if new_height == last_height:
+                    no_new_videos_count += 1
+                    logger.warning(f"⚠️  Sin cambios en altura (intento {no_new_videos_count}/{max_no_new})")
+                    
+                    if no_new_videos_count >= max_no_new:
+                        logger.info("✅ Scroll completo - no hay más videos")
+                        self.scroll_stats.end_reason = 'height'
+                        break
+                else:
+                    no_new_videos_count = 0
+                
+                last_height = new_height
             
-            last_height = new_height
             scroll_count += 1
             
             if scroll_count % 10 == 0:
                 logger.info(f"📍 Scroll {scroll_count} completado")
+        
+        logger.info(f"⏱️  Scroll: {self.scroll_stats.summary()}")
+    
+    def _fetch_continuations(self, playlist_url: str, expected_videos: Optional[int] = None):
+        """
+        Lee la lista con fetch desde la página (load_mode 'fetch')
+        
+        Empieza por los items de ytInitialData y sigue las continuaciones de
+        a FETCH_REQUESTS por round-trip, leyendo los videos del JSON crudo.
+        
+        Raises:
+            RuntimeError: Si falla una petición (lo leído antes ya quedó agregado)
+        """
+        logger.info("📡 Pidiendo continuaciones desde la página (sin scroll)...")
+        
+        parsed = urlparse(playlist_url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        self.scroll_stats = ScrollStats('fetch')
+        prepare_fetch(self.driver, self.scroll_timeout, self.FETCH_REQUESTS)
+        token = None
+        seen_tokens = set()
+        
+        while True:
+            step_start = time.perf_counter()
+            result = fetch_continuations(self.driver, token, self.FETCH_REQUESTS, self.scroll_timeout)
+            renderers, _ = split_items(result['items'])
+            self.scroll_stats.record(time.perf_counter() - step_start, bool(renderers))
+            
+            with self.phase_timer.phase('parse'):
+                # Posición relativa al primer video cargado, como en los renderers del DOM
+                rows = [renderer_to_row(renderer, self._harvested + number, origin)
+                        for number, renderer in enumerate(renderers, 1)]
+                self._harvested += len(rows)
+                self._add_rows(rows)
+            logger.info(f"📽️  Videos cargados: {self._harvested} ({result['requests']} continuaciones)")
+            
+            if result['error']:
+                raise RuntimeError(f"Falló una continuación pedida desde la página: {result['error']}")
+            
+            if self._resync_done():
+                self.scroll_stats.end_reason = 'resync'
+                break
+            
+            if expected_videos and self._harvested >= expected_videos:
+                logger.info(f"✅ Se alcanzó el número esperado: {expected_videos}")
+                self.scroll_stats.end_reason = 'expected'
+                break
+            
+            token = result['token']
+            if not token or token in seen_tokens:
+                logger.info("✅ Lista completa - no queda token de continuación")
+                self.scroll_stats.end_reason = 'continuation'
+                break
+            seen_tokens.add(token)
+        
+        logger.info(f"⏱️  Fetch: {self.scroll_stats.summary()}")
     
     def _extract_video_details(self):
         """Extrae detalles completos de cada video"""
         logger.info("📋 Extrayendo detalles de videos...")
         
-        items = self.driver.find_elements(By.CSS_SELECTOR, "ytd-playlist-video-renderer")
+        if self.harvest_mode in ('incremental', 'prune'):
+            # Solo lo que apareció después del último scroll, sin re-escanear el DOM
+            self._harvest_new()
+            logger.info(f"Total de elementos encontrados: {self._harvested}")
+        elif self.harvest_mode == 'bulk':
+            self._extract_video_details_bulk()
+        else:
+            self._extract_video_details_elements()
+    
+    def _harvest_new(self) -> int:
+        """Cosecha solo los renderers que aparecieron desde la última llamada"""
+        with self.phase_timer.phase('parse'):
+            if self.harvest_mode == 'prune':
+                rows = harvest_and_prune(self.driver, self._harvested)
+            else:
+                rows = harvest_rows(self.driver, self._harvested)
+            self._harvested += len(rows)
+            self._add_rows(rows)
+        return len(rows)
+    
+    def _extract_video_details_bulk(self):
+        """Lee todos los renderers con un único execute_script"""
+        rows = harvest_rows(self.driver)
+        logger.info(f"Total de elementos encontrados: {len(rows)}")
+        self._add_rows(rows)
+    
+    def _add_rows(self, rows: List[list]):
+        """Convierte filas de HARVEST_SCRIPT en videos"""
+        for idx, title, url, video_id, duration, _thumbnail in rows:
+            # Posición en la playlist (en un segmento, idx cuenta desde su primer video)
+            index = idx + self.index_offset
+            if title is None:
+                logger.error(f"❌ Error extrayendo video {index}: #video-title no encontrado")
+                self.errors.append({"index": index, "error": "#video-title no encontrado"})
+                continue
+            self._add_video(index, title, url, video_id, duration)
+    
+    def _extract_video_details_elements(self):
+        """Lee cada renderer con find_element/.text (varios round-trips por video)"""
+        items = self.driver.find_elements(By.CSS_SELECTOR, RENDERER_SELECTOR)
         logger.info(f"Total de elementos encontrados: {len(items)}")
         
         for idx, item in enumerate(items, 1):
+            index = idx + self.index_offset
             try:
                 # Extraer título
                 title_elem = item.find_element(By.ID, "video-title")
@@ -205,29 +836,39 @@ class YouTubePlaylistExtractor:
                 except:
                     pass
                 
-                video_data = {
-                    "index": idx,
-                    "title": title,
-                    "video_id": video_id,
-                    "url": url,
-                    "url_simple": f"https://www.youtube.com/watch?v={video_id}",
-                    "duration": duration,
-                    "extracted_at": datetime.now().isoformat()
-                }
-                
-                # Validar duplicados
-                if video_id not in self.duplicates:
-                    self.videos.append(video_data)
-                    self.duplicates.add(video_id)
-                else:
-                    logger.warning(f"⚠️  Video duplicado detectado: {title}")
-                
-                if idx % 20 == 0:
-                    logger.info(f"✅ {idx} videos procesados")
+                self._add_video(index, title, url, video_id, duration)
                     
             except Exception as e:
-                logger.error(f"❌ Error extrayendo video {idx}: {e}")
-                self.errors.append({"index": idx, "error": str(e)})
+                logger.error(f"❌ Error extrayendo video {index}: {e}")
+                self.errors.append({"index": index, "error": str(e)})
+    
+    def _add_video(self, idx: int, title: str, url: str, video_id: str, duration: str):
+        """Agrega un video a los resultados descartando duplicados"""
+        video_data = {
+            "index": idx,
+            "title": title,
+            "video_id": video_id,
+            "url": url,
+            "url_simple": f"https://www.youtube.com/watch?v={video_id}",
+            "duration": duration,
+            "extracted_at": datetime.now().isoformat()
+        }
+        
+        # Validar duplicados
+        if video_id not in self.duplicates:
+            self.videos.append(video_data)
+            self.duplicates.add(video_id)
+            if self.resync_state:
+                self.resync_state.observe(video_id)
+            if self.checkpoint:
+                self.checkpoint.add(video_data)
+            if self.on_video:
+                self.on_video(video_data)
+        else:
+            logger.warning(f"⚠️  Video duplicado detectado: {title}")
+        
+        if idx % 20 == 0:
+            logger.info(f"✅ {idx} videos procesados")
     
     def _validate_results(self, expected_videos: Optional[int] = None):
         """Valida los resultados de la extracción"""
@@ -247,22 +888,60 @@ class YouTubePlaylistExtractor:
         if self.errors:
             logger.warning(f"⚠️  {len(self.errors)} errores durante la extracción")
     
-    def save_json(self, filename: str = "playlist.json"):
-        """Guarda los resultados en JSON"""
-        output = {
-            "metadata": {
-                "total_videos": len(self.videos),
-                "extraction_date": datetime.now().isoformat(),
-                "duplicates_removed": len(self.duplicates) - len(self.videos),
-                "errors": len(self.errors)
+    def _exporter_options(self) -> Dict:
+        """Formato de salida de los save_* (igual en cada archivo y en save_all)"""
+        return {
+            "json_header": {
+                "metadata": {
+                    "total_videos": len(self.videos),
+                    "reported_total": self.reported_total,
+                    "hidden_videos": self.hidden_videos,
+                    "missing_videos": self.header_gap(),
+                    "extraction_date": datetime.now().isoformat(),
+                    "duplicates_removed": len(self.duplicates) - len(self.videos),
+                    "errors": len(self.errors)
+                }
             },
-            "videos": self.videos,
-            "errors": self.errors if self.errors else []
+            "json_footer": lambda count: {"errors": self.errors if self.errors else []},
+            # Columnas fijas: con --enrich, también los metadatos
+            "csv_fields": [(key, key) for key in
+                           VIDEO_FIELDS + (METADATA_FIELDS if self.enrich_stats is not None else ())],
+            "dlc_generator": "YouTube Playlist Extractor Advanced",
+            "dlc_package": "YouTube Playlist",
         }
+    
+    def _export(self, fmt: str, filename: str):
+        with PlaylistExporter({fmt: filename}, (fmt,), **self._exporter_options()) as exporter:
+            exporter.write_all(self.videos)
+    
+    def save_all(self, base: str = "playlist", formats=('json', 'csv', 'txt', 'dlc'),
+                 compress: bool = False) -> Dict[str, str]:
+        """
+        Guarda los resultados en varios formatos recorriendo los videos una sola vez
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+        Args:
+            base: Nombre base de los archivos (ver playlist_export.default_paths)
+            formats: Formatos a escribir (json, ndjson, csv, txt, dlc)
+            compress: Comprimir cada archivo con gzip
+        
+        Returns:
+            {formato: archivo}
+        """
+        if 'csv' in formats and not self.videos:
+            logger.warning("No hay videos para guardar en CSV")
+            formats = [fmt for fmt in formats if fmt != 'csv']
+        with self.phase_timer.phase('serialize'):
+            with PlaylistExporter(default_paths(base), formats, compress,
+                                  **self._exporter_options()) as exporter:
+                exporter.write_all(self.videos)
         
+        for fmt, filename in exporter.paths.items():
+            logger.info(f"💾 {fmt.upper()} guardado: {filename}")
+        return dict(exporter.paths)
+    
+    def save_json(self, filename: str = "playlist.json"):
+        """Guarda los resultados en JSON"""
+        self._export('json', filename)
         logger.info(f"💾 JSON guardado: {filename}")
     
     def save_csv(self, filename: str = "playlist.csv"):
@@ -271,83 +950,690 @@ class YouTubePlaylistExtractor:
             logger.warning("No hay videos para guardar")
             return
         
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.videos[0].keys())
-            writer.writeheader()
-            writer.writerows(self.videos)
-        
+        self._export('csv', filename)
         logger.info(f"💾 CSV guardado: {filename}")
     
     def save_txt(self, filename: str = "playlist_urls.txt"):
         """Guarda solo las URLs en formato TXT"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            for video in self.videos:
-                f.write(f"{video['url_simple']}\n")
-        
+        self._export('txt', filename)
         logger.info(f"💾 TXT guardado: {filename}")
     
     def save_dlc(self, filename: str = "playlist.dlc"):
         """Guarda en formato DLC (JDownloader)"""
-        import base64
-        
-        dlc_content = f"""<dlc>
-<header>
-<generator>YouTube Playlist Extractor Advanced</generator>
-<tribute>Created with Python + Selenium</tribute>
-</header>
-<content>
-<package name="YouTube Playlist" passwords="" comment="">
-"""
-        for video in self.videos:
-            url_encoded = base64.b64encode(video['url_simple'].encode()).decode()
-            dlc_content += f'<file><url>{url_encoded}</url></file>\n'
-        
-        dlc_content += """</package>
-</content>
-</dlc>"""
+        self._export('dlc', filename)
+        logger.info(f"💾 DLC guardado: {filename}")
+    
+    def enrich_videos(self, enricher: MetadataEnricher) -> Optional[Dict]:
+        """
+        Agrega canal, vistas, fecha de subida y miniatura a los videos extraídos
         
+        Un fallo (sin red, aiohttp no instalado) solo se registra: los videos
+        se guardan igual, sin esos campos.
+        """
+        if not self.videos:
+            return None
+        try:
+            with self.phase_timer.phase('enrich'):
+                self.enrich_stats = enricher.enrich(self.videos)
+        except Exception as e:
+            logger.warning(f"⚠️  No se pudieron agregar los metadatos: {e}")
+            self.errors.append({"error": f"Metadatos: {e}"})
+        return self.enrich_stats
+    
+    def save_catalog(self, filename: str, playlist_url: str):
+        """Agrega la extracción al catálogo SQLite (ver playlist_catalog)"""
+        playlist_id = self._extract_playlist_id(playlist_url)
+        with self.phase_timer.phase('serialize'):
+            with PlaylistCatalog(filename) as catalog:
+                total = catalog.record_playlist(playlist_id, self.videos, url=playlist_url,
+                                                reported_total=self.reported_total)
+        logger.info(f"🗂️  Catálogo actualizado: {filename} ({playlist_id}, {total} videos)")
+    
+    def run_metrics(self, playlist_url: str, status: str, seconds: float) -> Dict:
+        """Resumen de la última extracción con el tiempo de cada fase (para --metrics-json)"""
+        return {
+            "url": playlist_url,
+            "engine": self.ENGINE,
+            "status": status,
+            "videos": len(self.videos),
+            "errors": len(self.errors),
+            "reported_total": self.reported_total,
+            "hidden_videos": self.hidden_videos,
+            "missing_videos": self.header_gap(),
+            "seconds": round(seconds, 3),
+            **self.phase_timer.as_dict(),
+            "scroll": self.scroll_stats.as_dict() if self.scroll_stats else None,
+            "enrich": self.enrich_stats,
+            "webdriver": self.tracer.as_dict() if self.tracer else None
+        }
+    
+    def save_delta(self, delta: Dict, filename: str = "playlist_delta.json"):
+        """Guarda el delta de resync() en JSON"""
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write(dlc_content)
+            json.dump(delta, f, ensure_ascii=False, indent=2)
         
-        logger.info(f"💾 DLC guardado: {filename}")
+        logger.info(f"💾 Delta guardado: {filename}")
+
+
+class YouTubePlaylistHTTPExtractor(YouTubePlaylistExtractor):
+    """
+    Extractor sin navegador: lee ytInitialData del HTML de la playlist y sigue
+    las continuaciones por HTTP. Produce los mismos videos que la versión con
+    Selenium sin arrancar Chrome.
+    """
+    
+    ENGINE = 'http'
+    
+    def __init__(self, max_retries=3, client: Optional[PlaylistHTTPClient] = None, **kwargs):
+        """
+        Args:
+            max_retries: Reintentos de cada petición HTTP
+            client: Cliente HTTP a reutilizar (opcional)
+        """
+        super().__init__(max_retries=max_retries, **kwargs)
+        self.client = client or PlaylistHTTPClient(max_retries=max_retries)
+    
+    def enable_recording(self, directory: str, playlist_url: str) -> PlaylistRecorder:
+        """Graba el HTML y las continuaciones con un hook de la sesión HTTP"""
+        recorder = super().enable_recording(directory, playlist_url)
+        self.client.session.hooks['response'].append(recorder.record_response)
+        return recorder
+    
+    def extract(self, playlist_url: str, expected_videos: Optional[int] = None,
+                on_video: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Igual que YouTubePlaylistExtractor.extract, sin navegador"""
+        if not self._validate_url(playlist_url):
+            raise ValueError("URL de playlist inválida")
+        
+        logger.info(f"📌 ID de playlist: {self._extract_playlist_id(playlist_url)}")
+        logger.info(f"📌 URL: {playlist_url}")
+        logger.info("🌐 Motor HTTP (sin navegador)")
+        
+        self.on_video = on_video
+        self.phase_timer = PhaseTimer()
+        timer = self.phase_timer
+        # Los reintentos son por petición (max_retries del cliente HTTP)
+        self.attempts = 1
+        self.attempt_errors = []
+        
+        try:
+            pages = self.client.iter_pages(playlist_url, on_total=self._set_reported_total)
+            target = expected_videos
+            # La primera página es el HTML de la playlist; las siguientes, continuaciones
+            phase = 'page_load'
+            while True:
+                with timer.phase(phase):
+                    rows = next(pages, None)
+                if rows is None:
+                    break
+                phase = 'scroll'
+                
+                with timer.phase('parse'):
+                    self._add_rows(rows)
+                logger.info(f"📽️  Videos cargados: {len(self.videos)}")
+                
+                if self._resync_done():
+                    break
+                
+                target = target or self._listed_total()
+                if target and len(self.videos) >= target:
+                    logger.info(f"✅ Se alcanzó el número esperado: {target}")
+                    break
+            
+            self._validate_results(expected_videos)
+            if not self.resync_state:
+                self._report_gap()
+            
+            logger.info(f"✅ Extracción completada: {len(self.videos)} videos")
+            logger.info(f"⏱️  Fases: {timer.summary()}")
+            return self.videos
+            
+        except Exception as e:
+            logger.error(f"❌ Error durante la extracción: {e}")
+            self.attempt_errors.append(f"Intento 1: {e}")
+            raise
+
+
+# Modo segmentado: la playlist se divide en rangos de posiciones que se
+# cargan en paralelo (index= en la URL) y se unen por posición
+def segment_ranges(total: int, segments: int) -> List[Tuple[int, Optional[int]]]:
+    """
+    Divide las posiciones 1..total en rangos de igual tamaño
+    
+    El último rango queda abierto (fin None) para incluir los videos que se
+    agreguen al final mientras se extrae.
+    """
+    size = math.ceil(total / max(1, segments))
+    ranges = [(start, start + size - 1) for start in range(1, total + 1, size)]
+    ranges[-1] = (ranges[-1][0], None)
+    return ranges
+
+
+def segment_url(playlist_url: str, start: int) -> str:
+    """URL de la playlist empezando en la posición `start` (parámetro index=)"""
+    parsed = urlparse(playlist_url)
+    query = parse_qs(parsed.query)
+    query.pop('index', None)
+    if start > 1:
+        query['index'] = [str(start)]
+    return urlunparse(parsed._replace(query=urlencode(query, doseq=True)))
+
+
+def merge_segments(results: List[Dict], total: int) -> Tuple[List[Dict], Dict]:
+    """
+    Une los videos de cada segmento por posición sin repetir video_id
+    
+    Args:
+        results: Un dict por segmento (start, end, videos, first_index, error, seconds)
+        total: Videos que debería tener la playlist
+    
+    Returns:
+        (videos ordenados por posición, reporte con segmentos, huecos y solapamientos)
+    """
+    positions = defaultdict(list)
+    for result in results:
+        for video in result["videos"]:
+            positions[video["video_id"]].append(video["index"])
+    
+    videos = []
+    seen = set()
+    for video in sorted((video for result in results for video in result["videos"]),
+                        key=lambda video: video["index"]):
+        if video["video_id"] not in seen:
+            seen.add(video["video_id"])
+            videos.append(video)
+    
+    # Posiciones sin video entre 1 y el total (o la última posición cargada)
+    loaded = {video["index"] for video in videos}
+    last = max([total, *loaded]) if loaded else total
+    gaps = []
+    for position in range(1, last + 1):
+        if position in loaded:
+            continue
+        if gaps and gaps[-1][1] == position - 1:
+            gaps[-1][1] = position
+        else:
+            gaps.append([position, position])
+    
+    report = {
+        "total": total,
+        "merged": len(videos),
+        "segments": [{**result, "videos": len(result["videos"])} for result in results],
+        "gaps": gaps,
+        "overlaps": [{"video_id": video_id, "positions": sorted(found)}
+                     for video_id, found in positions.items() if len(found) > 1],
+    }
+    return videos, report
+
+
+# Modo batch: cada proceso del pool tiene su propio extractor (y su Chrome)
+# durante todo el batch, en lugar de arrancar un navegador por playlist
+_batch_extractor = None
+_batch_export = {}
+_batch_catalog = None
+_batch_enricher = None
+
+
+def read_playlist_urls(source: str) -> List[str]:
+    """
+    Lee URLs de playlist, una por línea, de un archivo o de stdin ('-')
+    
+    Ignora líneas vacías, comentarios (#) y URLs repetidas.
+    """
+    if source == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    
+    urls = []
+    for line in lines:
+        url = line.strip()
+        if url and not url.startswith('#') and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def _batch_worker_init(engine: str, options: Dict, export: Dict, catalog: Optional[str] = None,
+                       enrich: Optional[Dict] = None):
+    """Crea el extractor del proceso; el navegador se cierra cuando el proceso termina"""
+    global _batch_extractor, _batch_export, _batch_catalog, _batch_enricher
+    _batch_export = export
+    _batch_catalog = catalog
+    _batch_enricher = MetadataEnricher(**enrich) if enrich is not None else None
+    if engine == 'http':
+        _batch_extractor = YouTubePlaylistHTTPExtractor(**options)
+    else:
+        _batch_extractor = YouTubePlaylistExtractor(reuse_driver=True, **options)
+    Finalize(_batch_extractor, _batch_extractor.close, exitpriority=10)
+
+
+def _batch_extract(task) -> Dict:
+    """Extrae y guarda una playlist del batch; devuelve su entrada del manifiesto"""
+    position, url, output_dir = task
+    extractor = _batch_extractor
+    playlist_id = extractor._extract_playlist_id(url)
+    entry = {
+        "position": position,
+        "url": url,
+        "playlist_id": playlist_id,
+        "status": "failed",
+        "total_videos": 0,
+        "attempts": 0,
+        "seconds": None,
+        "worker": os.getpid(),
+        "errors": [],
+        "files": []
+    }
+    start = time.perf_counter()
+    
+    if not extractor._validate_url(url) or not playlist_id:
+        entry["errors"].append("URL de playlist inválida")
+        entry["seconds"] = 0
+        return entry
+    
+    # extract() reintenta por su cuenta (max_retries) siguiendo desde la última posición
+    extractor.reset()
+    save_error = None
+    try:
+        extractor.extract(url)
+    except Exception as e:
+        logger.warning(f"⚠️  {playlist_id}: falló tras {extractor.attempts} intento(s): {e}")
+        # El navegador puede haber quedado en mal estado: la próxima playlist arranca otro
+        extractor.close()
+    else:
+        # Un error al guardar falla solo esta playlist, no el batch
+        try:
+            if _batch_enricher:
+                extractor.enrich_videos(_batch_enricher)
+            files = extractor.save_all(os.path.join(output_dir, playlist_id), **_batch_export)
+            if _batch_catalog:
+                extractor.save_catalog(_batch_catalog, url)
+        except Exception as e:
+            logger.error(f"❌ {playlist_id}: no se pudieron guardar los resultados: {e}")
+            save_error = f"Guardado: {e}"
+        else:
+            entry.update(
+                status="ok",
+                total_videos=len(extractor.videos),
+                files=list(files.values())
+            )
+    entry["attempts"] = extractor.attempts
+    entry["errors"] = list(extractor.attempt_errors)
+    if save_error:
+        entry["errors"].append(save_error)
+    
+    seconds = time.perf_counter() - start
+    entry["seconds"] = round(seconds, 3)
+    # Fases del último intento
+    entry["metrics"] = extractor.run_metrics(url, entry["status"], seconds)
+    return entry
+
+
+def write_metrics_json(filename: str, runs: List[Dict]):
+    """Guarda las métricas por fase de cada extracción y la suma de todas"""
+    phases = defaultdict(float)
+    for run in runs:
+        for phase, seconds in run["phases"].items():
+            phases[phase] += seconds
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump({
+            "generated_at": datetime.now().isoformat(),
+            "runs": runs,
+            "phases": {phase: round(seconds, 4) for phase, seconds in phases.items()}
+        }, f, ensure_ascii=False, indent=2)
+    logger.info(f"💾 Métricas guardadas: {filename}")
+
+
+def write_profile(extractor: YouTubePlaylistExtractor, filename: str,
+                  profiler: Optional[cProfile.Profile] = None, cprofile_file: Optional[str] = None,
+                  trace_file: Optional[str] = None):
+    """
+    Guarda y muestra el resultado de --profile
+    
+    Args:
+        extractor: Extractor con enable_profiling() activo
+        filename: JSON con los comandos WebDriver por tipo y por fase
+        profiler: cProfile de la extracción (opcional)
+        cprofile_file: Archivo .prof para el volcado de `profiler`
+        trace_file: Archivo para la traza de rendimiento de Chrome
+    """
+    tracer = extractor.tracer
+    logger.info(f"🔬 Round-trips WebDriver (caminos calientes):\n{tracer.report()}")
+    profile = {
+        "generated_at": datetime.now().isoformat(),
+        **tracer.as_dict(),
+        "hot_paths": tracer.hot_paths(),
+    }
+    
+    if profiler is not None:
+        profiler.dump_stats(cprofile_file)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(15)
+        logger.info(f"🔬 cProfile (tiempo acumulado):\n{stream.getvalue().strip()}")
+        profile["cprofile"] = cprofile_file
+        logger.info(f"💾 cProfile guardado: {cprofile_file} (python -m pstats {cprofile_file})")
+    
+    if trace_file:
+        save_chrome_trace(extractor.trace_events, trace_file)
+        profile["chrome_trace"] = trace_file
+        logger.info(f"💾 Traza de Chrome guardada: {trace_file} ({len(extractor.trace_events)} eventos, "
+                    f"se abre en el panel Performance de DevTools)")
+    
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    logger.info(f"💾 Perfil guardado: {filename}")
+
+
+def run_batch(urls: List[str], workers: int = 2, output_dir: str = "playlists",
+              engine: str = 'selenium', options: Optional[Dict] = None,
+              export: Optional[Dict] = None, catalog: Optional[str] = None,
+              enrich: Optional[Dict] = None) -> Dict:
+    """
+    Extrae varias playlists en un pool de procesos
+    
+    Args:
+        urls: URLs de las playlists
+        workers: Procesos (navegadores) simultáneos
+        output_dir: Carpeta para los archivos de cada playlist y manifest.json
+        engine: 'selenium' o 'http'
+        options: Argumentos para el constructor del extractor
+        export: Argumentos para save_all (formats, compress)
+        catalog: Catálogo SQLite al que agregar cada playlist (opcional)
+        enrich: Argumentos de MetadataEnricher para agregar metadatos a cada playlist (opcional)
+    
+    Returns:
+        Manifiesto con el resultado, tiempos y errores de cada playlist
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(workers, len(urls)))
+    logger.info(f"📦 Batch: {len(urls)} playlists con {workers} procesos")
+    
+    start = time.perf_counter()
+    tasks = [(position, url, output_dir) for position, url in enumerate(urls, 1)]
+    results = [None] * len(tasks)
+    
+    with multiprocessing.Pool(workers, initializer=_batch_worker_init,
+                              initargs=(engine, options or {}, export or {}, catalog, enrich)) as pool:
+        for done, entry in enumerate(pool.imap_unordered(_batch_extract, tasks), 1):
+            results[entry["position"] - 1] = entry
+            status = "✅" if entry["status"] == "ok" else "❌"
+            logger.info(f"📦 [{done}/{len(tasks)}] {status} {entry['playlist_id'] or entry['url']}: "
+                        f"{entry['total_videos']} videos en {entry['seconds']}s "
+                        f"({entry['attempts']} intento(s))")
+        # Cerrar ordenadamente para que cada proceso cierre su navegador
+        pool.close()
+        pool.join()
+    
+    failed = [entry for entry in results if entry["status"] != "ok"]
+    manifest = {
+        "metadata": {
+            "extraction_date": datetime.now().isoformat(),
+            "engine": engine,
+            "workers": workers,
+            "total_playlists": len(results),
+            "succeeded": len(results) - len(failed),
+            "failed": len(failed),
+            "total_videos": sum(entry["total_videos"] for entry in results),
+            "seconds": round(time.perf_counter() - start, 3)
+        },
+        "playlists": results
+    }
+    
+    filename = os.path.join(output_dir, "manifest.json")
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    logger.info(f"💾 Manifiesto guardado: {filename}")
+    
+    return manifest
 
 
 def main():
     """Función principal con CLI"""
+    # Subcomando de consultas al catálogo: extract_playlist_advanced.py catalog search "texto"
+    if len(sys.argv) > 1 and sys.argv[1] == 'catalog':
+        sys.exit(catalog_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'download':
+        sys.exit(download_main(sys.argv[2:]))
+    
     parser = argparse.ArgumentParser(
         description='YouTube Playlist Extractor - Extrae TODOS los videos de una playlist'
     )
     parser.add_argument('url', nargs='?', help='URL de la playlist de YouTube')
-    parser.add_argument('-e', '--expected', type=int, help='Número esperado de videos')
+    parser.add_argument('-e', '--expected', type=int, help='Número esperado de videos (default: el total de la cabecera de la playlist)')
     parser.add_argument('-o', '--output', default='playlist', help='Nombre base para archivos de salida')
     parser.add_argument('--no-headless', action='store_true', help='Mostrar ventana del navegador')
-    parser.add_argument('--pause', type=float, default=2, help='Tiempo de pausa entre scrolls (segundos)')
+    parser.add_argument('--engine', choices=('selenium', 'http'), default='selenium',
+                        help='selenium (Chrome headless) o http (ytInitialData + continuaciones, sin navegador)')
+    parser.add_argument('--pause', type=float, default=2, help='Tiempo de pausa entre scrolls con --wait fixed (segundos)')
+    parser.add_argument('--wait', choices=YouTubePlaylistExtractor.SCROLL_WAITS, default='adaptive',
+                        help='Espera tras cada scroll: adaptive (hasta que carguen videos nuevos) o fixed (--pause)')
+    parser.add_argument('--wait-timeout', type=float, default=10,
+                        help='Espera máxima por scroll con --wait adaptive (segundos)')
+    parser.add_argument('--lean', action='store_true',
+                        help='Perfil lean de Chrome: sin imágenes, media, fuentes ni anuncios y carga eager')
+    parser.add_argument('--load', choices=YouTubePlaylistExtractor.LOAD_MODES, default='scroll',
+                        help='Cómo se carga la lista: scroll (renderers en la página) o fetch '
+                             '(continuaciones pedidas con fetch desde la página, sin renderizarlas)')
+    parser.add_argument('--harvest', choices=YouTubePlaylistExtractor.HARVEST_MODES, default='incremental',
+                        help='Modo de lectura de videos: incremental (tras cada scroll), '
+                             'prune (incremental quitando del DOM lo ya leído, memoria acotada), '
+                             'bulk (un solo script al final) o elements (por elemento)')
+    parser.add_argument('--segments', type=int, default=1,
+                        help='Dividir la playlist en N rangos (index=) extraídos en paralelo, '
+                             'cada uno en su Chrome; guarda {output}_segments.json con huecos y solapamientos')
+    parser.add_argument('--stream', action='store_true',
+                        help='Imprimir cada video como JSON (NDJSON) en stdout en cuanto se extrae')
+    parser.add_argument('--since', metavar='JSON',
+                        help='Re-sincronizar contra una extracción anterior (JSON de salida); '
+                             'guarda la lista completa y el delta en {output}_delta.json')
+    parser.add_argument('--since-run', type=int, default=100,
+                        help='Con --since, videos conocidos seguidos tras los que se deja de cargar')
+    parser.add_argument('--formats', default='json,csv,txt,dlc',
+                        help=f"Formatos de salida separados por comas ({','.join(FORMATS)})")
+    parser.add_argument('--gzip', action='store_true', help='Comprimir los archivos de salida con gzip')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='Reintentos por playlist, cada uno desde la última posición cosechada '
+                             '(o por petición con --engine http)')
+    parser.add_argument('--checkpoint-every', type=int, default=200,
+                        help='Guardar lo cosechado en {output}_checkpoint.ndjson cada N videos (0 = nunca)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Retomar desde {output}_checkpoint.ndjson (index=) en lugar de desde el video 1')
+    parser.add_argument('--batch', metavar='ARCHIVO',
+                        help='Extraer las playlists de un archivo (una URL por línea, - para stdin)')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='Con --batch, procesos (navegadores) simultáneos')
+    parser.add_argument('--metrics-json', metavar='ARCHIVO',
+                        help='Guardar el tiempo de cada fase (arranque, carga, scroll, parseo, '
+                             'guardado) por extracción en este JSON')
+    parser.add_argument('--catalog', metavar='DB',
+                        help='Agregar cada extracción a este catálogo SQLite (consultas con el subcomando catalog)')
+    parser.add_argument('--enrich', action='store_true',
+                        help='Agregar canal, vistas, fecha de subida y miniatura de cada video '
+                             '(páginas /watch en paralelo, con caché en disco)')
+    parser.add_argument('--enrich-cache', default='metadata_cache.db',
+                        help='Con --enrich, caché SQLite de metadatos por video')
+    parser.add_argument('--enrich-ttl', type=float, default=168,
+                        help='Con --enrich, horas que vale una entrada de la caché')
+    parser.add_argument('--enrich-concurrency', type=int, default=16,
+                        help='Con --enrich, páginas pedidas a la vez')
+    parser.add_argument('--profile', action='store_true',
+                        help='Registrar cada comando WebDriver (cantidad e histograma de latencias por '
+                             'tipo y por fase), mostrar los caminos calientes y guardar {output}_profile.json')
+    parser.add_argument('--profile-cprofile', metavar='ARCHIVO',
+                        help='Con --profile, guardar también un volcado de cProfile de la extracción')
+    parser.add_argument('--profile-trace', metavar='ARCHIVO',
+                        help='Con --profile, guardar también la traza de rendimiento de Chrome '
+                             '(panel Performance de DevTools)')
+    parser.add_argument('--record', metavar='DIR',
+                        help='Grabar en DIR el HTML de la playlist y cada respuesta de continuación')
+    parser.add_argument('--replay', metavar='DIR',
+                        help='Extraer sin red desde una grabación de --record (servidor local)')
+    parser.add_argument('--output-dir', default='playlists',
+                        help='Con --batch, carpeta de salida (un juego de archivos por playlist + manifest.json)')
     
     args = parser.parse_args()
     
+    formats = [fmt.strip() for fmt in args.formats.split(',') if fmt.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"formatos desconocidos: {', '.join(sorted(unknown))}")
+    export = {"formats": formats, "compress": args.gzip}
+    enrich = None
+    if args.enrich:
+        enrich = {"cache_path": args.enrich_cache, "ttl": args.enrich_ttl * 3600,
+                  "concurrency": args.enrich_concurrency}
+    if args.segments > 1 and (args.engine != 'selenium' or args.batch or args.since):
+        parser.error("--segments solo funciona con --engine selenium, sin --batch ni --since")
+    if args.resume and (args.engine != 'selenium' or args.batch or args.since or args.segments > 1):
+        parser.error("--resume solo funciona con --engine selenium, sin --batch, --since ni --segments")
+    profiling = args.profile or args.profile_cprofile or args.profile_trace
+    if profiling and args.batch:
+        parser.error("--profile no funciona con --batch")
+    if args.profile_trace and args.engine != 'selenium':
+        parser.error("--profile-trace solo funciona con --engine selenium")
+    if (args.record or args.replay) and (args.batch or args.segments > 1):
+        parser.error("--record y --replay no funcionan con --batch ni --segments")
+    if args.record and (args.replay or args.profile_trace):
+        parser.error("--record no funciona con --replay ni --profile-trace")
+    if args.replay and args.enrich:
+        parser.error("--replay no funciona con --enrich (pediría las páginas /watch a la red)")
+    if args.replay and args.engine == 'selenium' and args.load != 'fetch':
+        # Al hacer scroll, los scripts de YouTube piden URLs absolutas de youtube.com
+        # (y de sus CDN), que OFFLINE_ARGUMENT no deja resolver
+        parser.error("--replay con --engine selenium necesita --load fetch: al hacer scroll, la "
+                     "página pide URLs absolutas de youtube.com que no se pueden servir sin red")
+    
+    if args.batch:
+        urls = read_playlist_urls(args.batch)
+        if not urls:
+            logger.error("❌ No hay URLs de playlist en el batch")
+            sys.exit(1)
+        
+        options = {"max_retries": args.retries}
+        if args.engine == 'selenium':
+            options.update(
+                headless=not args.no_headless,
+                scroll_pause_time=args.pause,
+                harvest_mode=args.harvest,
+                scroll_wait=args.wait,
+                scroll_timeout=args.wait_timeout,
+                lean_browser=args.lean,
+                load_mode=args.load
+            )
+        manifest = run_batch(urls, args.workers, args.output_dir, args.engine, options, export,
+                             args.catalog, enrich)
+        if args.metrics_json:
+            write_metrics_json(args.metrics_json, [entry["metrics"] for entry in manifest["playlists"]
+                                                   if "metrics" in entry])
+        
+        summary = manifest["metadata"]
+        logger.info("="*60)
+        logger.info(f"📦 BATCH COMPLETADO: {summary['succeeded']}/{summary['total_playlists']} playlists, "
+                    f"{summary['total_videos']} videos en {summary['seconds']}s")
+        logger.info("="*60)
+        sys.exit(1 if summary["failed"] else 0)
+    
+    replay = None
+    if args.replay:
+        try:
+            replay = ReplayServer(args.replay).start()
+        except FileNotFoundError:
+            parser.error(f"{args.replay} no tiene una grabación (recording.json)")
+        args.url = args.url or replay.url
+    
     # Si no se proporciona URL, usar la por defecto
     if not args.url:
         args.url = "https://www.youtube.com/playlist?list=PLCYBQp7vbvBHqtaozeouLD9ek-GuiMcjo"
-        args.expected = 119
-        logger.info("📌 Usando playlist por defecto (119 videos)")
+        logger.info("📌 Usando playlist por defecto")
     
     logger.info("="*60)
     logger.info("🚀 YOUTUBE PLAYLIST EXTRACTOR - VERSIÓN AVANZADA 100%")
     logger.info("="*60)
     
+    # Con --replay la extracción va al servidor local; args.url queda como la original
+    url = replay.playlist_url(args.url) if replay else args.url
+    extractor = None
+    profiler = None
+    status = "failed"
+    start = time.perf_counter()
     try:
-        extractor = YouTubePlaylistExtractor(
-            headless=not args.no_headless,
-            scroll_pause_time=args.pause
-        )
+        if args.engine == 'http':
+            extractor = YouTubePlaylistHTTPExtractor(max_retries=args.retries)
+        else:
+            extractor = YouTubePlaylistExtractor(
+                headless=not args.no_headless,
+                max_retries=args.retries,
+                scroll_pause_time=args.pause,
+                harvest_mode=args.harvest,
+                scroll_wait=args.wait,
+                scroll_timeout=args.wait_timeout,
+                lean_browser=args.lean,
+                load_mode=args.load
+            )
+        
+        if profiling:
+            extractor.enable_profiling(chrome_trace=bool(args.profile_trace))
+        if args.record:
+            extractor.enable_recording(args.record, url)
+        if replay:
+            extractor.offline = True
+        
+        on_video = None
+        if args.stream:
+            # Los logs van a stderr, así stdout queda limpio para encadenar
+            def print_video(video):
+                print(json.dumps(video, ensure_ascii=False), flush=True)
+            on_video = print_video
+        
+        checkpoint_file = f"{args.output}_checkpoint.ndjson"
+        finished = args.resume and extractor.resume_from(checkpoint_file, url)
+        if (args.engine == 'selenium' and args.segments <= 1 and not args.since
+                and args.checkpoint_every > 0 and not finished):
+            extractor.enable_checkpoint(checkpoint_file, url, args.checkpoint_every)
+        
+        if args.profile_cprofile:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        
+        delta = None
+        if finished:
+            # La extracción terminó pero el proceso murió antes de guardar
+            logger.info("♻️  El checkpoint ya está completo: solo se guardan los archivos")
+            videos = extractor.videos
+        elif args.since:
+            delta = extractor.resync(url, args.since, args.since_run, on_video=on_video)
+            videos = extractor.videos
+        elif args.segments > 1:
+            videos = extractor.extract_segmented(url, args.segments, args.expected)
+        else:
+            videos = extractor.extract(url, args.expected, on_video=on_video)
+        if extractor.checkpoint:
+            extractor.checkpoint.close(len(videos))
+        if profiler is not None:
+            profiler.disable()
+        if extractor.recorder:
+            extractor.recorder.save()
+        if replay:
+            # Las URLs de los videos vuelven al origen de la grabación
+            for video in videos:
+                video['url'] = replay.original_url(video['url'])
+        if enrich:
+            extractor.enrich_videos(MetadataEnricher(**enrich))
         
-        videos = extractor.extract(args.url, args.expected)
+        # Guardar en todos los formatos (una sola pasada por los videos)
+        extractor.save_all(args.output, **export)
+        if extractor.segment_report:
+            extractor.save_segment_report(f"{args.output}_segments.json")
+        if args.catalog:
+            extractor.save_catalog(args.catalog, args.url)
+        if delta:
+            extractor.save_delta(delta, f"{args.output}_delta.json")
+        # Con los archivos guardados el checkpoint ya no hace falta
+        if os.path.exists(checkpoint_file) and (extractor.checkpoint or finished):
+            os.remove(checkpoint_file)
         
-        # Guardar en todos los formatos
-        extractor.save_json(f"{args.output}.json")
-        extractor.save_csv(f"{args.output}.csv")
-        extractor.save_txt(f"{args.output}_urls.txt")
-        extractor.save_dlc(f"{args.output}.dlc")
+        status = "ok"
         
         logger.info("="*60)
         logger.info(f"✅ EXTRACCIÓN COMPLETADA EXITOSAMENTE")
@@ -359,6 +1645,20 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if replay:
+            replay.stop()
+        if extractor is not None and extractor.checkpoint:
+            extractor.checkpoint.close()
+        if args.metrics_json and extractor is not None:
+            write_metrics_json(args.metrics_json, [
+                extractor.run_metrics(args.url, status, time.perf_counter() - start)
+            ])
+        if extractor is not None and extractor.tracer:
+            if profiler is not None:
+                profiler.disable()
+            write_profile(extractor, f"{args.output}_profile.json", profiler,
+                          args.profile_cprofile, args.profile_trace)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+"""
+Tiempos por fase de una extracción
+
+PhaseTimer acumula cuánto tarda cada fase de una extracción:
+
+- driver_start: arrancar Chrome (o esperar un navegador del pool)
+- page_load: cargar la página de la playlist (en el motor HTTP, el HTML)
+- scroll: cargar el resto de la lista (en el motor HTTP, las continuaciones)
+- parse: convertir lo leído en videos
+- enrich: agregar metadatos de la página /watch de cada video (--enrich)
+- serialize: escribir o serializar el resultado
+
+Las fases se pueden anidar: el tiempo de una fase interna (p. ej. el parseo
+incremental que ocurre entre scroll y scroll) se descuenta de la externa,
+así la suma de las fases es el tiempo medido.
+
+Hay una copia idéntica en backend/ (el backend se despliega solo con esa
+carpeta y no puede importarlo desde la raíz); tests/test_backend_sync.py
+falla si las copias difieren.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+PHASES = ('driver_start', 'page_load', 'scroll', 'parse', 'enrich', 'serialize')
+
+
+class PhaseTimer:
+    """Segundos acumulados por fase (tiempo propio, sin las fases anidadas)"""
+
+    def __init__(self):
+        self.seconds = {}
+        self._stack = []  # [fase, inicio, segundos de fases anidadas]
+
+    @contextmanager
+    def phase(self, name: str):
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[1]
+            self.add(name, elapsed - frame[2])
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def add(self, name: str, seconds: float):
+        """Suma `seconds` a una fase medida por fuera del timer"""
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    @property
+    def current(self) -> Optional[str]:
+        """Fase en curso (la más interna), o None fuera de toda fase"""
+        return self._stack[-1][0] if self._stack else None
+
+    @property
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+    def as_dict(self) -> Dict:
+        names = [name for name in PHASES if name in self.seconds]
+        names += sorted(name for name in self.seconds if name not in PHASES)
+        return {
+            "phases": {name: round(self.seconds[name], 4) for name in names},
+            "total_seconds": round(self.total, 4),
+        }
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {seconds:.2f} s" for name, seconds in self.as_dict()["phases"].items())
@@ -0,0 +1,351 @@
+"""
+Catálogo local (SQLite) de playlists extraídas
+
+Cada extracción deja sus propios playlist_<id>.json/.csv; saber en qué
+playlists está un video o deduplicar entre cientos de exportaciones obliga
+a releerlos todos. PlaylistCatalog guarda playlists, videos y la pertenencia
+de cada video a cada playlist (con su posición) en una base SQLite:
+
+- playlists: una fila por playlist (URL, videos, total de la cabecera, fecha)
+- videos: una fila por video_id (título, duración, primera y última vez visto)
+- memberships: (playlist_id, video_id, position); la última extracción de
+  una playlist reemplaza sus filas
+
+Hay índices por video_id y por playlist_id, y búsqueda de texto completo en
+los títulos (FTS5; si el SQLite de Python no lo trae, se busca con LIKE).
+Las escrituras van en lotes de executemany dentro de una sola transacción.
+
+Uso:
+    with PlaylistCatalog("catalog.db") as catalog:
+        catalog.record_playlist("PL...", videos, url=url)
+        catalog.playlists_with("dQw4w9WgXcQ")
+
+Desde la línea de comandos:
+    python playlist_catalog.py --db catalog.db search "lofi"
+
+Hay una copia idéntica en backend/ (el backend se despliega solo con esa
+carpeta y no puede importarlo desde la raíz); tests/test_backend_sync.py
+falla si las copias difieren.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = "catalog.db"
+BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS playlists (
+    playlist_id TEXT PRIMARY KEY,
+    url TEXT,
+    total_videos INTEGER NOT NULL DEFAULT 0,
+    reported_total INTEGER,
+    extracted_at TEXT
+);
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL UNIQUE,
+    title TEXT,
+    duration TEXT,
+    first_seen TEXT,
+    last_seen TEXT
+);
+CREATE TABLE IF NOT EXISTS memberships (
+    playlist_id TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (playlist_id, video_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS memberships_video ON memberships (video_id);
+CREATE INDEX IF NOT EXISTS memberships_position ON memberships (playlist_id, position);
+"""
+
+# Índice externo sobre videos.title; los triggers lo mantienen al día
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+    title, content='videos', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS videos_fts_insert AFTER INSERT ON videos BEGIN
+    INSERT INTO videos_fts (rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS videos_fts_delete AFTER DELETE ON videos BEGIN
+    INSERT INTO videos_fts (videos_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS videos_fts_update AFTER UPDATE OF title ON videos
+WHEN old.title IS NOT new.title BEGIN
+    INSERT INTO videos_fts (videos_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO videos_fts (rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+UPSERT_VIDEO = """
+INSERT INTO videos (video_id, title, duration, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (video_id) DO UPDATE SET
+    title = excluded.title,
+    duration = COALESCE(NULLIF(excluded.duration, ''), videos.duration),
+    last_seen = excluded.last_seen
+"""
+
+
+def playlist_id_from_url(url: str) -> Optional[str]:
+    """Parámetro list= de una URL, o None"""
+    values = parse_qs(urlparse(url.strip()).query).get('list')
+    return values[0] if values else None
+
+
+def _chunks(rows: Iterable, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def fts_query(text: str) -> str:
+    """Texto libre -> consulta FTS5: cada palabra como prefijo, todas obligatorias"""
+    terms = [term.replace('"', '""') for term in text.split()]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+class PlaylistCatalog:
+    """Base SQLite de playlists, videos y pertenencias"""
+
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = BATCH_SIZE):
+        """
+        Args:
+            path: Archivo de la base (se crea si no existe)
+            batch_size: Filas por executemany al escribir
+        """
+        self.path = path
+        self.batch_size = batch_size
+        # Una conexión compartida entre hilos (el backend escribe desde los
+        # workers de jobs y lee desde los requests), serializada por el lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # 16 MB de páginas en memoria: los índices por video_id se escriben en orden aleatorio
+        self._conn.execute("PRAGMA cache_size=-16384")
+        self._conn.executescript(SCHEMA)
+        try:
+            self._conn.executescript(FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Sin FTS5 en este SQLite ({e}): la búsqueda usará LIKE")
+            self.full_text = False
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_playlist(self, playlist_id: str, videos: Iterable[Dict], url: Optional[str] = None,
+                        reported_total: Optional[int] = None) -> int:
+        """
+        Guarda una extracción: reemplaza las pertenencias de la playlist
+
+        Args:
+            playlist_id: ID de la playlist (parámetro list=)
+            videos: Videos como los de extract() (video_id, title, duration, index)
+            url: URL de la playlist
+            reported_total: Total que reporta la cabecera de la playlist
+
+        Returns:
+            Videos guardados
+        """
+        now = datetime.now().isoformat()
+        total = 0
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM memberships WHERE playlist_id = ?", (playlist_id,))
+            for chunk in _chunks((video for video in videos if video.get('video_id')), self.batch_size):
+                self._conn.executemany(UPSERT_VIDEO, [
+                    (video['video_id'], video.get('title'), video.get('duration') or '', now, now)
+                    for video in chunk
+                ])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO memberships (playlist_id, video_id, position) VALUES (?, ?, ?)",
+                    [(playlist_id, video['video_id'], video.get('index') or total + offset)
+                     for offset, video in enumerate(chunk, 1)]
+                )
+                total += len(chunk)
+            self._conn.execute("""
+                INSERT INTO playlists (playlist_id, url, total_videos, reported_total, extracted_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (playlist_id) DO UPDATE SET
+                    url = COALESCE(excluded.url, playlists.url),
+                    total_videos = excluded.total_videos,
+                    reported_total = excluded.reported_total,
+                    extracted_at = excluded.extracted_at
+            """, (playlist_id, url, total, reported_total, now))
+        return total
+
+    def import_export(self, filename: str, playlist_id: Optional[str] = None) -> Dict:
+        """
+        Importa un JSON de save_json (o un NDJSON de videos) ya exportado
+
+        El ID de la playlist sale de `playlist_id`, del parámetro list= de las
+        URLs de los videos o del nombre del archivo (playlist_<id>.json).
+        """
+        with open(filename, 'r', encoding='utf-8') as f:
+            if filename.endswith('.ndjson'):
+                videos = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
+                videos = data['videos'] if isinstance(data, dict) else data
+        if not playlist_id:
+            playlist_id = next((playlist_id_from_url(video.get('url') or '') for video in videos
+                                if playlist_id_from_url(video.get('url') or '')), None)
+        if not playlist_id:
+            playlist_id = os.path.basename(filename).split('.')[0]
+            if playlist_id.startswith('playlist_'):
+                playlist_id = playlist_id[len('playlist_'):]
+        total = self.record_playlist(playlist_id, videos)
+        return {"playlist_id": playlist_id, "videos": total}
+
+    def _query(self, sql: str, params=()) -> List[Dict]:
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def playlists_with(self, video_id: str) -> List[Dict]:
+        """Playlists que contienen un video, con su posición en cada una"""
+        return self._query("""
+            SELECT m.playlist_id, m.position, p.url, p.total_videos, p.extracted_at
+            FROM memberships m LEFT JOIN playlists p USING (playlist_id)
+            WHERE m.video_id = ?
+            ORDER BY m.playlist_id
+        """, (video_id,))
+
+    def playlist_videos(self, playlist_id: str, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Videos de una playlist en orden"""
+        return self._query("""
+            SELECT m.position, v.video_id, v.title, v.duration
+            FROM memberships m JOIN videos v USING (video_id)
+            WHERE m.playlist_id = ?
+            ORDER BY m.position
+            LIMIT ? OFFSET ?
+        """, (playlist_id, -1 if limit is None else limit, offset))
+
+    def search(self, text: str, limit: int = 20) -> List[Dict]:
+        """Videos cuyo título contiene todas las palabras de `text` (como prefijos)"""
+        if not text.strip():
+            return []
+        if self.full_text:
+            return self._query("""
+                SELECT v.video_id, v.title, v.duration,
+                       (SELECT COUNT(*) FROM memberships m WHERE m.video_id = v.video_id) AS playlists
+                FROM videos_fts JOIN videos v ON v.id = videos_fts.rowid
+                WHERE videos_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (fts_query(text), limit))
+        return self._query("""
+            SELECT v.video_id, v.title, v.duration,
+                   (SELECT COUNT(*) FROM memberships m WHERE m.video_id = v.video_id) AS playlists
+            FROM videos v WHERE v.title LIKE ? LIMIT ?
+        """, (f"%{text.strip()}%", limit))
+
+    def shared_videos(self, min_playlists: int = 2, limit: int = 50) -> List[Dict]:
+        """Videos que aparecen en `min_playlists` playlists o más (duplicados entre exportaciones)"""
+        return self._query("""
+            SELECT shared.video_id, v.title, shared.playlists
+            FROM (
+                SELECT video_id, COUNT(*) AS playlists
+                FROM memberships
+                GROUP BY video_id
+                HAVING COUNT(*) >= ?
+                ORDER BY playlists DESC, video_id
+                LIMIT ?
+            ) AS shared JOIN videos v USING (video_id)
+            ORDER BY shared.playlists DESC, shared.video_id
+        """, (min_playlists, limit))
+
+    def stats(self) -> Dict:
+        """Filas de cada tabla"""
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('playlists', 'videos', 'memberships')
+            }
+
+
+def _print_rows(rows: List[Dict], as_json: bool):
+    if as_json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    for row in rows:
+        print('\t'.join('' if value is None else str(value) for value in row.values()))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI del catálogo (también: extract_playlist_advanced.py catalog ...)"""
+    parser = argparse.ArgumentParser(prog='catalog', description='Consultas al catálogo local de playlists')
+    parser.add_argument('--db', default=DEFAULT_PATH, help='Archivo SQLite del catálogo')
+    parser.add_argument('--json', action='store_true', help='Imprimir los resultados como JSON')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('search', help='Buscar videos por título')
+    command.add_argument('text')
+    command.add_argument('--limit', type=int, default=20)
+
+    command = commands.add_parser('contains', help='Playlists que contienen un video')
+    command.add_argument('video_id')
+
+    command = commands.add_parser('playlist', help='Videos de una playlist en orden')
+    command.add_argument('playlist_id')
+    command.add_argument('--limit', type=int)
+
+    command = commands.add_parser('shared', help='Videos presentes en varias playlists')
+    command.add_argument('--min', type=int, default=2, dest='min_playlists')
+    command.add_argument('--limit', type=int, default=50)
+
+    command = commands.add_parser('import', help='Importar JSON/NDJSON exportados')
+    command.add_argument('files', nargs='+')
+    command.add_argument('--playlist-id', help='ID de la playlist (con un solo archivo)')
+
+    commands.add_parser('stats', help='Filas de cada tabla')
+
+    args = parser.parse_args(argv)
+    with PlaylistCatalog(args.db) as catalog:
+        start = time.perf_counter()
+        if args.command == 'search':
+            rows = catalog.search(args.text, args.limit)
+        elif args.command == 'contains':
+            rows = catalog.playlists_with(args.video_id)
+        elif args.command == 'playlist':
+            rows = catalog.playlist_videos(args.playlist_id, args.limit)
+        elif args.command == 'shared':
+            rows = catalog.shared_videos(args.min_playlists, args.limit)
+        elif args.command == 'import':
+            rows = [{"file": filename, **catalog.import_export(filename, args.playlist_id)}
+                    for filename in args.files]
+        else:
+            rows = [catalog.stats()]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    _print_rows(rows, args.json)
+    logger.info(f"{len(rows)} resultado(s) en {elapsed_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    raise SystemExit(main())
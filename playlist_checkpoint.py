@@ -0,0 +1,117 @@
+"""
+Checkpoints de una extracción en curso
+
+Si Chrome se cae o el proceso muere a mitad de una playlist enorme, los
+videos ya cosechados solo estaban en memoria. CheckpointWriter los va
+agregando a un archivo NDJSON (solo se agrega al final, nunca se reescribe)
+cada `every` videos o `interval` segundos, con fsync, junto con el progreso:
+
+    {"type": "start", "url": ..., "playlist_id": ..., "resume_from": 0, "at": ...}
+    {"type": "videos", "videos": [...], "last_index": 200, "saved": 200, "at": ...}
+    {"type": "done", "total_videos": 5000, "at": ...}
+
+load_checkpoint() reconstruye los videos y la última posición cargada para
+retomar la extracción desde ahí (--resume). Una última línea cortada por la
+caída se ignora.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointWriter:
+    """Agrega los videos cosechados a un NDJSON en lotes"""
+
+    def __init__(self, path: str, url: str, playlist_id: Optional[str] = None,
+                 resume_from: int = 0, every: int = 200, interval: float = 30):
+        """
+        Args:
+            path: Archivo de checkpoints (se agrega al final si ya existe)
+            url: URL de la playlist
+            playlist_id: ID de la playlist
+            resume_from: Última posición del checkpoint anterior (0 = desde el principio)
+            every: Videos acumulados que fuerzan un checkpoint
+            interval: Segundos tras los que se escribe aunque haya menos videos
+        """
+        self.path = path
+        self.every = every
+        self.interval = interval
+        self.saved = 0
+        self.last_index = resume_from
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._write({"type": "start", "url": url, "playlist_id": playlist_id, "resume_from": resume_from})
+
+    def _write(self, record: Dict):
+        record["at"] = datetime.now().isoformat()
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def add(self, video: Dict):
+        """Acumula un video; escribe el lote si se llenó o pasó el intervalo"""
+        self._pending.append(video)
+        if len(self._pending) >= self.every or time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Escribe los videos acumulados (si hay)"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        self.saved += len(self._pending)
+        self.last_index = max(self.last_index, *(video.get("index") or 0 for video in self._pending))
+        self._write({"type": "videos", "videos": self._pending, "last_index": self.last_index,
+                     "saved": self.saved})
+        self._pending = []
+
+    def close(self, total_videos: Optional[int] = None):
+        """Escribe lo pendiente y, con `total_videos`, marca la extracción como terminada"""
+        if self._file.closed:
+            return
+        self.flush()
+        if total_videos is not None:
+            self._write({"type": "done", "total_videos": total_videos})
+        self._file.close()
+
+
+def load_checkpoint(path: str) -> Optional[Dict]:
+    """
+    Videos y progreso guardados en un archivo de checkpoints
+
+    Returns:
+        {url, playlist_id, videos, last_index, done} o None si el archivo no existe
+    """
+    if not os.path.exists(path):
+        return None
+    state = {"url": None, "playlist_id": None, "videos": [], "last_index": 0, "done": False}
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Normalmente la última línea, cortada por la caída
+                logger.warning(f"Línea {number} del checkpoint incompleta; se ignora")
+                continue
+            kind = record.get("type")
+            if kind == "start":
+                state["url"] = state["url"] or record.get("url")
+                state["playlist_id"] = state["playlist_id"] or record.get("playlist_id")
+                state["done"] = False
+            elif kind == "videos":
+                for video in record.get("videos", []):
+                    if video.get("video_id") not in seen:
+                        seen.add(video.get("video_id"))
+                        state["videos"].append(video)
+                state["last_index"] = max(state["last_index"], record.get("last_index") or 0)
+            elif kind == "done":
+                state["done"] = True
+    return state
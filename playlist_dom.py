@@ -0,0 +1,422 @@
+"""
+Scripts JavaScript que se ejecutan dentro de la página de la playlist
+
+Cada llamada a find_element / .text / get_attribute es un round-trip HTTP
+contra ChromeDriver. Estos scripts leen todo lo necesario en una sola
+llamada a execute_script y devuelven arrays compactos.
+
+Hay una copia idéntica en backend/ (el backend se despliega solo con esa
+carpeta y no puede importarlo desde la raíz); tests/test_backend_sync.py
+falla si las copias difieren.
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+RENDERER_SELECTOR = "ytd-playlist-video-renderer"
+# YouTube deja este elemento (con el spinner) al final de la lista mientras
+# quedan videos por cargar; desaparece al llegar al final
+CONTINUATION_SELECTOR = "ytd-playlist-video-list-renderer ytd-continuation-item-renderer"
+
+# Función JS compartida por los scripts de cosecha: convierte un renderer en
+# [index, title, href, video_id, duration, thumbnail].
+# title es null si el renderer no tiene #video-title.
+ROW_FUNCTION = """
+const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+const toRow = (item, index) => {
+    const link = item.querySelector('#video-title');
+    if (!link) return [index, null, null, '', '', ''];
+    const href = link.href || link.getAttribute('href') || '';
+    const pos = href.indexOf('v=');
+    const videoId = pos >= 0 ? href.slice(pos + 2).split('&')[0] : '';
+    const duration = item.querySelector(
+        'span.style-scope.ytd-thumbnail-overlay-time-status-renderer');
+    const img = item.querySelector('#thumbnail img, img');
+    return [
+        index,
+        text(link),
+        href,
+        videoId,
+        text(duration),
+        img ? (img.src || img.getAttribute('src') || '') : ''
+    ];
+};
+"""
+
+# Devuelve una fila por renderer a partir de arguments[0] (offset, 0 por defecto).
+# index es la posición 1-based en el DOM, igual que enumerate(items, 1).
+HARVEST_SCRIPT = ROW_FUNCTION + """
+const start = arguments[0] || 0;
+const items = document.querySelectorAll('ytd-playlist-video-renderer');
+const rows = [];
+for (let i = start; i < items.length; i++) {
+    rows.push(toRow(items[i], i + 1));
+}
+return rows;
+"""
+
+# Como HARVEST_SCRIPT, pero después de leer los renderers los quita del DOM.
+# arguments[0] son los renderers ya podados: index sigue siendo la posición
+# en la playlist. En su lugar queda un único div (PRUNED_PLACEHOLDER_ID) con
+# la altura que ocupaban, así el scroll y el elemento de continuación siguen
+# donde YouTube los espera y la lista sigue cargando. El DOM (y el costo de
+# cada querySelectorAll) queda acotado a un lote de videos.
+PRUNED_PLACEHOLDER_ID = "playlist-extractor-pruned"
+PRUNE_HARVEST_SCRIPT = ROW_FUNCTION + """
+const pruned = arguments[0] || 0;
+const items = Array.from(document.querySelectorAll('ytd-playlist-video-renderer'));
+const rows = items.map((item, i) => toRow(item, pruned + i + 1));
+if (items.length) {
+    const parent = items[0].parentNode;
+    let placeholder = document.getElementById('playlist-extractor-pruned');
+    if (!placeholder) {
+        placeholder = document.createElement('div');
+        placeholder.id = 'playlist-extractor-pruned';
+        parent.insertBefore(placeholder, items[0]);
+    }
+    const top = items[0].getBoundingClientRect().top;
+    const bottom = items[items.length - 1].getBoundingClientRect().bottom;
+    const height = parseFloat(placeholder.style.height) || 0;
+    placeholder.style.height = (height + Math.max(bottom - top, 0)) + 'px';
+    placeholder.dataset.pruned = pruned + items.length;
+    for (const item of items) item.remove();
+}
+return rows;
+"""
+
+
+def harvest_rows(driver, start: int = 0) -> List[list]:
+    """
+    Lee todos los renderers desde `start` con un único execute_script
+
+    Args:
+        driver: WebDriver con la playlist cargada
+        start: Offset (0-based) del primer renderer a leer
+
+    Returns:
+        Lista de filas [index, title, href, video_id, duration, thumbnail]
+    """
+    return driver.execute_script(HARVEST_SCRIPT, start) or []
+
+
+def harvest_and_prune(driver, pruned: int = 0) -> List[list]:
+    """
+    Lee todos los renderers presentes y los quita del DOM
+
+    Args:
+        driver: WebDriver con la playlist cargada
+        pruned: Renderers quitados en llamadas anteriores (offset de index)
+
+    Returns:
+        Lista de filas [index, title, href, video_id, duration, thumbnail]
+    """
+    return driver.execute_script(PRUNE_HARVEST_SCRIPT, pruned) or []
+
+
+# Posición en la playlist del primer renderer (su #index, "1", "201"...);
+# null si no hay renderers o el número no aparece
+FIRST_INDEX_SCRIPT = """
+const index = document.querySelector('ytd-playlist-video-renderer #index');
+const value = index ? parseInt((index.innerText || index.textContent || '').replace(/\\D/g, ''), 10) : NaN;
+return isNaN(value) ? null : value;
+"""
+
+
+def first_index(driver) -> Optional[int]:
+    """Posición (1-based) del primer video cargado según la página (None si no se sabe)"""
+    return driver.execute_script(FIRST_INDEX_SCRIPT)
+
+
+# Total de videos que reporta la cabecera de la playlist ("1,234 videos"),
+# leído de ytInitialData; null si no aparece
+HEADER_TOTAL_SCRIPT = """
+const data = window.ytInitialData;
+if (!data || !data.header) return null;
+const text = (node) => !node ? '' :
+    (node.simpleText || (node.runs || []).map(run => run.text).join(''));
+const stack = [data.header];
+while (stack.length) {
+    const node = stack.pop();
+    if (!node || typeof node !== 'object') continue;
+    const label = node.numVideosText ? text(node.numVideosText)
+        : (Array.isArray(node.stats) && node.stats.length ? text(node.stats[0]) : '');
+    if (label) {
+        const match = label.match(/\\d[\\d.,\\s\\u00a0]*/);
+        return match ? parseInt(match[0].replace(/\\D/g, ''), 10) : null;
+    }
+    stack.push(...Object.values(node));
+}
+return null;
+"""
+
+
+def reported_total(driver) -> Optional[int]:
+    """Total de videos según la cabecera de la playlist (None si no se encuentra)"""
+    return driver.execute_script(HEADER_TOTAL_SCRIPT)
+
+
+# Videos no disponibles que la playlist no muestra, según el aviso de
+# ytInitialData.alerts ("1 unavailable video is hidden", "Se oculta 1 video
+# no disponible"); 0 si no hay aviso. La cabecera los cuenta en el total,
+# pero nunca se cargan como renderers.
+HIDDEN_VIDEOS_SCRIPT = """
+const data = window.ytInitialData;
+if (!data) return 0;
+const text = (node) => !node ? '' :
+    (node.simpleText || (node.runs || []).map(run => run.text).join(''));
+const stack = [data.alerts || [], data.header || {}];
+while (stack.length) {
+    const node = stack.pop();
+    if (!node || typeof node !== 'object') continue;
+    const alert = node.alertWithButtonRenderer || node.alertRenderer;
+    if (alert) {
+        const label = text(alert.text);
+        if (/unavailable|hidden|no disponible|ocult/i.test(label)) {
+            const match = label.match(/\\d[\\d.,\\s\\u00a0]*/);
+            return match ? parseInt(match[0].replace(/\\D/g, ''), 10) : 0;
+        }
+    }
+    stack.push(...Object.values(node));
+}
+return 0;
+"""
+
+# Total de la cabecera y videos ocultos en un solo round-trip
+PLAYLIST_COUNTS_SCRIPT = (
+    "const total = (() => {" + HEADER_TOTAL_SCRIPT + "})();\n"
+    "const hidden = (() => {" + HIDDEN_VIDEOS_SCRIPT + "})();\n"
+    "return [total, hidden];"
+)
+
+
+def playlist_counts(driver) -> Tuple[Optional[int], int]:
+    """
+    Total de videos de la cabecera y videos no disponibles ocultos
+
+    La lista completa tiene `total - hidden` renderers: ese es el número en
+    el que se puede dejar de hacer scroll.
+
+    Returns:
+        (total o None si la cabecera no lo muestra, ocultos)
+    """
+    total, hidden = driver.execute_script(PLAYLIST_COUNTS_SCRIPT)
+    return total, hidden or 0
+
+
+# Script asíncrono: hace scroll al final y espera con un MutationObserver hasta
+# que aparezcan renderers nuevos o desaparezca el elemento de continuación.
+# arguments: [renderers ya conocidos, timeout ms, gracia ms, callback]
+# Devuelve {count, continuation, reason, waited_ms} con reason en
+# 'grew' (hay videos nuevos), 'end' (no hay continuación) o 'timeout'.
+# La gracia evita confundir con el final el instante en que YouTube quita
+# la continuación vieja antes de insertar la nueva.
+SCROLL_WAIT_SCRIPT = """
+const known = arguments[0];
+const timeoutMs = arguments[1];
+const graceMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const started = performance.now();
+const snapshot = () => ({
+    count: document.querySelectorAll('ytd-playlist-video-renderer').length,
+    continuation: !!document.querySelector(
+        'ytd-playlist-video-list-renderer ytd-continuation-item-renderer')
+});
+let observer = null;
+let timer = null;
+let graceTimer = null;
+let finished = false;
+const finish = (reason) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(graceTimer);
+    const state = snapshot();
+    state.reason = reason;
+    state.waited_ms = Math.round(performance.now() - started);
+    done(state);
+};
+const check = () => {
+    const state = snapshot();
+    if (state.count > known) {
+        finish('grew');
+    } else if (!state.continuation && graceTimer === null) {
+        graceTimer = setTimeout(() => {
+            const later = snapshot();
+            if (later.count > known) finish('grew');
+            else if (!later.continuation) finish('end');
+            else graceTimer = null;
+        }, graceMs);
+    }
+};
+window.scrollTo(0, document.documentElement.scrollHeight);
+observer = new MutationObserver(check);
+observer.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(() => finish('timeout'), timeoutMs);
+check();
+"""
+
+
+def prepare_adaptive_wait(driver, timeout: float):
+    """Ajusta el timeout de scripts asíncronos para scroll_and_wait()"""
+    driver.set_script_timeout(timeout + 5)
+
+
+def scroll_and_wait(driver, known_count: int, timeout: float = 10, grace: float = 0.5) -> Dict:
+    """
+    Hace scroll y espera solo lo necesario (un único round-trip)
+
+    Args:
+        driver: WebDriver preparado con prepare_adaptive_wait()
+        known_count: Renderers presentes antes del scroll
+        timeout: Espera máxima en segundos
+        grace: Segundos que la continuación debe seguir ausente para
+            considerar que la lista terminó
+
+    Returns:
+        dict con count, continuation, reason ('grew', 'end', 'timeout') y waited_ms
+    """
+    return driver.execute_async_script(
+        SCROLL_WAIT_SCRIPT, known_count, int(timeout * 1000), int(grace * 1000)
+    )
+
+
+class ScrollStats:
+    """Tiempo de espera por paso de scroll, para comparar los modos de espera"""
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.steps = 0
+        self.wait_seconds = 0.0
+        self.idle_seconds = 0.0  # Esperas que no trajeron videos nuevos
+        self.end_reason = None
+
+    def record(self, seconds: float, grew: bool):
+        self.steps += 1
+        self.wait_seconds += seconds
+        if not grew:
+            self.idle_seconds += seconds
+
+    def as_dict(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "steps": self.steps,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "idle_seconds": round(self.idle_seconds, 3),
+            "end_reason": self.end_reason,
+        }
+
+    def summary(self) -> str:
+        return (f"{self.steps} pasos, {self.wait_seconds:.1f} s esperando "
+                f"({self.idle_seconds:.1f} s sin videos nuevos), fin: {self.end_reason}")
+
+
+# Script asíncrono: pide las continuaciones de la lista con fetch desde la
+# propia página (mismas cookies, consentimiento y ytcfg que el navegador),
+# sin scroll ni renderers: YouTube no llega a hacer layout ni paint.
+# Con token null empieza por los items de ytInitialData.
+# arguments: [token, máximo de peticiones, timeout por petición ms, callback]
+# Devuelve un string JSON {items, token, requests, error}: items son los
+# playlistVideoRenderer crudos y token el de la próxima continuación (null al
+# final). Con error, items trae lo obtenido antes del fallo y token el que falló.
+CONTINUATION_FETCH_SCRIPT = """
+let token = arguments[0];
+const maxRequests = arguments[1];
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const result = {items: [], token: null, requests: 0, error: null};
+const cfg = (key) => window.ytcfg && window.ytcfg.get ? window.ytcfg.get(key) : undefined;
+const find = (root, key) => {
+    const stack = [root];
+    while (stack.length) {
+        const node = stack.pop();
+        if (!node || typeof node !== 'object') continue;
+        if (Object.prototype.hasOwnProperty.call(node, key)) return node[key];
+        stack.push(...Object.values(node));
+    }
+    return undefined;
+};
+const take = (items) => {
+    let next = null;
+    for (const item of items || []) {
+        if (item.playlistVideoRenderer) result.items.push(item);
+        else if (item.continuationItemRenderer) next = find(item.continuationItemRenderer, 'token') || null;
+    }
+    return next;
+};
+const continuationItems = (data) => {
+    const items = [];
+    for (const action of data.onResponseReceivedActions || []) {
+        const append = action.appendContinuationItemsAction || action.reloadContinuationItemsCommand;
+        if (append) items.push(...(append.continuationItems || []));
+    }
+    return items;
+};
+(async () => {
+    if (!token) {
+        const list = find(window.ytInitialData, 'playlistVideoListRenderer');
+        if (!list) throw new Error('ytInitialData sin playlistVideoListRenderer');
+        token = take(list.contents);
+    }
+    const apiKey = cfg('INNERTUBE_API_KEY');
+    const url = '/youtubei/v1/browse?prettyPrint=false' + (apiKey ? '&key=' + encodeURIComponent(apiKey) : '');
+    const context = cfg('INNERTUBE_CONTEXT') ||
+        {client: {clientName: 'WEB', clientVersion: cfg('INNERTUBE_CLIENT_VERSION')}};
+    const seen = new Set();
+    while (token && result.requests < maxRequests) {
+        if (seen.has(token)) {
+            token = null;
+            break;
+        }
+        seen.add(token);
+        const controller = new AbortController();
+        const timer = setTimeout(() => controller.abort(), timeoutMs);
+        let data;
+        try {
+            const response = await fetch(url, {
+                method: 'POST',
+                credentials: 'same-origin',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({context, continuation: token}),
+                signal: controller.signal
+            });
+            if (!response.ok) throw new Error('HTTP ' + response.status);
+            data = await response.json();
+        } finally {
+            clearTimeout(timer);
+        }
+        result.requests++;
+        token = take(continuationItems(data));
+    }
+})().catch((e) => {
+    result.error = String((e && e.message) || e);
+}).then(() => {
+    result.token = token || null;
+    done(JSON.stringify(result));
+});
+"""
+
+
+def prepare_fetch(driver, timeout: float, requests: int):
+    """Ajusta el timeout de scripts asíncronos para fetch_continuations()"""
+    driver.set_script_timeout(timeout * requests + 5)
+
+
+def fetch_continuations(driver, token: Optional[str] = None, requests: int = 10,
+                        timeout: float = 10) -> Dict:
+    """
+    Pide hasta `requests` continuaciones desde la página (un único round-trip)
+
+    Args:
+        driver: WebDriver preparado con prepare_fetch()
+        token: Token de continuación; None empieza por los items de ytInitialData
+        requests: Máximo de peticiones a /youtubei/v1/browse en esta llamada
+        timeout: Tiempo máximo por petición en segundos
+
+    Returns:
+        dict con items (playlistVideoRenderer crudos), token (None al final),
+        requests y error (None si todo salió bien)
+    """
+    return json.loads(driver.execute_async_script(
+        CONTINUATION_FETCH_SCRIPT, token, requests, int(timeout * 1000)
+    ))
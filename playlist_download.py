@@ -0,0 +1,455 @@
+"""
+Descarga concurrente de los videos de una exportación
+
+El script que genera el frontend (components/ExportModal.tsx) lanza un solo
+`yt-dlp -a playlist_urls.txt`, que baja los videos de a uno. DownloadOrchestrator
+lee las exportaciones de save_json/save_txt (.json, .ndjson o _urls.txt, también
+.gz) y reparte los videos entre un pool acotado de workers:
+
+- un límite de ancho de banda global (token bucket compartido por todos los
+  workers), para no saturar la conexión al subir la concurrencia
+- reintentos por video con espera exponencial
+- un archivo de estado (NDJSON, solo se agrega al final) con el resultado de
+  cada video: al volver a correr se saltan los que ya se descargaron
+
+El backend de descarga es intercambiable: YtDlpDownloader (yt-dlp, para
+YouTube) o HTTPDownloader (descarga directa por HTTP, con la que los
+benchmarks usan un servidor local en lugar de YouTube).
+
+Uso:
+    python playlist_download.py playlist.json --workers 4 --max-rate 5M
+    python extract_playlist_advanced.py download playlist_urls.txt --audio
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import mimetypes
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+try:
+    import yt_dlp
+except ImportError:  # Solo lo necesita el backend yt-dlp
+    yt_dlp = None
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "download_state.ndjson"
+CHUNK_SIZE = 64 * 1024
+_RATE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([kmg]?)i?b?\s*$', re.IGNORECASE)
+_UNSAFE = re.compile(r'[\\/:*?"<>|\x00-\x1f]+')
+
+
+def video_id_from_url(url: str) -> Optional[str]:
+    """Parámetro v= de una URL de YouTube (o el path de youtu.be), o None"""
+    parsed = urlparse(url.strip())
+    values = parse_qs(parsed.query).get('v')
+    if values:
+        return values[0]
+    if parsed.netloc.endswith('youtu.be') and parsed.path.strip('/'):
+        return parsed.path.strip('/')
+    return None
+
+
+def _open_export(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def load_items(path: str) -> List[Dict]:
+    """
+    Videos de una exportación: JSON (save_json), NDJSON o TXT con una URL por línea
+
+    Returns:
+        [{video_id, url, title, index}] en el orden de la playlist, sin repetidos
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    with _open_export(path) as f:
+        if name.endswith('.json'):
+            data = json.load(f)
+            records = data.get('videos', []) if isinstance(data, dict) else data
+        elif name.endswith('.ndjson'):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = [{"url": line.strip()} for line in f
+                       if line.strip() and not line.lstrip().startswith('#')]
+
+    items = []
+    seen = set()
+    for position, record in enumerate(records, 1):
+        url = record.get('url_simple') or record.get('url')
+        video_id = record.get('video_id') or (video_id_from_url(url) if url else None)
+        key = video_id or url
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        items.append({
+            "video_id": key,
+            "url": url or f"https://www.youtube.com/watch?v={video_id}",
+            "title": record.get('title') or key,
+            "index": record.get('index') or position,
+        })
+    return items
+
+
+def parse_rate(value: Optional[str]) -> Optional[float]:
+    """'500K', '5M', '1.5MB' -> bytes por segundo (None o '0' = sin límite)"""
+    if value is None:
+        return None
+    match = _RATE.match(str(value))
+    if not match:
+        raise ValueError(f"Velocidad inválida: {value} (ejemplos: 500K, 5M)")
+    number, unit = float(match.group(1)), match.group(2).lower()
+    rate = number * {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}[unit]
+    return rate or None
+
+
+def output_name(item: Dict) -> str:
+    """Nombre de archivo (sin extensión) de un video: posición, título e ID"""
+    title = _UNSAFE.sub('_', item.get('title') or '').strip(' .')[:120]
+    return f"{int(item.get('index') or 0):04d} - {title} [{item['video_id']}]"
+
+
+class TokenBucket:
+    """
+    Límite de bytes por segundo compartido por todos los workers
+
+    Cada consume() descuenta los bytes del balance y, si queda en negativo,
+    espera lo que tarda en recuperarse a `rate`: el promedio global nunca
+    supera `rate` aunque un trozo sea más grande que la ráfaga.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: Bytes por segundo
+            burst: Bytes que se pueden gastar de golpe tras estar inactivo (default: 1 s)
+        """
+        self.rate = rate
+        self.capacity = burst or rate
+        # Empieza vacío: la ráfaga solo se junta tras una pausa, no al arrancar
+        self.tokens = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int):
+        """Descuenta `amount` bytes, esperando si se superó el límite"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class DownloadState:
+    """Resultado de cada video en un NDJSON (el último registro de cada video manda)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Última línea cortada si el proceso murió escribiéndola
+                        continue
+                    self.records[record.get("video_id")] = record
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def completed(self, video_id: str) -> bool:
+        """True si el video ya se descargó y el archivo sigue en disco"""
+        record = self.records.get(video_id)
+        return bool(record and record.get("status") == "done"
+                    and os.path.exists(record.get("file") or ""))
+
+    def record(self, video_id: str, status: str, **fields):
+        record = {"video_id": video_id, "status": status, **fields,
+                  "at": datetime.now().isoformat()}
+        with self._lock:
+            self.records[video_id] = record
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class HTTPDownloader:
+    """
+    Descarga directa por HTTP(S), en trozos que pasan por el token bucket
+
+    Con `url_template` (p. ej. "http://127.0.0.1:8000/files/{video_id}.mp4")
+    la URL se arma con los campos del video en lugar de usar item["url"].
+    Un .part de un intento anterior se continúa con Range si el servidor lo
+    acepta.
+    """
+
+    name = 'http'
+
+    def __init__(self, url_template: Optional[str] = None, timeout: float = 30,
+                 chunk_size: int = CHUNK_SIZE):
+        self.url_template = url_template
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        # requests.Session no es segura entre hilos: una por worker
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def download(self, item: Dict, output_dir: str, bucket: Optional[TokenBucket] = None) -> str:
+        url = self.url_template.format(**item) if self.url_template else item["url"]
+        extension = os.path.splitext(urlparse(url).path)[1]
+        partial = os.path.join(output_dir, f"{output_name(item)}.part")
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        with self._session().get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 416:
+                # El .part no coincide con el archivo del servidor: el reintento baja todo
+                os.remove(partial)
+            response.raise_for_status()
+            if response.status_code != 206:
+                offset = 0
+            if not extension:
+                content_type = response.headers.get('Content-Type', '').split(';')[0]
+                extension = mimetypes.guess_extension(content_type) or '.bin'
+            with open(partial, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(self.chunk_size):
+                    if bucket:
+                        bucket.consume(len(chunk))
+                    f.write(chunk)
+
+        path = os.path.join(output_dir, output_name(item) + extension)
+        os.replace(partial, path)
+        return path
+
+
+class YtDlpDownloader:
+    """
+    Descarga con yt-dlp (mismos formatos que el script del frontend)
+
+    El límite global se aplica desde el progress hook: el hook corre en el
+    hilo que descarga, así que esperar ahí frena esa descarga.
+    """
+
+    name = 'yt-dlp'
+
+    def __init__(self, audio_only: bool = False, options: Optional[Dict] = None):
+        """
+        Args:
+            audio_only: MP3 de la mejor calidad en lugar de MP4 con video y audio
+            options: Opciones extra de yt_dlp.YoutubeDL
+        """
+        self.audio_only = audio_only
+        self.options = options or {}
+
+    def download(self, item: Dict, output_dir: str, bucket: Optional[TokenBucket] = None) -> str:
+        if yt_dlp is None:
+            raise RuntimeError("yt-dlp no está instalado (pip install yt-dlp)")
+        received = {}
+
+        def throttle(status: Dict):
+            if not bucket or status.get('downloaded_bytes') is None:
+                return
+            filename = status.get('filename')
+            delta = status['downloaded_bytes'] - received.get(filename, 0)
+            received[filename] = status['downloaded_bytes']
+            if delta > 0:
+                bucket.consume(delta)
+
+        options = {
+            "outtmpl": os.path.join(output_dir, output_name(item).replace('%', '%%') + ".%(ext)s"),
+            "progress_hooks": [throttle],
+            "quiet": True,
+            "noprogress": True,
+            "continuedl": True,
+            # Los reintentos los maneja el orquestador
+            "retries": 0,
+        }
+        if self.audio_only:
+            options.update(format="bestaudio/best", postprocessors=[{
+                "key": "FFmpegExtractAudio", "preferredcodec": "mp3", "preferredquality": "0",
+            }])
+        else:
+            options.update(format="bestvideo+bestaudio/best", merge_output_format="mp4")
+        options.update(self.options)
+
+        with yt_dlp.YoutubeDL(options) as ydl:
+            info = ydl.extract_info(item["url"], download=True)
+            downloads = info.get('requested_downloads') or [{}]
+            return downloads[-1].get('filepath') or ydl.prepare_filename(info)
+
+
+BACKENDS = {
+    'yt-dlp': YtDlpDownloader,
+    'http': HTTPDownloader,
+}
+
+
+class DownloadOrchestrator:
+    """Pool acotado de descargas con límite global, reintentos y estado reanudable"""
+
+    def __init__(self, backend, output_dir: str = "downloads", workers: int = 4,
+                 max_rate: Optional[float] = None, retries: int = 3,
+                 state_file: Optional[str] = None, backoff: float = 1.0):
+        """
+        Args:
+            backend: Objeto con download(item, output_dir, bucket) -> archivo (ver BACKENDS)
+            output_dir: Carpeta de destino
+            workers: Descargas simultáneas
+            max_rate: Límite global en bytes por segundo (None = sin límite)
+            retries: Reintentos por video
+            state_file: Archivo de estado (default: {output_dir}/download_state.ndjson)
+            backoff: Segundos de la primera espera entre reintentos (se duplica en cada uno, máx. 30)
+        """
+        self.backend = backend
+        self.output_dir = output_dir
+        self.workers = max(1, workers)
+        self.bucket = TokenBucket(max_rate) if max_rate else None
+        self.retries = retries
+        self.state_file = state_file or os.path.join(output_dir, STATE_FILE)
+        self.backoff = backoff
+        self._state = None
+        self._done = 0
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def run(self, items: Iterable[Dict]) -> Dict:
+        """
+        Descarga los videos que no estén completos en el archivo de estado
+
+        Returns:
+            Resumen: total, descargados, saltados, fallidos, bytes, segundos y errores
+        """
+        items = list(items)
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._state = DownloadState(self.state_file)
+        start = time.perf_counter()
+        try:
+            pending = [item for item in items if not self._state.completed(item["video_id"])]
+            if len(pending) < len(items):
+                logger.info(f"⏭️  {len(items) - len(pending)} videos ya descargados (según {self.state_file})")
+            self._done = 0
+            self._total = len(pending)
+            logger.info(f"⬇️  Descargando {len(pending)} videos con {self.workers} workers "
+                        f"({self.backend.name}"
+                        + (f", máx. {self.bucket.rate / 1024 / 1024:.2f} MB/s)" if self.bucket else ")"))
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(self._download_item, pending))
+        finally:
+            self._state.close()
+        seconds = time.perf_counter() - start
+
+        downloaded = [result for result in results if result["status"] == "done"]
+        failed = [result for result in results if result["status"] == "failed"]
+        total_bytes = sum(result["bytes"] for result in downloaded)
+        return {
+            "total": len(items),
+            "downloaded": len(downloaded),
+            "skipped": len(items) - len(pending),
+            "failed": len(failed),
+            "bytes": total_bytes,
+            "seconds": round(seconds, 3),
+            "mb_per_second": round(total_bytes / 1024 / 1024 / max(seconds, 1e-9), 2),
+            "failures": [{"video_id": result["video_id"], "errors": result["errors"]}
+                         for result in failed],
+        }
+
+    def _download_item(self, item: Dict) -> Dict:
+        """Descarga un video con reintentos y registra el resultado en el estado"""
+        video_id = item["video_id"]
+        errors = []
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                path = self.backend.download(item, self.output_dir, self.bucket)
+            except Exception as e:
+                errors.append(f"Intento {attempt}: {e}")
+                if attempt > self.retries:
+                    self._state.record(video_id, "failed", attempts=attempt, errors=errors)
+                    self._progress(f"❌ {item['title']}: {e}")
+                    return {"video_id": video_id, "status": "failed", "bytes": 0, "errors": errors}
+                wait = min(self.backoff * 2 ** (attempt - 1), 30)
+                logger.warning(f"🔁 {item['title']}: {e} (reintento {attempt}/{self.retries} en {wait:.1f}s)")
+                time.sleep(wait)
+                continue
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            self._state.record(video_id, "done", file=path, bytes=size, attempts=attempt)
+            self._progress(f"✅ {item['title']} ({size / 1024 / 1024:.1f} MB)")
+            return {"video_id": video_id, "status": "done", "bytes": size, "errors": errors}
+
+    def _progress(self, message: str):
+        with self._lock:
+            self._done += 1
+            done = self._done
+        logger.info(f"[{done}/{self._total}] {message}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI de descargas (también: extract_playlist_advanced.py download ...)"""
+    parser = argparse.ArgumentParser(prog='download',
+                                     description='Descarga concurrente de una playlist exportada')
+    parser.add_argument('export', help='Exportación: playlist.json, .ndjson o playlist_urls.txt (también .gz)')
+    parser.add_argument('--output-dir', default='downloads', help='Carpeta de destino')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default='yt-dlp',
+                        help='yt-dlp (YouTube) o http (descarga directa de item["url"] o --url-template)')
+    parser.add_argument('--workers', type=int, default=4, help='Descargas simultáneas')
+    parser.add_argument('--max-rate', help='Límite global de ancho de banda (p. ej. 500K, 5M)')
+    parser.add_argument('--retries', type=int, default=3, help='Reintentos por video')
+    parser.add_argument('--state', help=f'Archivo de estado (default: {{output-dir}}/{STATE_FILE})')
+    parser.add_argument('--audio', action='store_true', help='Con yt-dlp, solo audio en MP3')
+    parser.add_argument('--url-template', help='Con http, URL de cada video (campos: video_id, index, title)')
+    parser.add_argument('--json', action='store_true', help='Imprimir el resumen como JSON')
+    args = parser.parse_args(argv)
+
+    try:
+        max_rate = parse_rate(args.max_rate)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.backend == 'http':
+        backend = HTTPDownloader(args.url_template)
+    elif yt_dlp is None:
+        logger.error("❌ yt-dlp no está instalado: pip install yt-dlp (o usa --backend http)")
+        return 1
+    else:
+        backend = YtDlpDownloader(audio_only=args.audio)
+
+    items = load_items(args.export)
+    if not items:
+        logger.error(f"❌ No hay videos en {args.export}")
+        return 1
+    summary = DownloadOrchestrator(backend, args.output_dir, args.workers, max_rate,
+                                   args.retries, args.state).run(items)
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    logger.info(f"📦 {summary['downloaded']} descargados, {summary['skipped']} saltados, "
+                f"{summary['failed']} fallidos en {summary['seconds']}s ({summary['mb_per_second']} MB/s)")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    raise SystemExit(main())
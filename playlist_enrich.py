@@ -0,0 +1,214 @@
+"""
+Enriquecimiento de videos con metadatos de su página /watch
+
+Los extractores solo leen de la playlist el título, el ID y la duración.
+MetadataEnricher agrega a cada video el canal, las vistas, la fecha de
+subida y la miniatura de mayor resolución, leídos del
+ytInitialPlayerResponse de su página /watch:
+
+- las páginas se piden en paralelo con asyncio y una sola sesión aiohttp
+  (pool de conexiones keep-alive), con un máximo de `concurrency` a la vez
+- los metadatos quedan en una caché SQLite por video_id; las entradas más
+  viejas que `ttl` se descartan, así repetir una playlist no pide nada
+
+Uso:
+    enricher = MetadataEnricher("metadata_cache.db", concurrency=16)
+    stats = enricher.enrich(videos)  # agrega los campos a cada video
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import aiohttp
+except ImportError:  # Solo lo necesita --enrich
+    aiohttp = None
+
+from youtube_http import USER_AGENT, extract_json_var, video_metadata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE = "metadata_cache.db"
+DEFAULT_TTL = 7 * 24 * 3600
+WATCH_URL = "https://www.youtube.com/watch?v={video_id}"
+METADATA_FIELDS = ("channel", "channel_id", "view_count", "upload_date", "thumbnail_url")
+# Variables de SQLite por consulta (el límite por defecto es 999 en versiones viejas)
+_QUERY_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    video_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metadata_fetched_at ON metadata (fetched_at);
+"""
+
+
+class MetadataCache:
+    """Metadatos por video_id en SQLite, con vencimiento (TTL)"""
+
+    def __init__(self, path: str = DEFAULT_CACHE, ttl: float = DEFAULT_TTL):
+        """
+        Args:
+            path: Archivo de la caché (se crea si no existe)
+            ttl: Segundos que vale una entrada
+        """
+        self.path = path
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def evict(self) -> int:
+        """Borra las entradas vencidas; devuelve cuántas"""
+        with self._conn:
+            cursor = self._conn.execute("DELETE FROM metadata WHERE fetched_at < ?",
+                                        (time.time() - self.ttl,))
+        return cursor.rowcount
+
+    def get_many(self, video_ids: Iterable[str]) -> Dict[str, Dict]:
+        """{video_id: metadatos} de los videos con una entrada vigente"""
+        video_ids = list(video_ids)
+        found = {}
+        oldest = time.time() - self.ttl
+        for start in range(0, len(video_ids), _QUERY_CHUNK):
+            chunk = video_ids[start:start + _QUERY_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT video_id, data FROM metadata WHERE fetched_at >= ? "
+                f"AND video_id IN ({','.join('?' * len(chunk))})", [oldest, *chunk])
+            found.update((video_id, json.loads(data)) for video_id, data in rows)
+        return found
+
+    def put_many(self, metadata: Dict[str, Dict]):
+        """Guarda (o reemplaza) los metadatos de varios videos en una transacción"""
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metadata (video_id, data, fetched_at) VALUES (?, ?, ?)",
+                [(video_id, json.dumps(data, ensure_ascii=False), now)
+                 for video_id, data in metadata.items()])
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MetadataEnricher:
+    """Agrega canal, vistas, fecha de subida y miniatura a los videos extraídos"""
+
+    def __init__(self, cache_path: str = DEFAULT_CACHE, ttl: float = DEFAULT_TTL,
+                 concurrency: int = 16, timeout: float = 15, retries: int = 2,
+                 watch_url: str = WATCH_URL):
+        """
+        Args:
+            cache_path: Archivo de la caché SQLite
+            ttl: Segundos que vale una entrada de la caché
+            concurrency: Páginas /watch pedidas a la vez
+            timeout: Tiempo máximo por página (segundos)
+            retries: Reintentos por video ante errores de red, 429 o 5xx
+            watch_url: Plantilla de la URL de cada video (campo video_id)
+        """
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.watch_url = watch_url
+
+    def enrich(self, videos: List[Dict]) -> Dict:
+        """
+        Agrega METADATA_FIELDS a cada video (None si no se pudieron obtener)
+
+        Returns:
+            {"cached", "fetched", "failed", "seconds"}
+        """
+        start = time.perf_counter()
+        with MetadataCache(self.cache_path, self.ttl) as cache:
+            evicted = cache.evict()
+            if evicted:
+                logger.info(f"🧹 {evicted} metadatos vencidos descartados de {self.cache_path}")
+            video_ids = list(dict.fromkeys(video['video_id'] for video in videos if video.get('video_id')))
+            metadata = cache.get_many(video_ids)
+            cached = len(metadata)
+            missing = [video_id for video_id in video_ids if video_id not in metadata]
+            fetched = {}
+            if missing:
+                if aiohttp is None:
+                    raise RuntimeError("aiohttp no está instalado (pip install aiohttp)")
+                logger.info(f"🔎 Metadatos: {cached} en caché, pidiendo {len(missing)} "
+                            f"({self.concurrency} a la vez)")
+                try:
+                    asyncio.run(self._fetch_all(missing, fetched))
+                finally:
+                    # Lo ya obtenido se guarda aunque la corrida se interrumpa
+                    cache.put_many(fetched)
+                metadata.update(fetched)
+
+        empty = dict.fromkeys(METADATA_FIELDS)
+        for video in videos:
+            video.update(metadata.get(video.get('video_id')) or empty)
+
+        stats = {
+            "cached": cached,
+            "fetched": len(fetched),
+            "failed": len(missing) - len(fetched),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        logger.info(f"✅ Metadatos: {stats['cached']} en caché, {stats['fetched']} pedidos, "
+                    f"{stats['failed']} fallidos en {stats['seconds']}s")
+        return stats
+
+    async def _fetch_all(self, video_ids: List[str], fetched: Dict[str, Dict]):
+        """Pide las páginas de todos los videos con una sesión compartida; llena `fetched`"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": USER_AGENT, "Accept-Language": "es-ES,es;q=0.9,en;q=0.8"},
+            # Evita la página de consentimiento de cookies en la UE
+            cookies={"CONSENT": "YES+cb"},
+        ) as session:
+            async def fetch(video_id: str):
+                async with semaphore:
+                    data = await self._fetch_one(session, video_id)
+                if data is not None:
+                    fetched[video_id] = data
+
+            await asyncio.gather(*(fetch(video_id) for video_id in video_ids))
+
+    async def _fetch_one(self, session, video_id: str) -> Optional[Dict]:
+        """Metadatos de un video, o None si falló tras los reintentos"""
+        url = self.watch_url.format(video_id=video_id)
+        for attempt in range(self.retries + 1):
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    html = await response.text()
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = getattr(e, 'status', None)
+                # 429 y 5xx son transitorios; otro 4xx (p. ej. 404) no cambia al reintentar
+                transient = status is None or status == 429 or status >= 500
+                if transient and attempt < self.retries:
+                    await asyncio.sleep(min(2 ** attempt, 30))
+                    continue
+                logger.warning(f"⚠️  Sin metadatos para {video_id}: {e or type(e).__name__}")
+                return None
+        player_response = extract_json_var(html, "ytInitialPlayerResponse")
+        if not player_response:
+            # Página sin datos del reproductor (video privado, borrado...): no se reintenta
+            logger.warning(f"⚠️  {video_id}: la página no trae ytInitialPlayerResponse")
+            return None
+        return video_metadata(player_response)
@@ -0,0 +1,275 @@
+"""
+Exportación de videos en varios formatos en una sola pasada
+
+PlaylistExporter recibe los videos de uno en uno (de una lista o de un
+generador) y escribe cada registro en todos los formatos pedidos a la vez:
+JSON, NDJSON, CSV, TXT (solo URLs) y DLC (JDownloader). No acumula nada en
+memoria, así que el uso de memoria no depende del tamaño de la playlist.
+Con compress=True cada archivo se escribe comprimido con gzip (.gz).
+
+Uso:
+    with PlaylistExporter(default_paths("playlist"), formats=("json", "csv")) as exporter:
+        for video in videos:
+            exporter.write(video)
+"""
+
+import base64
+import gzip
+import json
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+FORMATS = ('json', 'ndjson', 'csv', 'txt', 'dlc')
+# Campos de cada video de los extractores, en orden: columnas del CSV por defecto
+VIDEO_FIELDS = ('index', 'title', 'video_id', 'url', 'url_simple', 'duration', 'extracted_at')
+
+DLC_HEADER = """<dlc>
+<header>
+<generator>{generator}</generator>
+<tribute>Created with Python + Selenium</tribute>
+</header>
+<content>
+<package name="{package}" passwords="" comment="">
+"""
+DLC_FOOTER = """</package>
+</content>
+</dlc>"""
+
+
+def default_paths(base: str) -> Dict[str, str]:
+    """Nombres de archivo habituales para cada formato a partir de un nombre base"""
+    return {
+        'json': f"{base}.json",
+        'ndjson': f"{base}.ndjson",
+        'csv': f"{base}.csv",
+        'txt': f"{base}_urls.txt",
+        'dlc': f"{base}.dlc",
+    }
+
+
+def _open(path: str, compress: bool):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+_SCALARS = (str, int, float, bool, type(None))
+_dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _indented_json(value, indent: int) -> str:
+    """json.dumps(value, indent=2) desplazado `indent` espacios, como lo anida json.dump"""
+    if isinstance(value, dict) and value and all(isinstance(v, _SCALARS) for v in value.values()):
+        # Caso típico (un video): el encoder en C es mucho más rápido que el
+        # de Python que usa json.dumps con indent
+        pad = ' ' * (indent + 2)
+        fields = f',\n{pad}'.join(f'{_dumps(str(k))}: {_dumps(v)}' for k, v in value.items())
+        return f'{{\n{pad}{fields}\n{" " * indent}}}'
+    return json.dumps(value, ensure_ascii=False, indent=2).replace('\n', '\n' + ' ' * indent)
+
+
+class JsonWriter:
+    """
+    {"<campos de header>", "videos": [...], "<campos de footer>"} con indent=2
+
+    El resultado es idéntico a json.dump(..., indent=2) del documento completo.
+    footer recibe el número de videos escritos (se conoce al final).
+    """
+
+    def __init__(self, f, header: Optional[Dict] = None,
+                 footer: Optional[Callable[[int], Dict]] = None):
+        self.f = f
+        self.footer = footer
+        self.count = 0
+        f.write('{\n')
+        for key, value in (header or {}).items():
+            f.write(f'  {json.dumps(key, ensure_ascii=False)}: {_indented_json(value, 2)},\n')
+        f.write('  "videos": [')
+
+    def write(self, video: Dict):
+        self.f.write((',\n    ' if self.count else '\n    ') + _indented_json(video, 4))
+        self.count += 1
+
+    def close(self):
+        self.f.write('\n  ]' if self.count else ']')
+        for key, value in (self.footer(self.count) if self.footer else {}).items():
+            self.f.write(f',\n  {json.dumps(key, ensure_ascii=False)}: {_indented_json(value, 2)}')
+        self.f.write('\n}')
+
+
+class NdjsonWriter:
+    """Un video por línea en JSON"""
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, video: Dict):
+        self.f.write(_dumps(video) + '\n')
+
+    def close(self):
+        pass
+
+
+def _csv_value(value, quote: bool = False) -> str:
+    """Campo CSV con las reglas de csv.QUOTE_MINIMAL, o siempre entre comillas con `quote`"""
+    text = '' if value is None else str(value)
+    if quote or ',' in text or '"' in text or '\n' in text or '\r' in text:
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+class CsvWriter:
+    """
+    CSV con encabezado y columnas fijas
+
+    fields: pares (encabezado, clave del video); por defecto, VIDEO_FIELDS.
+    Una clave que falta en un video queda vacía; las que no están en
+    `fields` no se escriben.
+    quoted: Claves que van siempre entre comillas (el resto, solo si hace falta)
+    lineterminator: Fin de línea ('\r\n', como el módulo csv)
+    """
+
+    def __init__(self, f, fields: Optional[Sequence[Tuple[str, str]]] = None,
+                 quoted: Iterable[str] = (), lineterminator: str = '\r\n'):
+        self.f = f
+        self.fields = list(fields) if fields else [(key, key) for key in VIDEO_FIELDS]
+        self.quoted = [key in set(quoted) for _, key in self.fields]
+        self.lineterminator = lineterminator
+        f.write(','.join(_csv_value(header) for header, _ in self.fields) + lineterminator)
+
+    def write(self, video: Dict):
+        self.f.write(','.join(_csv_value(video.get(key), quote)
+                              for (_, key), quote in zip(self.fields, self.quoted))
+                     + self.lineterminator)
+
+    def close(self):
+        pass
+
+
+class TxtWriter:
+    """Solo las URLs, una por línea"""
+
+    def __init__(self, f, url_key: str = 'url_simple'):
+        self.f = f
+        self.url_key = url_key
+
+    def write(self, video: Dict):
+        self.f.write(f"{video[self.url_key]}\n")
+
+    def close(self):
+        pass
+
+
+class DlcWriter:
+    """Contenedor DLC de JDownloader con las URLs en base64"""
+
+    def __init__(self, f, package: str = "YouTube Playlist",
+                 generator: str = "YouTube Playlist Extractor", url_key: str = 'url_simple'):
+        self.f = f
+        self.url_key = url_key
+        f.write(DLC_HEADER.format(generator=generator, package=package))
+
+    def write(self, video: Dict):
+        url_encoded = base64.b64encode(video[self.url_key].encode()).decode()
+        self.f.write(f'<file><url>{url_encoded}</url></file>\n')
+
+    def close(self):
+        self.f.write(DLC_FOOTER)
+
+
+class PlaylistExporter:
+    """Escribe cada video en todos los formatos pedidos en una sola pasada"""
+
+    def __init__(self, paths: Dict[str, str], formats: Iterable[str] = FORMATS,
+                 compress: bool = False, json_header: Optional[Dict] = None,
+                 json_footer: Optional[Callable[[int], Dict]] = None,
+                 csv_fields: Optional[Sequence[Tuple[str, str]]] = None,
+                 csv_quoted: Iterable[str] = (), csv_lineterminator: str = '\r\n',
+                 dlc_package: str = "YouTube Playlist",
+                 dlc_generator: str = "YouTube Playlist Extractor",
+                 url_key: str = 'url_simple'):
+        """
+        Args:
+            paths: Archivo de cada formato (ver default_paths)
+            formats: Formatos a escribir, de FORMATS
+            compress: Comprimir con gzip (agrega .gz a cada archivo)
+            json_header: Campos del JSON antes de "videos"
+            json_footer: Función (número de videos) -> campos del JSON después de "videos"
+            csv_fields: Columnas del CSV como pares (encabezado, clave); por
+                defecto, VIDEO_FIELDS
+            csv_quoted: Claves que el CSV pone siempre entre comillas
+            csv_lineterminator: Fin de línea del CSV
+            dlc_package: Nombre del paquete en el DLC
+            dlc_generator: Generador que figura en el DLC
+            url_key: Campo con la URL para TXT y DLC
+        """
+        formats = set(formats)
+        self.formats = [fmt for fmt in FORMATS if fmt in formats]
+        unknown = formats - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Formatos desconocidos: {', '.join(sorted(unknown))}")
+        self.paths = {fmt: paths[fmt] + ('.gz' if compress else '') for fmt in self.formats}
+        self.count = 0
+        self._files = []
+        self._writers = []
+        try:
+            for fmt in self.formats:
+                f = _open(self.paths[fmt], compress)
+                self._files.append(f)
+                if fmt == 'json':
+                    writer = JsonWriter(f, json_header, json_footer)
+                elif fmt == 'ndjson':
+                    writer = NdjsonWriter(f)
+                elif fmt == 'csv':
+                    writer = CsvWriter(f, csv_fields, csv_quoted, csv_lineterminator)
+                elif fmt == 'txt':
+                    writer = TxtWriter(f, url_key)
+                else:
+                    writer = DlcWriter(f, dlc_package, dlc_generator, url_key)
+                self._writers.append(writer)
+        except Exception:
+            self._close_files()
+            raise
+
+    def write(self, video: Dict):
+        for writer in self._writers:
+            writer.write(video)
+        self.count += 1
+
+    def write_all(self, videos: Iterable[Dict]) -> int:
+        for video in videos:
+            self.write(video)
+        return self.count
+
+    def close(self) -> Dict[str, str]:
+        """Termina todos los archivos y devuelve {formato: archivo}"""
+        writers, self._writers = self._writers, []
+        try:
+            for writer in writers:
+                writer.close()
+        finally:
+            self._close_files()
+        return dict(self.paths)
+
+    def _close_files(self):
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_videos(videos: Iterable[Dict], base: str, formats: Iterable[str] = FORMATS,
+                  compress: bool = False, **options) -> Dict[str, str]:
+    """
+    Exporta videos con default_paths(base) en una sola pasada
+
+    Returns:
+        {formato: archivo escrito}
+    """
+    with PlaylistExporter(default_paths(base), formats, compress, **options) as exporter:
+        exporter.write_all(videos)
+    return dict(exporter.paths)
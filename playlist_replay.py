@@ -0,0 +1,308 @@
+"""
+Grabación y reproducción de las respuestas de una extracción (--record / --replay)
+
+Las playlists reales cambian entre corridas, y eso hace difícil reproducir
+una regresión de rendimiento o un error de parseo. PlaylistRecorder guarda en
+una carpeta el HTML de la playlist y cada respuesta de continuación (más los
+scripts y estilos del mismo origen, que la página necesita para hacer
+scroll), con los bytes tal como llegaron:
+
+    DIR/recording.json      URL, fecha y una entrada por respuesta
+    DIR/bodies/0001.html    cuerpo de cada respuesta
+
+Con Selenium las respuestas se leen del log 'performance' de ChromeDriver
+(eventos Network.*) y Network.getResponseBody; con el motor HTTP, de un hook
+de la sesión de requests.
+
+ReplayServer sirve esa carpeta desde 127.0.0.1: la página por su ruta y
+query, y cada POST a /youtubei/v1/browse por su token de continuación. Lo
+que no está grabado responde 404 (y se cuenta en `misses`), y Chrome se
+abre con OFFLINE_ARGUMENT para no resolver ningún otro host: la corrida no
+toca la red y recibe siempre los mismos bytes, así sirve como línea base de
+tiempos en CI. Por eso con Selenium solo sirve el modo fetch, que pide las
+continuaciones con rutas relativas: al hacer scroll, los scripts de YouTube
+piden URLs absolutas de youtube.com que no llegan al servidor local.
+
+Uso:
+    with ReplayServer("grabacion/") as server:
+        videos = extractor.extract(server.playlist_url())
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "recording.json"
+# Chrome no resuelve ningún host salvo el servidor de reproducción
+OFFLINE_ARGUMENT = "--host-resolver-rules=MAP * ~NOTFOUND, EXCLUDE 127.0.0.1"
+# Tipos de recurso (Network.ResourceType) que se graban con Selenium
+RECORDED_TYPES = ("Document", "Script", "Stylesheet", "XHR", "Fetch")
+# Las URLs locales llevan "youtube.com" en la ruta para pasar la validación
+# de los extractores (como benchmarks/fixture_server.py)
+_LOCAL_PREFIX = "/youtube.com"
+
+Key = Tuple[str, str, Optional[str]]
+
+
+def _original_path(path: str) -> str:
+    """Ruta sin el prefijo de las URLs locales"""
+    return path[len(_LOCAL_PREFIX):] if path.startswith(_LOCAL_PREFIX + "/") else path
+
+
+def request_key(method: str, url: str, body: Optional[bytes] = None) -> Key:
+    """
+    Clave de una petición: método, ruta con query y token de continuación
+
+    Los POST se identifican solo por el token: el resto del cuerpo (contexto
+    del cliente, marcas de tiempo) cambia entre corridas.
+    """
+    parsed = urlparse(url)
+    path = _original_path(parsed.path)
+    if method == "POST":
+        token = None
+        try:
+            token = json.loads(body or b"{}").get("continuation")
+        except (ValueError, AttributeError):
+            pass
+        return method, path, token
+    return method, path + (f"?{parsed.query}" if parsed.query else ""), None
+
+
+class PlaylistRecorder:
+    """Guarda las respuestas de una extracción en una carpeta"""
+
+    def __init__(self, directory: str, url: str):
+        """
+        Args:
+            directory: Carpeta de la grabación (se crea si no existe)
+            url: URL de la playlist; solo se graban respuestas de su origen
+        """
+        self.directory = directory
+        self.url = url
+        parsed = urlparse(url)
+        self.origin = f"{parsed.scheme}://{parsed.netloc}"
+        self.entries: List[Dict] = []
+        self._keys = set()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "bodies"), exist_ok=True)
+
+    def add(self, method: str, url: str, status: int, content_type: str, body: bytes,
+            request_body: Optional[bytes] = None) -> bool:
+        """
+        Graba una respuesta (la primera de cada clave; las repetidas se ignoran)
+
+        Returns:
+            True si se grabó
+        """
+        if not url.startswith(self.origin):
+            return False
+        key = request_key(method, url, request_body)
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            number = len(self.entries) + 1
+            extension = mimetypes.guess_extension(content_type.split(";")[0].strip()) or ".bin"
+            name = f"bodies/{number:04d}{extension}"
+            self.entries.append({
+                "method": method,
+                "path": key[1],
+                "continuation": key[2],
+                "status": status,
+                "content_type": content_type,
+                "file": name,
+                "size": len(body),
+                "sha256": hashlib.sha256(body).hexdigest(),
+            })
+        with open(os.path.join(self.directory, name), "wb") as f:
+            f.write(body)
+        return True
+
+    def record_response(self, response, *args, **kwargs):
+        """Hook 'response' de requests.Session (motor HTTP)"""
+        request = response.request
+        body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+        self.add(request.method, response.url, response.status_code,
+                 response.headers.get("Content-Type", ""), response.content, body)
+
+    def save(self) -> str:
+        """Escribe recording.json; devuelve su ruta"""
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "url": self.url,
+                "recorded_at": datetime.now().isoformat(),
+                "entries": self.entries,
+            }, f, ensure_ascii=False, indent=2)
+        logger.info(f"💾 Grabación guardada: {self.directory} ({len(self.entries)} respuestas)")
+        return path
+
+
+def enable_network_log(options):
+    """Pide a ChromeDriver los eventos Network.* en el log 'performance'"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def enlarge_network_buffers(driver, total_mb: int = 512, resource_mb: int = 64):
+    """Buffers de cuerpos más grandes, para que Chrome no descarte las respuestas antes de leerlas"""
+    driver.execute_cdp_cmd("Network.enable", {
+        "maxTotalBufferSize": total_mb * 1024 * 1024,
+        "maxResourceBufferSize": resource_mb * 1024 * 1024,
+    })
+
+
+def record_network(driver, recorder: PlaylistRecorder) -> int:
+    """
+    Graba las respuestas terminadas desde la última llamada (vacía el log)
+
+    Returns:
+        Respuestas grabadas
+    """
+    requests, responses, finished = {}, {}, []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            requests[params["requestId"]] = params["request"]
+        elif method == "Network.responseReceived" and params.get("type") in RECORDED_TYPES:
+            responses[params["requestId"]] = params["response"]
+        elif method == "Network.loadingFinished":
+            finished.append(params["requestId"])
+
+    recorded = 0
+    for request_id in finished:
+        response = responses.get(request_id)
+        if response is None or not response["url"].startswith(recorder.origin):
+            continue
+        request = requests.get(request_id, {"method": "GET"})
+        post_data = request.get("postData")
+        if post_data is None and request.get("hasPostData"):
+            post_data = driver.execute_cdp_cmd("Network.getRequestPostData",
+                                               {"requestId": request_id}).get("postData")
+        try:
+            content = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        except Exception as e:
+            logger.warning(f"⚠️  Sin cuerpo para {response['url']}: {e}")
+            continue
+        if content.get("base64Encoded"):
+            body = base64.b64decode(content["body"])
+        else:
+            body = content["body"].encode("utf-8")
+        headers = {name.lower(): value for name, value in (response.get("headers") or {}).items()}
+        content_type = headers.get("content-type") or response.get("mimeType", "")
+        if recorder.add(request.get("method", "GET"), response["url"], response.get("status", 200),
+                        content_type, body, post_data.encode("utf-8") if post_data else None):
+            recorded += 1
+    return recorded
+
+
+class ReplayServer:
+    """Sirve una grabación de PlaylistRecorder desde 127.0.0.1"""
+
+    def __init__(self, directory: str, port: int = 0):
+        """
+        Args:
+            directory: Carpeta con recording.json
+            port: Puerto (0 = elegir uno libre)
+
+        Raises:
+            FileNotFoundError: Si la carpeta no tiene recording.json
+        """
+        with open(os.path.join(directory, MANIFEST), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.directory = directory
+        self.url = manifest["url"]
+        parsed = urlparse(self.url)
+        self.origin = f"{parsed.scheme}://{parsed.netloc}"
+        # Todo en memoria: leer del disco en cada petición agregaría ruido a los tiempos
+        self.responses: Dict[Key, Tuple[int, str, bytes]] = {}
+        for entry in manifest["entries"]:
+            with open(os.path.join(directory, entry["file"]), "rb") as f:
+                body = f.read()
+            key = (entry["method"], entry["path"], entry["continuation"])
+            self.responses[key] = (entry["status"], entry["content_type"], body)
+        self.served = 0
+        self.misses: List[str] = []
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def playlist_url(self, url: Optional[str] = None) -> str:
+        """URL local de la playlist grabada (o de `url`, del mismo origen)"""
+        parsed = urlparse(url or self.url)
+        query = f"?{parsed.query}" if parsed.query else ""
+        return f"{self.base_url}{_LOCAL_PREFIX}{_original_path(parsed.path)}{query}"
+
+    def original_url(self, url: str) -> str:
+        """Cambia el origen local de `url` por el de la grabación"""
+        if url and url.startswith(self.base_url):
+            return self.origin + _original_path(url[len(self.base_url):])
+        return url
+
+    def start(self) -> "ReplayServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"📼 Reproduciendo {self.directory} ({len(self.responses)} respuestas) en {self.base_url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.misses:
+            logger.warning(f"⚠️  {len(self.misses)} peticiones sin grabación (404), p. ej. {self.misses[0]}")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self._reply(request_key("GET", self.path))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self._reply(request_key("POST", self.path, self.rfile.read(length)))
+
+            def _reply(self, key: Key):
+                found = server.responses.get(key)
+                with server._lock:
+                    if found:
+                        server.served += 1
+                    else:
+                        server.misses.append(" ".join(part for part in key if part))
+                status, content_type, body = found or (404, "text/plain", b"not recorded")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
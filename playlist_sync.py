@@ -0,0 +1,159 @@
+"""
+Re-sincronización incremental contra una extracción anterior
+
+Las playlists grandes se vuelven a extraer a diario aunque solo cambien unos
+pocos videos. PlaylistResync lleva la cuenta de los IDs ya conocidos (del
+JSON de save_json de la vez anterior) mientras se cargan videos y decide
+cuándo parar:
+
+- 'total': los videos cargados más los que seguían al último video conocido
+  en la extracción anterior suman el total que reporta la cabecera de la
+  playlist, o sea que el resto de la lista es la de la vez anterior. Solo
+  si ya aparecieron todos los videos anteriores hasta ese punto; si no, una
+  eliminación podría compensar un agregado y el total cuadraría por azar
+- 'known_run': aparecieron `known_run` videos conocidos seguidos (la
+  cabecera no trae el total o no cuadra)
+
+El resto de la lista se completa con la extracción anterior (desde el
+último video conocido cargado) y se calcula el delta: agregados, eliminados
+y reordenados.
+"""
+
+import json
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def load_previous(filename: str) -> List[Dict]:
+    """Videos de un JSON generado por save_json (o una lista de videos)"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    videos = data['videos'] if isinstance(data, dict) else data
+    return [video for video in videos if video.get('video_id')]
+
+
+def stable_positions(sequence: List[int]) -> set:
+    """
+    Posiciones de `sequence` que forman su subsecuencia creciente más larga
+
+    Los videos en esas posiciones conservan su orden relativo; los demás
+    son los que se movieron.
+    """
+    tails = []       # tails[k]: posición del menor final de una subsecuencia de largo k+1
+    tail_values = []
+    previous = [-1] * len(sequence)
+    for position, value in enumerate(sequence):
+        k = bisect_left(tail_values, value)
+        if k:
+            previous[position] = tails[k - 1]
+        if k == len(tails):
+            tails.append(position)
+            tail_values.append(value)
+        else:
+            tails[k] = position
+            tail_values[k] = value
+
+    stable = set()
+    position = tails[-1] if tails else -1
+    while position >= 0:
+        stable.add(position)
+        position = previous[position]
+    return stable
+
+
+class PlaylistResync:
+    """Estado de una re-sincronización contra la extracción anterior"""
+
+    def __init__(self, previous: List[Dict], known_run: int = 100):
+        """
+        Args:
+            previous: Videos de la extracción anterior, en orden
+            known_run: Videos conocidos seguidos tras los que se deja de cargar
+        """
+        self.previous = previous
+        self.known_run = known_run
+        self.previous_position = {video['video_id']: pos for pos, video in enumerate(previous)}
+        self.seen = set()
+        self.run = 0  # Videos conocidos seguidos al final de lo cargado
+        self.anchor = -1  # Posición anterior del último video cargado, si era conocido
+        self.stop_reason = None
+
+    def observe(self, video_id: str):
+        """Registra un video cargado (llamar una vez por video único)"""
+        self.seen.add(video_id)
+        if video_id in self.previous_position:
+            self.run += 1
+            self.anchor = self.previous_position[video_id]
+        else:
+            self.run = 0
+
+    def should_stop(self, reported_total: Optional[int]) -> bool:
+        """True si ya no hace falta seguir cargando la playlist"""
+        if self.stop_reason:
+            return True
+        if self.run == 0:
+            return False
+        tail = len(self.tail())
+        if tail == 0:
+            # Lo que falta no está en la extracción anterior: hay que cargarlo
+            return False
+        covered = all(video['video_id'] in self.seen for video in self.previous[:self.anchor + 1])
+        if reported_total and covered and len(self.seen) + tail == reported_total:
+            self.stop_reason = 'total'
+        elif self.known_run and self.run >= self.known_run:
+            self.stop_reason = 'known_run'
+        return self.stop_reason is not None
+
+    def tail(self) -> List[Dict]:
+        """Videos anteriores que seguían al último video conocido cargado"""
+        return [video for video in self.previous[self.anchor + 1:]
+                if video['video_id'] not in self.seen]
+
+    def merge(self, videos: List[Dict]) -> List[Dict]:
+        """
+        Lista completa: los videos cargados y, si se paró antes del final,
+        los que seguían al último video conocido, en su orden anterior
+        """
+        merged = list(videos)
+        if self.stop_reason:
+            for video in self.tail():
+                merged.append(dict(video, index=len(merged) + 1))
+        return merged
+
+    def delta(self, merged: List[Dict], reported_total: Optional[int] = None) -> Dict:
+        """Videos agregados, eliminados y reordenados respecto a la extracción anterior"""
+        merged_ids = {video['video_id'] for video in merged}
+        added = [video for video in merged if video['video_id'] not in self.previous_position]
+        removed = [video for video in self.previous if video['video_id'] not in merged_ids]
+
+        common = [video for video in merged if video['video_id'] in self.previous_position]
+        old_positions = [self.previous_position[video['video_id']] for video in common]
+        stable = stable_positions(old_positions)
+        new_index = {video['video_id']: pos for pos, video in enumerate(merged, 1)}
+        reordered = [
+            {
+                "video_id": video['video_id'],
+                "title": video.get('title', ''),
+                "old_index": old_positions[pos] + 1,
+                "new_index": new_index[video['video_id']],
+            }
+            for pos, video in enumerate(common) if pos not in stable
+        ]
+
+        return {
+            "metadata": {
+                "extraction_date": datetime.now().isoformat(),
+                "previous_total": len(self.previous),
+                "total_videos": len(merged),
+                "reported_total": reported_total,
+                "loaded": len(self.seen),
+                "assumed_unchanged": len(merged) - len(self.seen),
+                "stop_reason": self.stop_reason or 'end',
+                # Con 'known_run' no se puede saber si faltan videos del resto de la lista
+                "complete": self.stop_reason != 'known_run',
+            },
+            "added": added,
+            "removed": removed,
+            "reordered": reordered,
+        }
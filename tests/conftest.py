@@ -0,0 +1,58 @@
+"""
+Configuración común de las pruebas
+
+Las pruebas usan el servidor de fixtures de benchmarks/ como stand-in de
+YouTube (y de un CDN de archivos), así que benchmarks/ va en sys.path junto
+con la raíz del repositorio. backend/ va al final, para importar sus módulos
+propios (jobs, driver_pool) sin tapar los de la raíz que tienen copia allí.
+Las que necesitan un Chrome real llevan la marca `chrome` y se saltan si no
+hay ninguno instalado.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+BACKEND_DIR = os.path.join(ROOT_DIR, "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+_cwd = None
+_workdir = None
+
+
+def chrome_available() -> bool:
+    return any(shutil.which(binary) for binary in CHROME_BINARIES)
+
+
+def pytest_configure(config):
+    global _cwd, _workdir
+    config.addinivalue_line("markers", "chrome: necesita Chrome instalado")
+    # extract_playlist_advanced crea su .log en el directorio actual al importarse
+    _cwd = os.getcwd()
+    _workdir = tempfile.mkdtemp(prefix="playlist-tests-")
+    os.chdir(_workdir)
+
+
+def pytest_unconfigure(config):
+    if _cwd:
+        os.chdir(_cwd)
+        shutil.rmtree(_workdir, ignore_errors=True)
+
+
+def pytest_collection_modifyitems(config, items):
+    if chrome_available():
+        return
+    skip = pytest.mark.skip(reason="Chrome no está instalado")
+    for item in items:
+        if "chrome" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,72 @@
+"""
+Backend con el motor HTTP contra el servidor de fixtures: contadores de la
+caché de resultados (/extract, /jobs, /cache/stats) y sesión HTTP por hilo
+"""
+
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+# Sin pool: importar el backend no arranca ningún Chrome
+os.environ.setdefault("DRIVER_POOL_SIZE", "0")
+
+import app as backend  # noqa: E402
+from cache import ResultCache  # noqa: E402
+from fixture_server import FixtureServer  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(backend, "result_cache", ResultCache())
+    return backend.app.test_client()
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(total=150, batch=100) as server:
+        yield server
+
+
+def stats(client) -> dict:
+    return client.get('/cache/stats').get_json()
+
+
+def test_cold_extract_counts_one_miss(client, server):
+    response = client.post('/extract', json={"url": server.playlist_url(), "engine": "http"})
+    assert response.status_code == 200
+    assert response.headers['X-Cache'] == 'MISS'
+    assert (stats(client)["hits"], stats(client)["misses"]) == (0, 1)
+
+    # Un 304 con el ETag es un hit
+    again = client.post('/extract', json={"url": server.playlist_url(), "engine": "http"},
+                        headers={"If-None-Match": response.headers['ETag']})
+    assert again.status_code == 304
+    assert stats(client)["hit_rate"] == 0.5
+
+
+def test_job_counts_its_own_lookup(client, server):
+    response = client.post('/jobs', json={"url": server.playlist_url(), "engine": "http"})
+    assert response.status_code == 202
+    assert backend.job_manager.get(response.get_json()["job_id"]).wait(10)
+    assert (stats(client)["hits"], stats(client)["misses"]) == (0, 1)
+
+    # El segundo job sale de la caché
+    response = client.post('/jobs', json={"url": server.playlist_url(), "engine": "http"})
+    assert backend.job_manager.get(response.get_json()["job_id"]).wait(10)
+    assert (stats(client)["hits"], stats(client)["misses"]) == (1, 1)
+
+
+def test_http_client_is_per_thread():
+    extractor = backend.PlaylistHTTPExtractor()
+    clients = []
+    thread = threading.Thread(target=lambda: clients.append(backend.PlaylistHTTPExtractor().client))
+    thread.start()
+    thread.join()
+    # Cada hilo reutiliza su propia sesión entre extracciones
+    assert extractor.client is backend.PlaylistHTTPExtractor().client
+    assert clients[0] is not extractor.client
+    assert clients[0].session is not extractor.client.session
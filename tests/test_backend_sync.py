@@ -0,0 +1,32 @@
+"""
+Copias de módulos en backend/
+
+El backend se despliega solo con la carpeta backend/ (render.yaml, Procfile),
+así que los módulos que comparte con los scripts están copiados allí. Esta
+prueba falla en cuanto una copia deja de ser idéntica a la de la raíz.
+"""
+
+import os
+
+import pytest
+
+from conftest import BACKEND_DIR, ROOT_DIR
+
+SHARED = sorted(name for name in os.listdir(BACKEND_DIR)
+                if name.endswith(".py") and os.path.isfile(os.path.join(ROOT_DIR, name)))
+
+
+def read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_known_modules_are_shared():
+    assert {"browser_profile.py", "phase_timer.py", "playlist_catalog.py", "playlist_dom.py",
+            "youtube_http.py"} <= set(SHARED)
+
+
+@pytest.mark.parametrize("name", SHARED)
+def test_backend_copy_is_identical(name):
+    assert read(os.path.join(BACKEND_DIR, name)) == read(os.path.join(ROOT_DIR, name)), (
+        f"backend/{name} difiere de {name}: copiar el cambio a las dos")
@@ -0,0 +1,37 @@
+"""
+Modo batch (run_batch) con el motor HTTP contra el servidor de fixtures
+"""
+
+import json
+import os
+
+from extract_playlist_advanced import run_batch
+from fixture_server import FixtureServer
+
+
+def test_batch_writes_every_playlist_and_manifest(tmp_path):
+    output_dir = str(tmp_path / "out")
+    with FixtureServer(total=150, batch=100) as server:
+        urls = [server.playlist_url("PLA"), server.playlist_url("PLB")]
+        manifest = run_batch(urls, workers=2, output_dir=output_dir, engine='http',
+                             options={"max_retries": 0}, export={"formats": ["json"]})
+    assert (manifest["metadata"]["succeeded"], manifest["metadata"]["failed"]) == (2, 0)
+    assert [entry["playlist_id"] for entry in manifest["playlists"]] == ["PLA", "PLB"]
+    assert all(entry["total_videos"] == 150 for entry in manifest["playlists"])
+    assert os.path.exists(os.path.join(output_dir, "PLA.json"))
+
+
+def test_save_error_fails_only_that_playlist(tmp_path):
+    output_dir = str(tmp_path / "out")
+    # Un directorio en lugar de un archivo: SQLite no puede abrir el catálogo
+    catalog = str(tmp_path)
+    with FixtureServer(total=150, batch=100) as server:
+        urls = [server.playlist_url("PLA"), server.playlist_url("PLB")]
+        manifest = run_batch(urls, workers=1, output_dir=output_dir, engine='http',
+                             options={"max_retries": 0}, export={"formats": ["json"]}, catalog=catalog)
+    assert (manifest["metadata"]["succeeded"], manifest["metadata"]["failed"]) == (0, 2)
+    for entry in manifest["playlists"]:
+        assert entry["status"] == "failed"
+        assert entry["errors"][-1].startswith("Guardado: ")
+    with open(os.path.join(output_dir, "manifest.json"), encoding="utf-8") as f:
+        assert json.load(f)["metadata"]["total_playlists"] == 2
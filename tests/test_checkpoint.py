@@ -0,0 +1,102 @@
+"""
+Checkpoints de una extracción (playlist_checkpoint) y --resume desde ellos
+"""
+
+import json
+
+import pytest
+
+from extract_playlist_advanced import YouTubePlaylistExtractor
+from playlist_checkpoint import CheckpointWriter, load_checkpoint
+
+URL = "https://www.youtube.com/playlist?list=PLCHECK"
+
+
+def video(index: int) -> dict:
+    return {"index": index, "video_id": f"vid{index:08d}", "title": f"#{index}"}
+
+
+def records(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_writes_batches_and_loads_them_back(tmp_path):
+    path = str(tmp_path / "checkpoint.ndjson")
+    writer = CheckpointWriter(path, URL, "PLCHECK", every=100, interval=3600)
+    for index in range(1, 251):
+        writer.add(video(index))
+    # Dos lotes completos; los últimos 50 siguen en memoria
+    assert [r["type"] for r in records(path)] == ["start", "videos", "videos"]
+    writer.close(total_videos=250)
+    assert [r["type"] for r in records(path)] == ["start", "videos", "videos", "videos", "done"]
+
+    state = load_checkpoint(path)
+    assert [v["index"] for v in state["videos"]] == list(range(1, 251))
+    assert (state["url"], state["playlist_id"], state["last_index"], state["done"]) == (URL, "PLCHECK", 250, True)
+
+
+def test_interval_flushes_small_batches(tmp_path):
+    path = str(tmp_path / "checkpoint.ndjson")
+    writer = CheckpointWriter(path, URL, every=1000, interval=0)
+    writer.add(video(1))
+    writer.add(video(2))
+    assert [r.get("last_index") for r in records(path)] == [None, 1, 2]
+    writer.close()
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / "checkpoint.ndjson")
+    writer = CheckpointWriter(path, URL, "PLCHECK", every=2)
+    for index in range(1, 5):
+        writer.add(video(index))
+    writer.close()
+    # La caída cortó el último lote a mitad de la línea
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "videos", "videos": [{"index": 5, "video_id": "vid0000')
+    state = load_checkpoint(path)
+    assert [v["index"] for v in state["videos"]] == [1, 2, 3, 4]
+    assert state["last_index"] == 4
+    assert state["done"] is False
+
+
+def test_missing_checkpoint_is_none(tmp_path):
+    assert load_checkpoint(str(tmp_path / "nada.ndjson")) is None
+
+
+def test_resume_continues_from_last_index_without_duplicates(tmp_path):
+    path = str(tmp_path / "checkpoint.ndjson")
+
+    # Primera corrida: se cae tras guardar 200 de 250 videos cosechados
+    first = YouTubePlaylistExtractor()
+    first.enable_checkpoint(path, URL, every=100)
+    for index in range(1, 251):
+        first._add_video(index, f"#{index}", "", f"vid{index:08d}", "")
+    assert first.checkpoint.saved == 200
+    first.checkpoint._file.close()  # Sin flush: los 50 pendientes se pierden
+
+    # Segunda corrida: retoma desde la posición 200
+    second = YouTubePlaylistExtractor()
+    assert second.resume_from(path, URL) is False
+    assert len(second.videos) == 200
+    assert second.resume_index == 200
+    second.enable_checkpoint(path, URL, every=100)
+    assert second.checkpoint.last_index == 200
+    # La página vuelve a mostrar algunos videos ya guardados antes de los nuevos
+    for index in range(190, 301):
+        second._add_video(index, f"#{index}", "", f"vid{index:08d}", "")
+    second.checkpoint.close(total_videos=len(second.videos))
+
+    assert [v["index"] for v in second.videos] == list(range(1, 301))
+    start = [r for r in records(path) if r["type"] == "start"]
+    assert [r["resume_from"] for r in start] == [0, 200]
+    state = load_checkpoint(path)
+    assert [v["index"] for v in state["videos"]] == list(range(1, 301))
+    assert (state["last_index"], state["done"]) == (300, True)
+
+
+def test_resume_rejects_checkpoint_of_other_playlist(tmp_path):
+    path = str(tmp_path / "checkpoint.ndjson")
+    CheckpointWriter(path, URL, "PLCHECK").close()
+    with pytest.raises(ValueError):
+        YouTubePlaylistExtractor().resume_from(path, "https://www.youtube.com/playlist?list=PLOTHER")
@@ -0,0 +1,190 @@
+"""
+Orquestador de descargas (playlist_download) contra /files/ del servidor de fixtures
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+import requests
+
+from fixture_server import FixtureServer
+from playlist_download import (
+    DownloadOrchestrator, DownloadState, HTTPDownloader, TokenBucket, load_items, output_name,
+    parse_rate
+)
+
+FILE_SIZE = 256 * 1024
+
+
+def items(count: int) -> list:
+    return [{"video_id": f"vid{n:08d}", "url": f"https://www.youtube.com/watch?v=vid{n:08d}",
+             "title": f"Video #{n}", "index": n} for n in range(1, count + 1)]
+
+
+@pytest.fixture
+def server():
+    with FixtureServer(file_size=FILE_SIZE) as server:
+        yield server
+
+
+def read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_http_downloader_writes_whole_file(server, tmp_path):
+    item = items(1)[0]
+    path = HTTPDownloader(server.file_url()).download(item, str(tmp_path))
+    assert path == os.path.join(str(tmp_path), output_name(item) + ".mp4")
+    assert read(path) == server.file_body()
+    assert not os.path.exists(os.path.join(str(tmp_path), output_name(item) + ".part"))
+
+
+def test_http_downloader_resumes_part_with_range(server, tmp_path):
+    item = items(1)[0]
+    partial = os.path.join(str(tmp_path), output_name(item) + ".part")
+    # Un prefijo que no es el del servidor: si se bajara todo de nuevo, no quedaría
+    with open(partial, "wb") as f:
+        f.write(b"X" * 100_000)
+    path = HTTPDownloader(server.file_url()).download(item, str(tmp_path))
+    assert read(path) == b"X" * 100_000 + server.file_body()[100_000:]
+
+
+def test_http_downloader_drops_part_on_416(server, tmp_path):
+    item = items(1)[0]
+    partial = os.path.join(str(tmp_path), output_name(item) + ".part")
+    with open(partial, "wb") as f:
+        f.write(b"X" * (FILE_SIZE + 10))
+    with pytest.raises(requests.HTTPError):
+        HTTPDownloader(server.file_url()).download(item, str(tmp_path))
+    assert not os.path.exists(partial)
+
+    # El reintento del orquestador baja el archivo completo
+    with open(partial, "wb") as f:
+        f.write(b"X" * (FILE_SIZE + 10))
+    summary = DownloadOrchestrator(HTTPDownloader(server.file_url()), str(tmp_path),
+                                   retries=1, backoff=0).run([item])
+    assert summary["downloaded"] == 1
+    assert read(os.path.join(str(tmp_path), output_name(item) + ".mp4")) == server.file_body()
+
+
+def test_rerun_skips_completed_videos(server, tmp_path):
+    downloader = HTTPDownloader(server.file_url())
+    first = DownloadOrchestrator(downloader, str(tmp_path), workers=3).run(items(5))
+    assert (first["downloaded"], first["skipped"], first["failed"]) == (5, 0, 0)
+    assert first["bytes"] == 5 * FILE_SIZE
+    requests_before = sum(server.file_requests.values())
+
+    second = DownloadOrchestrator(downloader, str(tmp_path), workers=3).run(items(5))
+    assert (second["downloaded"], second["skipped"]) == (0, 5)
+    assert sum(server.file_requests.values()) == requests_before
+
+    # Un archivo borrado a mano deja de contar como descargado
+    os.remove(os.path.join(str(tmp_path), output_name(items(5)[2]) + ".mp4"))
+    third = DownloadOrchestrator(downloader, str(tmp_path), workers=3).run(items(5))
+    assert (third["downloaded"], third["skipped"]) == (1, 4)
+
+
+def test_state_ignores_truncated_last_line(tmp_path):
+    path = str(tmp_path / "state.ndjson")
+    state = DownloadState(path)
+    target = tmp_path / "a.mp4"
+    target.write_bytes(b"x")
+    state.record("a", "done", file=str(target))
+    state.record("b", "failed", errors=["503"])
+    state.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"video_id": "c", "sta')
+    state = DownloadState(path)
+    assert state.completed("a")
+    assert not state.completed("b")
+    assert not state.completed("c")
+    state.close()
+
+
+def test_retries_transient_failures_with_backoff(tmp_path):
+    with FixtureServer(file_size=FILE_SIZE, file_failures=2) as server:
+        orchestrator = DownloadOrchestrator(HTTPDownloader(server.file_url()), str(tmp_path),
+                                            retries=3, backoff=0.1)
+        start = time.perf_counter()
+        summary = orchestrator.run(items(1))
+        elapsed = time.perf_counter() - start
+    assert summary["downloaded"] == 1
+    # Esperas de 0.1 s y 0.2 s antes del segundo y el tercer intento
+    assert elapsed >= 0.3
+    with open(orchestrator.state_file, encoding="utf-8") as f:
+        record = json.loads(f.readlines()[-1])
+    assert record["status"] == "done"
+    assert record["attempts"] == 3
+
+
+def test_gives_up_after_retries(tmp_path):
+    with FixtureServer(file_size=FILE_SIZE, file_failures=5) as server:
+        orchestrator = DownloadOrchestrator(HTTPDownloader(server.file_url()), str(tmp_path),
+                                            retries=2, backoff=0)
+        summary = orchestrator.run(items(1))
+        assert server.file_requests == {"/files/vid00000001.mp4": 3}
+    assert (summary["downloaded"], summary["failed"]) == (0, 1)
+    assert len(summary["failures"][0]["errors"]) == 3
+    state = DownloadState(orchestrator.state_file)
+    assert state.records["vid00000001"]["status"] == "failed"
+    state.close()
+
+
+def test_token_bucket_holds_rate_across_threads():
+    rate = 1024 * 1024
+    bucket = TokenBucket(rate)
+
+    def worker():
+        for _ in range(8):
+            bucket.consume(16 * 1024)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    # 512 KB a 1 MB/s: al menos 0.5 s, sin importar cuántos hilos consuman
+    assert elapsed >= 0.5 * 0.95
+
+
+def test_orchestrator_global_rate_limit(server, tmp_path):
+    max_rate = 2 * 1024 * 1024
+    summary = DownloadOrchestrator(HTTPDownloader(server.file_url()), str(tmp_path),
+                                   workers=4, max_rate=max_rate).run(items(8))
+    assert summary["downloaded"] == 8
+    # 2 MB a 2 MB/s con 4 workers: el promedio global no supera el límite
+    assert summary["seconds"] >= 0.95
+    assert summary["mb_per_second"] <= 2 * 1.05
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("500K", 500 * 1024), ("5M", 5 * 1024 ** 2), ("1.5MB", 1.5 * 1024 ** 2), ("0", None), (None, None),
+])
+def test_parse_rate(value, expected):
+    assert parse_rate(value) == expected
+
+
+def test_parse_rate_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_rate("rápido")
+
+
+def test_load_items_from_json_and_txt(tmp_path):
+    export = tmp_path / "playlist.json"
+    export.write_text(json.dumps({"videos": [
+        {"index": 1, "title": "A", "video_id": "aaa", "url": "https://www.youtube.com/watch?v=aaa&list=PL"},
+        {"index": 2, "title": "A otra vez", "video_id": "aaa", "url": "https://www.youtube.com/watch?v=aaa"},
+        {"index": 3, "title": "B", "video_id": "bbb", "url_simple": "https://www.youtube.com/watch?v=bbb"},
+    ]}), encoding="utf-8")
+    assert [(item["video_id"], item["index"]) for item in load_items(str(export))] == [("aaa", 1), ("bbb", 3)]
+
+    urls = tmp_path / "playlist_urls.txt"
+    urls.write_text("# comentario\nhttps://www.youtube.com/watch?v=ccc\n\nhttps://youtu.be/ddd\n",
+                    encoding="utf-8")
+    assert [(item["video_id"], item["index"]) for item in load_items(str(urls))] == [("ccc", 1), ("ddd", 2)]
@@ -0,0 +1,70 @@
+"""
+DriverPool (backend/driver_pool.py) con drivers falsos: reutilización y descarte tras un error
+"""
+
+import time
+
+import pytest
+
+from driver_pool import DriverPool, PoolExhausted
+
+
+class FakeDriver:
+    """Lo mínimo que el pool usa de un WebDriver"""
+
+    def __init__(self):
+        self.quit_called = False
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_healthy_driver_is_reused():
+    pool = DriverPool(FakeDriver, size=1)
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    assert second is first
+    assert (pool.created, pool.recycled) == (1, 0)
+
+
+def test_driver_is_discarded_when_the_block_fails():
+    pool = DriverPool(FakeDriver, size=1)
+    with pytest.raises(RuntimeError):
+        with pool.lease() as broken:
+            raise RuntimeError("invalid session id")
+    assert broken.quit_called
+    assert pool.recycled == 1
+    # Se repone en segundo plano; el próximo préstamo no recibe el driver roto
+    assert wait_for(lambda: pool.created == 2)
+    with pool.lease() as driver:
+        assert driver is not broken
+
+
+def test_slot_is_released_after_a_failure():
+    pool = DriverPool(FakeDriver, size=1, lease_timeout=0.1)
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            raise RuntimeError("timeout")
+    with pool.lease() as driver:
+        assert driver is not None
+        with pytest.raises(PoolExhausted):
+            with pool.lease():
+                pass
@@ -0,0 +1,118 @@
+"""
+Enriquecimiento de metadatos (playlist_enrich) contra /watch del servidor de fixtures
+"""
+
+import time
+
+import pytest
+
+from fixture_server import FixtureServer, fixture_video
+from playlist_enrich import METADATA_FIELDS, MetadataCache, MetadataEnricher
+
+pytest.importorskip("aiohttp")
+
+
+def playlist(count: int) -> list:
+    return [{"index": index, "video_id": fixture_video(index)["video_id"], "title": f"#{index}"}
+            for index in range(1, count + 1)]
+
+
+@pytest.fixture
+def server():
+    with FixtureServer() as server:
+        yield server
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "metadata.db")
+
+
+def test_adds_metadata_from_watch_page(server, cache_path):
+    videos = playlist(20)
+    stats = MetadataEnricher(cache_path, watch_url=server.watch_url()).enrich(videos)
+    assert (stats["cached"], stats["fetched"], stats["failed"]) == (0, 20, 0)
+    assert server.watch_requests == 20
+    video = videos[9]  # vid00000010
+    assert video["channel"] == "Canal sintético 3"
+    assert video["channel_id"] == "UCFIXTURE0003"
+    assert video["view_count"] == 10007
+    assert video["upload_date"] == "2020-11-11"
+    # La miniatura de mayor resolución
+    assert video["thumbnail_url"] == "/vi/vid00000010/maxresdefault.jpg"
+    # Los campos de la playlist no se tocan
+    assert (video["index"], video["title"]) == (10, "#10")
+
+
+def test_second_run_is_served_from_cache(server, cache_path):
+    MetadataEnricher(cache_path, watch_url=server.watch_url()).enrich(playlist(20))
+    videos = playlist(25)
+    stats = MetadataEnricher(cache_path, watch_url=server.watch_url()).enrich(videos)
+    # Solo se piden los 5 videos nuevos
+    assert (stats["cached"], stats["fetched"]) == (20, 5)
+    assert server.watch_requests == 25
+    assert all(video["channel"] for video in videos)
+
+
+def test_expired_entries_are_fetched_again(server, cache_path):
+    MetadataEnricher(cache_path, watch_url=server.watch_url()).enrich(playlist(10))
+    stats = MetadataEnricher(cache_path, ttl=0, watch_url=server.watch_url()).enrich(playlist(10))
+    assert (stats["cached"], stats["fetched"]) == (0, 10)
+    assert server.watch_requests == 20
+
+
+def test_cache_evicts_only_expired_entries(cache_path):
+    with MetadataCache(cache_path, ttl=60) as cache:
+        cache.put_many({"fresh": {"channel": "A"}})
+        cache._conn.execute("INSERT INTO metadata VALUES ('old', '{}', ?)", (time.time() - 120,))
+        cache._conn.commit()
+        assert cache.evict() == 1
+        assert cache.get_many(["fresh", "old"]) == {"fresh": {"channel": "A"}}
+
+
+def test_duplicate_video_ids_are_fetched_once(server, cache_path):
+    videos = playlist(5) + playlist(5)
+    stats = MetadataEnricher(cache_path, watch_url=server.watch_url()).enrich(videos)
+    assert stats["fetched"] == 5
+    assert server.watch_requests == 5
+    assert videos[0]["channel"] == videos[5]["channel"]
+
+
+def test_fetches_concurrently(cache_path):
+    with FixtureServer(watch_latency_ms=100) as server:
+        start = time.perf_counter()
+        stats = MetadataEnricher(cache_path, concurrency=16, watch_url=server.watch_url()).enrich(playlist(32))
+        elapsed = time.perf_counter() - start
+    assert stats["fetched"] == 32
+    # De a uno serían 3.2 s; con 16 a la vez, dos tandas de ~0.1 s
+    assert elapsed < 1.5
+
+
+def test_missing_pages_leave_fields_empty(server, cache_path):
+    videos = playlist(3)
+    stats = MetadataEnricher(cache_path, retries=1,
+                             watch_url=server.base_url + "/missing/{video_id}").enrich(videos)
+    assert (stats["fetched"], stats["failed"]) == (0, 3)
+    assert all(video[field] is None for video in videos for field in METADATA_FIELDS)
+    # Lo fallido no queda en la caché: la próxima corrida lo vuelve a pedir
+    stats = MetadataEnricher(cache_path, watch_url=server.watch_url()).enrich(playlist(3))
+    assert (stats["cached"], stats["fetched"]) == (0, 3)
+
+
+def test_page_without_player_response_is_not_retried(server, cache_path):
+    # La página de la playlist no trae ytInitialPlayerResponse
+    videos = playlist(2)
+    stats = MetadataEnricher(cache_path, watch_url=server.base_url + "/youtube.com/playlist?list={video_id}"
+                             ).enrich(videos)
+    assert stats["failed"] == 2
+    assert videos[0]["channel"] is None
+
+
+def test_unreachable_host_is_retried_then_fails(cache_path):
+    # Puerto sin servidor: error de conexión transitorio, con reintentos
+    start = time.perf_counter()
+    stats = MetadataEnricher(cache_path, retries=1, timeout=2,
+                             watch_url="http://127.0.0.1:9/watch?v={video_id}").enrich(playlist(2))
+    assert stats["failed"] == 2
+    # Un reintento tras 1 s de espera
+    assert time.perf_counter() - start >= 1
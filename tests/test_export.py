@@ -0,0 +1,114 @@
+"""
+Exportación en una sola pasada (playlist_export): bytes iguales a los del guardado anterior
+"""
+
+import csv
+import gzip
+import io
+import json
+
+from playlist_export import VIDEO_FIELDS, CsvWriter, JsonWriter, PlaylistExporter, default_paths
+
+
+def videos(count: int = 3) -> list:
+    return [{
+        "index": index,
+        "title": f'Video #{index} "demo", másé ✓',
+        "video_id": f"vid{index:08d}",
+        "url": f"https://www.youtube.com/watch?v=vid{index:08d}&list=PL&index={index}",
+        "url_simple": f"https://www.youtube.com/watch?v=vid{index:08d}",
+        "duration": f"{index}:0{index}",
+        "extracted_at": "2024-01-01T00:00:00",
+    } for index in range(1, count + 1)]
+
+
+def stream_json(items, header=None, footer=None) -> str:
+    f = io.StringIO()
+    writer = JsonWriter(f, header, footer)
+    for video in items:
+        writer.write(video)
+    writer.close()
+    return f.getvalue()
+
+
+def test_json_writer_matches_json_dump():
+    items = videos(3)
+    header = {"metadata": {"total_videos": 3, "missing_videos": None, "nested": {"a": [1, 2]}}}
+    expected = json.dumps({**header, "videos": items, "errors": [{"index": 2, "error": "x"}]},
+                          ensure_ascii=False, indent=2)
+    assert stream_json(items, header, lambda count: {"errors": [{"index": 2, "error": "x"}]}) == expected
+
+
+def test_json_writer_matches_json_dump_for_edge_cases():
+    # Sin videos, con valores no escalares dentro de un video y con footer vacío
+    assert stream_json([], {"total_videos": 0}) == json.dumps(
+        {"total_videos": 0, "videos": []}, ensure_ascii=False, indent=2)
+    items = [{"index": 1, "tags": ["a", "b"], "meta": {}, "empty": [], "ratio": 0.5, "ok": True}]
+    assert stream_json(items, footer=lambda count: {"errors": []}) == json.dumps(
+        {"videos": items, "errors": []}, ensure_ascii=False, indent=2)
+
+
+def test_csv_default_columns_match_dict_writer():
+    items = videos(3)
+    expected = io.StringIO()
+    writer = csv.DictWriter(expected, fieldnames=VIDEO_FIELDS)
+    writer.writeheader()
+    writer.writerows(items)
+
+    f = io.StringIO()
+    csv_writer = CsvWriter(f)
+    for video in items:
+        csv_writer.write(video)
+    assert f.getvalue() == expected.getvalue()
+
+
+def test_csv_columns_do_not_depend_on_first_video():
+    f = io.StringIO()
+    writer = CsvWriter(f, [("index", "index"), ("title", "title"), ("channel", "channel")])
+    # El primer video no trae channel; el segundo sí, y trae una clave que no es columna
+    writer.write({"index": 1, "title": "A"})
+    writer.write({"index": 2, "title": "B, con coma", "channel": "Canal", "extra": "x"})
+    assert f.getvalue() == 'index,title,channel\r\n1,A,\r\n2,"B, con coma",Canal\r\n'
+
+
+def test_csv_quoted_columns_and_line_terminator():
+    f = io.StringIO()
+    writer = CsvWriter(f, [("Index", "index"), ("Title", "title")], quoted=("title",), lineterminator="\n")
+    writer.write({"index": 1, "title": 'Dice "hola"'})
+    writer.write({"index": 2, "title": "simple"})
+    assert f.getvalue() == 'Index,Title\n1,"Dice ""hola"""\n2,"simple"\n'
+
+
+def test_extract_playlist_save_results_keeps_previous_format(tmp_path, monkeypatch):
+    from extract_playlist import save_results
+
+    monkeypatch.chdir(tmp_path)
+    items = videos(5)
+    url = "https://www.youtube.com/playlist?list=PLTEST"
+    save_results(items, url)
+
+    # Lo que escribía la versión anterior, con open(..., "w") y f.write
+    csv_lines = ["Index,Title,Video ID,URL\n"]
+    for video in items:
+        title = video['title'].replace('"', '""')
+        csv_lines.append(f'{video["index"]},"{title}",{video["video_id"]},{video["url_simple"]}\n')
+    expected_json = json.dumps({"playlist_url": url, "total_videos": 5, "videos": items},
+                               ensure_ascii=False, indent=2)
+
+    paths = default_paths("playlist_PLTEST")
+    assert (tmp_path / paths["csv"]).read_bytes() == "".join(csv_lines).encode("utf-8")
+    assert (tmp_path / paths["json"]).read_bytes() == expected_json.encode("utf-8")
+    assert (tmp_path / paths["txt"]).read_bytes() == "".join(
+        f"{video['url_simple']}\n" for video in items).encode("utf-8")
+
+
+def test_gzip_output_has_the_same_content(tmp_path):
+    items = videos(4)
+    plain = default_paths(str(tmp_path / "plain"))
+    packed = default_paths(str(tmp_path / "packed"))
+    for paths, compress in ((plain, False), (packed, True)):
+        with PlaylistExporter(paths, ("json", "csv", "ndjson"), compress) as exporter:
+            exporter.write_all(items)
+    for fmt in ("json", "csv", "ndjson"):
+        with open(plain[fmt], "rb") as f, gzip.open(packed[fmt] + ".gz", "rb") as g:
+            assert f.read() == g.read()
@@ -0,0 +1,174 @@
+"""
+Motor HTTP (youtube_http) contra las páginas y continuaciones del servidor de fixtures
+"""
+
+import pytest
+
+from extract_playlist_advanced import YouTubePlaylistHTTPExtractor
+from fixture_server import FixtureServer, continuation_item, fixture_item, fixture_video
+from youtube_http import (
+    PlaylistHTTPClient, continuation_items, header_total, hidden_count, renderer_to_row, split_items
+)
+
+
+class BrokenContinuationServer(FixtureServer):
+    """Fixture cuya continuación desde la posición `broken_from` viene con otra forma"""
+
+    def __init__(self, response, broken_from: int = 101, **kwargs):
+        super().__init__(**kwargs)
+        self.response = response
+        self.broken_from = broken_from
+        self.continuation_requests = 0
+
+    def continuation(self, token: str):
+        self.continuation_requests += 1
+        good = super().continuation(token)
+        items = good["onResponseReceivedActions"][0]["appendContinuationItemsAction"]["continuationItems"]
+        start = int(items[0]["playlistVideoRenderer"]["index"]["simpleText"])
+        if start < self.broken_from:
+            return good
+        return self.response(token) if callable(self.response) else self.response
+
+
+def pages(url: str, **kwargs) -> list:
+    client = PlaylistHTTPClient(max_retries=0)
+    try:
+        return list(client.iter_pages(url, **kwargs))
+    finally:
+        client.close()
+
+
+def test_iter_pages_reads_every_row_in_order():
+    totals = []
+    with FixtureServer(total=437, batch=100, hidden=3) as server:
+        result = pages(server.playlist_url(), on_total=lambda total, hidden: totals.append((total, hidden)))
+        origin = server.base_url
+    assert totals == [(440, 3)]
+    assert [len(rows) for rows in result] == [100, 100, 100, 100, 37]
+    rows = [row for page in result for row in page]
+    assert [row[0] for row in rows] == list(range(1, 438))
+    assert [row[3] for row in rows] == [fixture_video(i)["video_id"] for i in range(1, 438)]
+    video = fixture_video(250)
+    assert rows[249] == [
+        250,
+        video["title"],
+        f"{origin}/watch?v={video['video_id']}&list=PLFIXTURE&index=250&pp=sAQB",
+        video["video_id"],
+        video["duration"],
+        f"{origin}/vi/{video['video_id']}/hqdefault.jpg",
+    ]
+
+
+def test_fetch_total_reads_only_the_header():
+    with FixtureServer(total=437, batch=100, hidden=3) as server:
+        client = PlaylistHTTPClient(max_retries=0)
+        assert client.fetch_total(server.playlist_url()) == 440
+        client.close()
+
+
+def test_page_without_initial_data_is_an_error():
+    with FixtureServer() as server:
+        with pytest.raises(ValueError):
+            pages(server.base_url + "/watch?v=vid00000001")
+
+
+def test_http_extractor_matches_fixture():
+    with FixtureServer(total=437, batch=100, hidden=3) as server:
+        extractor = YouTubePlaylistHTTPExtractor(max_retries=0)
+        videos = extractor.extract(server.playlist_url())
+    assert [v["video_id"] for v in videos] == [fixture_video(i)["video_id"] for i in range(1, 438)]
+    assert (extractor.reported_total, extractor.hidden_videos) == (440, 3)
+    # Los ocultos explican toda la diferencia con la cabecera
+    assert extractor.header_gap() == 3
+    assert extractor.attempt_errors == []
+
+
+@pytest.mark.parametrize("response", [
+    # JSON que no es un objeto (p. ej. una página de error serializada)
+    "<html>consent</html>",
+    # Objeto sin onResponseReceivedActions
+    {"responseContext": {}, "error": {"code": 400}},
+    None,
+])
+def test_malformed_continuation_is_an_error(response):
+    with BrokenContinuationServer(response, total=300, batch=100) as server:
+        with pytest.raises(ValueError):
+            pages(server.playlist_url())
+        extractor = YouTubePlaylistHTTPExtractor(max_retries=0)
+        with pytest.raises(ValueError):
+            extractor.extract(server.playlist_url())
+    # La primera página llegó antes de la continuación rota
+    assert len(extractor.videos) == 100
+    assert len(extractor.attempt_errors) == 1
+
+
+def test_empty_continuation_ends_the_list_short():
+    empty = {"onResponseReceivedActions": [{"appendContinuationItemsAction": {"continuationItems": []}}]}
+    with BrokenContinuationServer(empty, broken_from=201, total=437, batch=100) as server:
+        result = pages(server.playlist_url())
+        extractor = YouTubePlaylistHTTPExtractor(max_retries=0)
+        videos = extractor.extract(server.playlist_url())
+    assert [len(rows) for rows in result] == [100, 100, 0]
+    assert len(videos) == 200
+    # Sin error, pero el faltante queda a la vista frente a la cabecera
+    assert extractor.header_gap() == 237
+
+
+def test_repeated_token_stops_the_loop():
+    def same_token(token):
+        # Un lote más con el mismo token: seguirlo sería un bucle infinito
+        return {"onResponseReceivedActions": [{"appendContinuationItemsAction": {"continuationItems": [
+            fixture_item("PLFIXTURE", 101), {"continuationItemRenderer": {
+                "continuationEndpoint": {"continuationCommand": {"token": token}}}},
+        ]}}]}
+
+    with BrokenContinuationServer(same_token, total=437, batch=100) as server:
+        result = pages(server.playlist_url())
+        assert server.continuation_requests == 1
+    assert [len(rows) for rows in result] == [100, 1]
+
+
+def test_continuation_items_reads_append_and_reload_actions():
+    item = fixture_item("PL", 1)
+    response = {"onResponseReceivedActions": [
+        {"appendContinuationItemsAction": {"continuationItems": [item]}},
+        {"reloadContinuationItemsCommand": {"continuationItems": [item]}},
+        {"clickTrackingParams": "x"},
+    ]}
+    assert continuation_items(response) == [item, item]
+    assert continuation_items({"onResponseReceivedActions": []}) == []
+
+
+def test_split_items_separates_token():
+    items = [fixture_item("PL", 1), fixture_item("PL", 2), continuation_item("PL", 3)]
+    renderers, token = split_items(items)
+    assert [r["videoId"] for r in renderers] == ["vid00000001", "vid00000002"]
+    assert token == continuation_item("PL", 3)["continuationItemRenderer"]["continuationEndpoint"][
+        "continuationCommand"]["token"]
+    # Una continuación sin token termina la lista
+    assert split_items([fixture_item("PL", 1), {"continuationItemRenderer": {}}])[1] is None
+
+
+def test_renderer_to_row_with_missing_fields():
+    # Un video sin título, duración, miniatura ni navigationEndpoint (p. ej. privado)
+    row = renderer_to_row({"videoId": "abc"}, 7, "https://www.youtube.com")
+    assert row == [7, None, "https://www.youtube.com/watch?v=abc", "abc", "", ""]
+    # Las miniaturas absolutas no se tocan; se usa la de mayor resolución
+    renderer = {"videoId": "abc", "thumbnail": {"thumbnails": [
+        {"url": "https://i.ytimg.com/vi/abc/default.jpg"}, {"url": "https://i.ytimg.com/vi/abc/hq.jpg"}]}}
+    assert renderer_to_row(renderer, 1, "https://www.youtube.com")[5] == "https://i.ytimg.com/vi/abc/hq.jpg"
+
+
+@pytest.mark.parametrize("header, expected", [
+    ({"playlistHeaderRenderer": {"numVideosText": {"runs": [{"text": "1,234"}, {"text": " videos"}]}}}, 1234),
+    ({"pageHeaderRenderer": {"stats": [{"simpleText": "52 vídeos"}]}}, 52),
+    ({"playlistHeaderRenderer": {}}, None),
+])
+def test_header_total(header, expected):
+    assert header_total({"header": header}) == expected
+
+
+def test_hidden_count():
+    alert = {"alertWithButtonRenderer": {"text": {"simpleText": "2 unavailable videos are hidden"}}}
+    assert hidden_count({"alerts": [alert]}) == 2
+    assert hidden_count({"alerts": []}) == 0
@@ -0,0 +1,71 @@
+"""
+Single-flight de JobManager (backend/jobs.py): qué pedidos se suman a un job en curso
+"""
+
+import threading
+
+import pytest
+
+from jobs import JobManager
+
+
+@pytest.fixture
+def manager():
+    release = threading.Event()
+
+    def run(job):
+        # Los jobs siguen en curso hasta el final de la prueba
+        release.wait(5)
+        return {"success": True, "videos": [], "total_videos": 0}
+
+    manager = JobManager(run, workers=4)
+    yield manager
+    release.set()
+    manager.shutdown()
+
+
+def test_same_playlist_and_engine_share_the_job(manager):
+    first = manager.submit("https://www.youtube.com/playlist?list=PL1", "http", key="PL1")
+    second = manager.submit("https://youtube.com/playlist?list=PL1&index=3", "http", key="PL1")
+    assert second is first
+    assert first.coalesced == 1
+    assert manager.coalesced == 1
+
+
+def test_other_engine_gets_its_own_job(manager):
+    http = manager.submit("https://www.youtube.com/playlist?list=PL1", "http", key="PL1")
+    selenium = manager.submit("https://www.youtube.com/playlist?list=PL1", "selenium", key="PL1")
+    assert selenium is not http
+    assert (selenium.engine, http.engine) == ("selenium", "http")
+    # Cada motor tiene su propio job en curso al que sumarse
+    assert manager.submit("https://www.youtube.com/playlist?list=PL1", "selenium", key="PL1") is selenium
+
+
+def test_refresh_does_not_join_a_job_without_refresh(manager):
+    cached = manager.submit("https://www.youtube.com/playlist?list=PL1", "http", key="PL1")
+    fresh = manager.submit("https://www.youtube.com/playlist?list=PL1", "http", refresh=True, key="PL1")
+    assert fresh is not cached
+    assert fresh.refresh and cached.coalesced == 0
+    # Los siguientes pedidos, con refresh o sin él, se suman al job nuevo
+    assert manager.submit("https://www.youtube.com/playlist?list=PL1", "http", refresh=True, key="PL1") is fresh
+    assert manager.submit("https://www.youtube.com/playlist?list=PL1", "http", key="PL1") is fresh
+
+
+def test_request_without_refresh_joins_a_refresh_job(manager):
+    fresh = manager.submit("https://www.youtube.com/playlist?list=PL1", "http", refresh=True, key="PL1")
+    assert manager.submit("https://www.youtube.com/playlist?list=PL1", "http", key="PL1") is fresh
+
+
+def test_finished_job_is_not_joined():
+    manager = JobManager(lambda job: {"success": True, "videos": [], "total_videos": 0})
+    first = manager.submit("https://www.youtube.com/playlist?list=PL1", "http", key="PL1")
+    assert first.wait(5)
+    second = manager.submit("https://www.youtube.com/playlist?list=PL1", "http", key="PL1")
+    assert second is not first
+    assert second.wait(5)
+    manager.shutdown()
+
+
+def test_without_key_jobs_are_not_shared(manager):
+    first = manager.submit("https://www.youtube.com/playlist?list=PL1", "http")
+    assert manager.submit("https://www.youtube.com/playlist?list=PL1", "http") is not first
@@ -0,0 +1,35 @@
+"""
+--harvest prune contra --harvest incremental en una playlist sintética de 20k videos
+"""
+
+import pytest
+
+from bench_prune import run_mode, summarize
+from common import comparable
+from fixture_server import FixtureServer
+
+VIDEOS = 20000
+# Último cuarto / primer cuarto de la lista: con prune el DOM y la memoria
+# de Chrome no crecen con la playlist (incremental crece ~4x)
+MAX_GROWTH = 1.5
+
+
+@pytest.fixture(scope="module")
+def runs():
+    with FixtureServer(total=VIDEOS, batch=100) as server:
+        return {mode: run_mode(mode, server, sample_every=10) for mode in ("incremental", "prune")}
+
+
+@pytest.mark.chrome
+def test_prune_matches_incremental(runs):
+    assert len(runs["prune"]["videos"]) == VIDEOS
+    assert comparable(runs["prune"]["videos"]) == comparable(runs["incremental"]["videos"])
+
+
+@pytest.mark.chrome
+def test_prune_memory_stays_flat(runs):
+    summary = summarize(runs["prune"])
+    assert summary["dom_nodes_growth"] <= MAX_GROWTH
+    assert summary["chrome_rss_mb_growth"] <= MAX_GROWTH
+    # Sin prune el DOM sí crece: la prueba distingue los dos modos
+    assert summarize(runs["incremental"])["dom_nodes_growth"] > MAX_GROWTH
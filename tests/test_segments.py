@@ -0,0 +1,175 @@
+"""
+Modo segmentado (--segments): rangos, recorte y unión de segmentos
+"""
+
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from extract_playlist_advanced import (
+    YouTubePlaylistExtractor, merge_segments, segment_ranges, segment_url
+)
+from fixture_server import FixtureServer, fixture_video
+from youtube_http import extract_json_var, initial_items, renderer_to_row, split_items
+
+
+def video(index: int, video_id: str = None) -> dict:
+    return {"index": index, "video_id": video_id or f"vid{index:08d}", "title": f"#{index}"}
+
+
+def segment(start, end, indexes, **extra) -> dict:
+    return {"start": start, "end": end, "videos": [video(i) for i in indexes],
+            "first_index": indexes[0] if indexes else None, "error": None, "seconds": 0, **extra}
+
+
+@pytest.mark.parametrize("total, segments, expected", [
+    (10, 3, [(1, 4), (5, 8), (9, None)]),
+    (8, 4, [(1, 2), (3, 4), (5, 6), (7, None)]),
+    (3, 5, [(1, 1), (2, 2), (3, None)]),
+    (100, 1, [(1, None)]),
+    (100, 0, [(1, None)]),
+])
+def test_segment_ranges_boundaries(total, segments, expected):
+    assert segment_ranges(total, segments) == expected
+
+
+@pytest.mark.parametrize("total, segments", [(437, 4), (20000, 7), (1, 3), (99, 10)])
+def test_segment_ranges_cover_every_position_once(total, segments):
+    ranges = segment_ranges(total, segments)
+    assert ranges[0][0] == 1
+    assert ranges[-1][1] is None
+    for (_, end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert next_start == end + 1
+    assert ranges[-1][0] <= total
+
+
+def test_segment_url_sets_and_replaces_index():
+    url = "https://www.youtube.com/playlist?list=PL1&index=7"
+    assert parse_qs(urlparse(segment_url(url, 51)).query) == {"list": ["PL1"], "index": ["51"]}
+    # La posición 1 es la URL sin index=
+    assert parse_qs(urlparse(segment_url(url, 1)).query) == {"list": ["PL1"]}
+
+
+def test_merge_segments_complete():
+    videos, report = merge_segments([segment(1, 5, range(1, 6)), segment(6, None, range(6, 11))], 10)
+    assert [v["index"] for v in videos] == list(range(1, 11))
+    assert report["merged"] == 10
+    assert report["gaps"] == []
+    assert report["overlaps"] == []
+    assert [s["videos"] for s in report["segments"]] == [5, 5]
+
+
+def test_merge_segments_removes_overlap_between_segments():
+    # El segundo segmento empezó antes de lo pedido y repite 4-5
+    videos, report = merge_segments([segment(1, 5, range(1, 6)), segment(6, None, range(4, 11))], 10)
+    assert [v["index"] for v in videos] == list(range(1, 11))
+    assert len({v["video_id"] for v in videos}) == 10
+    assert report["overlaps"] == [
+        {"video_id": "vid00000004", "positions": [4, 4]},
+        {"video_id": "vid00000005", "positions": [5, 5]},
+    ]
+
+
+def test_merge_segments_keeps_first_position_of_moved_video():
+    # Un video que se movió mientras se extraía aparece en dos posiciones
+    first = segment(1, 3, [1, 2, 3])
+    second = {**segment(4, None, []), "videos": [video(4), video(5, "vid00000002")]}
+    videos, report = merge_segments([first, second], 5)
+    assert [(v["index"], v["video_id"]) for v in videos] == [
+        (1, "vid00000001"), (2, "vid00000002"), (3, "vid00000003"), (4, "vid00000004")]
+    assert report["overlaps"] == [{"video_id": "vid00000002", "positions": [2, 5]}]
+    assert report["gaps"] == [[5, 5]]
+
+
+def test_merge_segments_reports_gap_of_short_segment():
+    results = [segment(1, 4, range(1, 5)), segment(5, 8, range(5, 7), error="timeout"),
+               segment(9, None, range(9, 13))]
+    videos, report = merge_segments(results, 12)
+    assert len(videos) == 10
+    assert report["gaps"] == [[7, 8]]
+    assert report["segments"][1]["error"] == "timeout"
+
+
+def test_merge_segments_reports_missing_tail():
+    _, report = merge_segments([segment(1, None, range(1, 8))], 10)
+    assert report["gaps"] == [[8, 10]]
+
+
+def test_trim_to_segment_discards_videos_outside_range():
+    extractor = YouTubePlaylistExtractor()
+    extractor.videos = [video(1), video(2)]
+    extractor.duplicates = {v["video_id"] for v in extractor.videos}
+    # Lo cargado en este intento: el segmento 4-6 abrió desde la posición 3
+    extractor._attempt_start = 2
+    for index in range(3, 9):
+        extractor.videos.append(video(index))
+        extractor.duplicates.add(video(index)["video_id"])
+    extractor.segment = (4, 6)
+    extractor._trim_to_segment()
+    # Lo de intentos anteriores no se toca
+    assert [v["index"] for v in extractor.videos] == [1, 2, 4, 5, 6]
+    assert extractor.duplicates == {v["video_id"] for v in extractor.videos}
+
+
+def test_trim_to_open_segment_keeps_tail():
+    extractor = YouTubePlaylistExtractor()
+    extractor.videos = [video(i) for i in range(8, 14)]
+    extractor.segment = (10, None)
+    extractor._trim_to_segment()
+    assert [v["index"] for v in extractor.videos] == [10, 11, 12, 13]
+
+
+def test_add_rows_uses_absolute_positions_in_segment():
+    extractor = YouTubePlaylistExtractor()
+    # El segmento abrió en la posición 111: su primera fila es la 1
+    extractor.index_offset = 110
+    extractor._add_rows([
+        [1, "#111", "https://www.youtube.com/watch?v=vid00000111", "vid00000111", "1:00", ""],
+        [2, None, "https://www.youtube.com/watch?v=vid00000112", "vid00000112", "", ""],
+    ])
+    assert [v["index"] for v in extractor.videos] == [111]
+    assert extractor.errors == [{"index": 112, "error": "#video-title no encontrado"}]
+
+
+def load_segment(url: str, start: int, end, origin: str) -> dict:
+    """Primera página de un segmento con index=, leída del ytInitialData del fixture"""
+    html = requests.get(segment_url(url, start), timeout=10).text
+    renderers, _ = split_items(initial_items(extract_json_var(html, "ytInitialData")))
+    first = int(renderers[0]["index"]["simpleText"])
+    # Como _start_segment: la posición real del primer video es el offset
+    rows = [renderer_to_row(renderer, number, origin) for number, renderer in enumerate(renderers, 1)]
+    videos = [{"index": row[0] + first - 1, "video_id": row[3], "title": row[1]} for row in rows]
+    videos = [v for v in videos if v["index"] >= start and (end is None or v["index"] <= end)]
+    return {"start": start, "end": end, "videos": videos, "first_index": first, "error": None, "seconds": 0}
+
+
+def test_fixture_index_offset_segments_merge_to_full_list():
+    with FixtureServer(total=437, batch=150) as server:
+        url = server.playlist_url()
+        results = [load_segment(url, start, end, server.base_url) for start, end in segment_ranges(437, 4)]
+    assert [result["first_index"] for result in results] == [1, 111, 221, 331]
+    videos, report = merge_segments(results, 437)
+    assert report["gaps"] == [] and report["overlaps"] == []
+    assert [v["video_id"] for v in videos] == [fixture_video(i)["video_id"] for i in range(1, 438)]
+
+
+def test_fixture_short_batches_leave_gaps():
+    # Con lotes de 50 la primera página de cada segmento de 110 no lo cubre entero
+    with FixtureServer(total=437, batch=50) as server:
+        results = [load_segment(server.playlist_url(), start, end, server.base_url)
+                   for start, end in segment_ranges(437, 4)]
+    _, report = merge_segments(results, 437)
+    assert report["gaps"] == [[51, 110], [161, 220], [271, 330], [381, 437]]
+
+
+@pytest.mark.chrome
+def test_extract_segmented_against_fixture():
+    with FixtureServer(total=437, batch=50) as server:
+        extractor = YouTubePlaylistExtractor()
+        videos = extractor.extract_segmented(server.playlist_url(), segments=4)
+    assert [v["index"] for v in videos] == list(range(1, 438))
+    assert [v["video_id"] for v in videos] == [fixture_video(i)["video_id"] for i in range(1, 438)]
+    assert extractor.segment_report["gaps"] == []
+    assert extractor.segment_report["overlaps"] == []
+    assert [s["first_index"] for s in extractor.segment_report["segments"]] == [1, 111, 221, 331]
@@ -0,0 +1,136 @@
+"""
+Re-sincronización contra una extracción anterior (playlist_sync.PlaylistResync)
+"""
+
+import json
+
+from playlist_sync import PlaylistResync, load_previous, stable_positions
+
+
+def video(video_id: str, index: int = 0) -> dict:
+    return {"index": index, "video_id": video_id, "title": f"Video {video_id}"}
+
+
+def playlist(ids) -> list:
+    return [video(video_id, index) for index, video_id in enumerate(ids, 1)]
+
+
+PREVIOUS = [f"p{n}" for n in range(1, 11)]
+
+
+def load(resync: PlaylistResync, ids, reported_total=None) -> list:
+    """Carga `ids` de a uno hasta que should_stop diga que alcanza"""
+    loaded = []
+    for video_id in ids:
+        resync.observe(video_id)
+        loaded.append(video(video_id, len(loaded) + 1))
+        if resync.should_stop(reported_total):
+            break
+    return loaded
+
+
+def test_stops_on_header_total_after_insert():
+    resync = PlaylistResync(playlist(PREVIOUS))
+    current = ["n1"] + PREVIOUS
+    loaded = load(resync, current, reported_total=11)
+    # n1 y p1 alcanzan: lo demás es p2..p10 como la vez anterior
+    assert [v["video_id"] for v in loaded] == ["n1", "p1"]
+    assert resync.stop_reason == 'total'
+
+    merged = resync.merge(loaded)
+    assert [v["video_id"] for v in merged] == current
+    assert [v["index"] for v in merged] == list(range(1, 12))
+
+    delta = resync.delta(merged, 11)
+    assert [v["video_id"] for v in delta["added"]] == ["n1"]
+    assert delta["removed"] == [] and delta["reordered"] == []
+    assert delta["metadata"]["assumed_unchanged"] == 9
+    assert delta["metadata"]["complete"] is True
+
+
+def test_removal_that_balances_an_insert_does_not_stop_on_total():
+    # p2 se eliminó y n1 se agregó: el total es el mismo que antes
+    current = ["n1", "p1"] + PREVIOUS[2:]
+    resync = PlaylistResync(playlist(PREVIOUS), known_run=100)
+    loaded = load(resync, current, reported_total=10)
+    # Sin p2 nunca queda cubierto lo anterior al último conocido: se carga todo
+    assert resync.stop_reason is None
+    assert len(loaded) == 10
+
+    merged = resync.merge(loaded)
+    assert [v["video_id"] for v in merged] == current
+    delta = resync.delta(merged, 10)
+    assert [v["video_id"] for v in delta["added"]] == ["n1"]
+    assert [v["video_id"] for v in delta["removed"]] == ["p2"]
+    assert delta["metadata"]["stop_reason"] == 'end'
+
+
+def test_stops_after_run_of_known_videos():
+    current = ["n1", "p1"] + PREVIOUS[2:]
+    resync = PlaylistResync(playlist(PREVIOUS), known_run=3)
+    loaded = load(resync, current, reported_total=10)
+    assert [v["video_id"] for v in loaded] == ["n1", "p1", "p3", "p4"]
+    assert resync.stop_reason == 'known_run'
+
+    merged = resync.merge(loaded)
+    assert [v["video_id"] for v in merged] == current
+    delta = resync.delta(merged, 10)
+    assert [v["video_id"] for v in delta["removed"]] == ["p2"]
+    # Con known_run no se sabe si cambió el resto de la lista
+    assert delta["metadata"]["complete"] is False
+
+
+def test_without_header_total_only_known_run_stops():
+    resync = PlaylistResync(playlist(PREVIOUS), known_run=4)
+    loaded = load(resync, PREVIOUS, reported_total=None)
+    assert len(loaded) == 4
+    assert resync.stop_reason == 'known_run'
+
+
+def test_does_not_stop_on_new_video_or_empty_tail():
+    resync = PlaylistResync(playlist(["p1", "p2"]), known_run=1)
+    resync.observe("n1")
+    assert not resync.should_stop(3)
+    # Los conocidos ya se cargaron todos: lo que falta no está en la extracción anterior
+    resync.observe("p1")
+    resync.observe("p2")
+    assert not resync.should_stop(None)
+    assert resync.merge(playlist(["n1", "p1", "p2"])) == playlist(["n1", "p1", "p2"])
+
+
+def test_delta_reports_moved_and_keeps_unchanged_positions():
+    resync = PlaylistResync(playlist(["p1", "p2", "p3", "p4", "p5"]))
+    merged = playlist(["p1", "p4", "p2", "p3", "p5"])
+    for v in merged:
+        resync.observe(v["video_id"])
+    delta = resync.delta(merged)
+    # Solo p4 cambió de lugar; el resto conserva su orden relativo
+    assert delta["reordered"] == [{"video_id": "p4", "title": "Video p4", "old_index": 4, "new_index": 2}]
+    assert delta["added"] == [] and delta["removed"] == []
+
+
+def test_delta_of_unchanged_playlist_is_empty():
+    resync = PlaylistResync(playlist(PREVIOUS))
+    merged = playlist(PREVIOUS)
+    for v in merged:
+        resync.observe(v["video_id"])
+    delta = resync.delta(merged, 10)
+    assert (delta["added"], delta["removed"], delta["reordered"]) == ([], [], [])
+    assert delta["metadata"]["assumed_unchanged"] == 0
+
+
+def test_stable_positions():
+    assert stable_positions([]) == set()
+    assert stable_positions([0, 1, 2]) == {0, 1, 2}
+    assert stable_positions([2, 0, 1]) == {1, 2}
+    assert stable_positions([0, 3, 1, 2, 4]) == {0, 2, 3, 4}
+
+
+def test_load_previous_accepts_export_or_list(tmp_path):
+    export = tmp_path / "previous.json"
+    export.write_text(json.dumps({"metadata": {}, "videos": playlist(["a", "b"]) + [{"index": 3}]}),
+                      encoding="utf-8")
+    assert [v["video_id"] for v in load_previous(str(export))] == ["a", "b"]
+    plain = tmp_path / "list.json"
+    plain.write_text(json.dumps(playlist(["c"])), encoding="utf-8")
+    assert [v["video_id"] for v in load_previous(str(plain))] == ["c"]
@@ -0,0 +1,176 @@
+"""
+Traza de los round-trips WebDriver de una extracción (--profile)
+
+Cada find_element, .text o execute_script es un comando HTTP contra
+ChromeDriver. CommandTracer envuelve el command_executor del driver y
+registra, por tipo de comando (findElements, w3cExecuteScript,
+getElementText...), cuántos se emitieron, cuánto tardaron en total y un
+histograma de latencias, además de en qué fase de la extracción ocurrieron
+(scroll, parse...). report() arma el reporte de los caminos calientes.
+
+También arma la traza de rendimiento de Chrome (la misma que graba el panel
+Performance de DevTools) a partir del log 'performance' de ChromeDriver.
+
+Uso:
+    tracer = CommandTracer()
+    tracer.attach(driver, phase_of=lambda: timer.current)
+    ...
+    print(tracer.report())
+"""
+
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Límite superior (ms) de cada barra del histograma; la última es "más"
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+TRACE_CATEGORIES = "devtools.timeline,v8.execute,blink.user_timing,loading,disabled-by-default-devtools.timeline"
+
+
+def bucket_labels() -> List[str]:
+    return [f"<={limit}ms" for limit in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+
+
+class CommandStats:
+    """Cantidad, tiempo total, máximo e histograma de latencias de un comando"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        ms = seconds * 1000
+        bucket = next((i for i, limit in enumerate(LATENCY_BUCKETS_MS) if ms <= limit),
+                      len(LATENCY_BUCKETS_MS))
+        self.histogram[bucket] += 1
+
+    def percentile_ms(self, fraction: float) -> Optional[float]:
+        """Límite superior de la barra que contiene el percentil (aproximado)"""
+        if not self.count:
+            return None
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= fraction * self.count:
+                break
+        return LATENCY_BUCKETS_MS[bucket] if bucket < len(LATENCY_BUCKETS_MS) else self.max_seconds * 1000
+
+    def as_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "seconds": round(self.seconds, 4),
+            "mean_ms": round(self.seconds / self.count * 1000, 2) if self.count else None,
+            "p95_ms": self.percentile_ms(0.95),
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "histogram": {label: count for label, count in zip(bucket_labels(), self.histogram) if count},
+        }
+
+
+class CommandTracer:
+    """Registra los comandos WebDriver de uno o más drivers"""
+
+    def __init__(self):
+        self.commands: Dict[str, CommandStats] = {}
+        self.by_phase: Dict[str, Dict[str, CommandStats]] = {}
+        # Los segmentos (--segments) comparten el tracer desde varios hilos
+        self._lock = threading.Lock()
+
+    def attach(self, driver, phase_of: Optional[Callable[[], Optional[str]]] = None):
+        """
+        Envuelve el command_executor de `driver`
+
+        Args:
+            driver: WebDriver recién creado
+            phase_of: Devuelve la fase en curso de la extracción (None fuera de una)
+        """
+        executor = driver.command_executor
+        original = executor.execute
+
+        def execute(command, params):
+            start = time.perf_counter()
+            try:
+                return original(command, params)
+            finally:
+                self.record(command, time.perf_counter() - start, phase_of() if phase_of else None)
+
+        executor.execute = execute
+        return driver
+
+    def record(self, command: str, seconds: float, phase: Optional[str] = None):
+        with self._lock:
+            self.commands.setdefault(command, CommandStats()).record(seconds)
+            self.by_phase.setdefault(phase or "other", {}).setdefault(command, CommandStats()).record(seconds)
+
+    @property
+    def total(self) -> int:
+        return sum(stats.count for stats in self.commands.values())
+
+    @property
+    def seconds(self) -> float:
+        return sum(stats.seconds for stats in self.commands.values())
+
+    def as_dict(self) -> Dict:
+        ranked = sorted(self.commands.items(), key=lambda item: item[1].seconds, reverse=True)
+        return {
+            "total_commands": self.total,
+            "total_seconds": round(self.seconds, 4),
+            "commands": {command: stats.as_dict() for command, stats in ranked},
+            "phases": {
+                phase: {command: stats.count for command, stats in commands.items()}
+                for phase, commands in self.by_phase.items()
+            },
+        }
+
+    def hot_paths(self, top: int = 10) -> List[Dict]:
+        """Pares (fase, comando) que más tiempo se llevaron, de mayor a menor"""
+        rows = [
+            {"phase": phase, "command": command, **stats.as_dict()}
+            for phase, commands in self.by_phase.items()
+            for command, stats in commands.items()
+        ]
+        rows.sort(key=lambda row: row["seconds"], reverse=True)
+        return rows[:top]
+
+    def report(self, top: int = 10) -> str:
+        """Tabla de texto con los caminos calientes y el total de round-trips"""
+        total_seconds = self.seconds or 1e-9
+        lines = [
+            f"{self.total} comandos WebDriver en {self.seconds:.2f} s",
+            f"{'fase':<12} {'comando':<24} {'cant.':>7} {'total s':>9} {'%':>6} "
+            f"{'media ms':>9} {'p95 ms':>8} {'máx ms':>8}",
+        ]
+        for row in self.hot_paths(top):
+            lines.append(
+                f"{row['phase']:<12} {row['command']:<24} {row['count']:>7} {row['seconds']:>9.3f} "
+                f"{row['seconds'] / total_seconds * 100:>5.1f}% {row['mean_ms']:>9.2f} "
+                f"{row['p95_ms']:>8.0f} {row['max_ms']:>8.1f}"
+            )
+        return "\n".join(lines)
+
+
+def enable_chrome_trace(options, categories: str = TRACE_CATEGORIES):
+    """Pide a ChromeDriver que grabe la traza de rendimiento en el log 'performance'"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"traceCategories": categories})
+
+
+def read_chrome_trace(driver) -> List[Dict]:
+    """Eventos de traza acumulados desde la última lectura (vacía el log)"""
+    events = []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message.get("method") == "Tracing.dataCollected":
+            events.append(message["params"])
+    return events
+
+
+def save_chrome_trace(events: List[Dict], filename: str):
+    """Guarda los eventos en el formato que abren DevTools (Performance) y chrome://tracing"""
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events}, f)
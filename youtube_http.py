@@ -0,0 +1,310 @@
+"""
+Motor de extracción sin navegador
+
+Descarga el HTML de la playlist, lee el JSON ytInitialData incrustado y
+sigue los tokens de continuación contra /youtubei/v1/browse usando una
+sesión HTTP con pool de conexiones. No necesita Chrome.
+
+Produce las mismas filas que playlist_dom.HARVEST_SCRIPT
+([index, title, href, video_id, duration, thumbnail]) para que los
+extractores construyan exactamente los mismos videos.
+
+Hay una copia idéntica en backend/ (el backend se despliega solo con esa
+carpeta y no puede importarlo desde la raíz); tests/test_backend_sync.py
+falla si las copias difieren.
+"""
+
+import json
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+_JSON_VARS = {
+    "ytInitialData": re.compile(r'(?:var\s+ytInitialData|window\["ytInitialData"\])\s*=\s*'),
+    "ytInitialPlayerResponse": re.compile(
+        r'(?:var\s+ytInitialPlayerResponse|window\["ytInitialPlayerResponse"\])\s*=\s*'),
+}
+_YTCFG_SET = re.compile(r'ytcfg\.set\s*\(\s*(?=\{)')
+_COUNT = re.compile(r'\d[\d.,\s\u00a0]*')
+_HIDDEN = re.compile(r'unavailable|hidden|no disponible|ocult', re.IGNORECASE)
+
+
+def extract_json_var(html: str, name: str) -> Optional[Dict]:
+    """Lee un objeto JSON asignado en la página (p. ej. `var ytInitialData = {...};`)"""
+    match = _JSON_VARS[name].search(html)
+    if not match:
+        return None
+    try:
+        data, _ = json.JSONDecoder().raw_decode(html, match.end())
+    except ValueError:
+        return None
+    return data
+
+
+def extract_ytcfg(html: str) -> Dict:
+    """Combina todos los bloques ytcfg.set({...}) de la página"""
+    config = {}
+    decoder = json.JSONDecoder()
+    for match in _YTCFG_SET.finditer(html):
+        try:
+            data, _ = decoder.raw_decode(html, match.end())
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            config.update(data)
+    return config
+
+
+def find_key(data, key: str):
+    """Primer valor de `key` en una estructura JSON anidada (búsqueda en profundidad)"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if key in node:
+                return node[key]
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
+
+def text_of(node) -> str:
+    """Texto de un objeto {simpleText} o {runs: [{text}]} de YouTube"""
+    if not node:
+        return ""
+    if "simpleText" in node:
+        return node["simpleText"]
+    return "".join(run.get("text", "") for run in node.get("runs", []))
+
+
+def parse_count(text: str) -> Optional[int]:
+    """Primer número de un texto como "1,234 videos" (None si no hay)"""
+    match = _COUNT.search(text or "")
+    if not match:
+        return None
+    return int(re.sub(r'\D', '', match.group()))
+
+
+def header_total(initial_data: Dict) -> Optional[int]:
+    """Total de videos que reporta la cabecera de la playlist (None si no aparece)"""
+    header = initial_data.get("header") or {}
+    label = text_of(find_key(header, "numVideosText"))
+    if not label:
+        stats = find_key(header, "stats")
+        label = text_of(stats[0]) if stats else ""
+    return parse_count(label)
+
+
+def hidden_count(initial_data: Dict) -> int:
+    """
+    Videos no disponibles que la playlist oculta, según el aviso de `alerts`
+    ("1 unavailable video is hidden"); 0 si no hay aviso
+
+    La cabecera los incluye en el total, pero no llegan como filas.
+    """
+    stack = [initial_data.get("alerts") or [], initial_data.get("header") or {}]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            alert = node.get("alertWithButtonRenderer") or node.get("alertRenderer")
+            if alert:
+                label = text_of(alert.get("text"))
+                if _HIDDEN.search(label):
+                    return parse_count(label) or 0
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return 0
+
+
+def initial_items(initial_data: Dict) -> List[Dict]:
+    """Items de la lista (videos y continuación) incluidos en ytInitialData"""
+    renderer = find_key(initial_data, "playlistVideoListRenderer") or {}
+    return renderer.get("contents", [])
+
+
+def continuation_items(response: Dict) -> List[Dict]:
+    """
+    Items de una respuesta de /youtubei/v1/browse con continuación
+
+    Raises:
+        ValueError: Si la respuesta no tiene la forma de una continuación
+    """
+    if not isinstance(response, dict) or "onResponseReceivedActions" not in response:
+        raise ValueError("La respuesta de continuación no trae onResponseReceivedActions")
+    items = []
+    for action in response.get("onResponseReceivedActions", []):
+        for key in ("appendContinuationItemsAction", "reloadContinuationItemsCommand"):
+            if key in action:
+                items.extend(action[key].get("continuationItems", []))
+    return items
+
+
+def split_items(items: List[Dict]) -> Tuple[List[Dict], Optional[str]]:
+    """Separa los playlistVideoRenderer del token de continuación (si hay)"""
+    renderers, token = [], None
+    for item in items:
+        if "playlistVideoRenderer" in item:
+            renderers.append(item["playlistVideoRenderer"])
+        elif "continuationItemRenderer" in item:
+            token = find_key(item["continuationItemRenderer"], "token")
+    return renderers, token
+
+
+def video_metadata(player_response: Dict) -> Dict:
+    """
+    Canal, vistas, fecha de subida y miniatura de un video
+
+    Args:
+        player_response: ytInitialPlayerResponse de la página /watch
+    """
+    details = player_response.get("videoDetails") or {}
+    microformat = find_key(player_response.get("microformat") or {}, "playerMicroformatRenderer") or {}
+    thumbnails = (details.get("thumbnail") or {}).get("thumbnails") or []
+    views = details.get("viewCount")
+    return {
+        "channel": details.get("author"),
+        "channel_id": details.get("channelId"),
+        "view_count": int(views) if str(views or "").isdigit() else None,
+        "upload_date": microformat.get("uploadDate") or microformat.get("publishDate"),
+        # Las miniaturas vienen de menor a mayor resolución
+        "thumbnail_url": thumbnails[-1].get("url") if thumbnails else None,
+    }
+
+
+def renderer_to_row(renderer: Dict, index: int, origin: str) -> list:
+    """
+    Convierte un playlistVideoRenderer en una fila como las de HARVEST_SCRIPT
+
+    Args:
+        renderer: Objeto playlistVideoRenderer
+        index: Posición 1-based en la lista
+        origin: Esquema y host de la playlist, para construir el href absoluto
+    """
+    video_id = renderer.get("videoId", "")
+    title = text_of(renderer.get("title")) if "title" in renderer else None
+    path = find_key(renderer.get("navigationEndpoint", {}), "url")
+    if not path:
+        path = f"/watch?v={video_id}"
+    thumbnails = (renderer.get("thumbnail") or {}).get("thumbnails") or [{}]
+    thumbnail = thumbnails[-1].get("url", "")
+    if thumbnail.startswith("/"):
+        thumbnail = origin + thumbnail
+    return [
+        index,
+        title,
+        origin + path,
+        video_id,
+        text_of(renderer.get("lengthText")),
+        thumbnail,
+    ]
+
+
+class PlaylistHTTPClient:
+    """Cliente HTTP con pool de conexiones para leer playlists sin navegador"""
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 3, timeout: float = 30,
+                 session: Optional[requests.Session] = None):
+        """
+        Args:
+            pool_size: Conexiones keep-alive por host
+            max_retries: Reintentos ante errores de red o 429/5xx
+            timeout: Timeout de cada petición (segundos)
+            session: Sesión propia (opcional, p. ej. compartida entre playlists)
+        """
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        retry = Retry(total=max_retries, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+        })
+        # Evita la página de consentimiento de cookies en la UE
+        self.session.cookies.set("CONSENT", "YES+cb", domain=".youtube.com")
+
+    def fetch_page(self, playlist_url: str) -> str:
+        response = self.session.get(playlist_url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def fetch_total(self, playlist_url: str) -> Optional[int]:
+        """Total de videos de la cabecera de la playlist, solo con el HTML (None si no aparece)"""
+        initial_data = extract_json_var(self.fetch_page(playlist_url), "ytInitialData")
+        return header_total(initial_data) if initial_data else None
+
+    def fetch_continuation(self, origin: str, ytcfg: Dict, token: str) -> Dict:
+        params = {"prettyPrint": "false"}
+        if ytcfg.get("INNERTUBE_API_KEY"):
+            params["key"] = ytcfg["INNERTUBE_API_KEY"]
+        context = ytcfg.get("INNERTUBE_CONTEXT") or {
+            "client": {
+                "clientName": "WEB",
+                "clientVersion": ytcfg.get("INNERTUBE_CLIENT_VERSION", "2.20240101.00.00"),
+            }
+        }
+        response = self.session.post(
+            f"{origin}/youtubei/v1/browse",
+            params=params,
+            json={"context": context, "continuation": token},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def iter_pages(self, playlist_url: str,
+                   on_total: Optional[Callable[[Optional[int], int], None]] = None) -> Iterator[List[list]]:
+        """
+        Produce las filas de cada página de la playlist (inicial y continuaciones)
+
+        Args:
+            playlist_url: URL de la playlist
+            on_total: Callback que recibe el total de la cabecera y los videos ocultos
+                (hidden_count) antes de la primera página
+
+        Raises:
+            ValueError: Si la página no contiene ytInitialData o una continuación
+                no es JSON con la forma esperada
+            requests.HTTPError: Si una petición falla tras los reintentos
+        """
+        parsed = urlparse(playlist_url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+
+        html = self.fetch_page(playlist_url)
+        initial_data = extract_json_var(html, "ytInitialData")
+        if initial_data is None:
+            raise ValueError("No se encontró ytInitialData en la página de la playlist")
+        ytcfg = extract_ytcfg(html)
+        if on_total:
+            on_total(header_total(initial_data), hidden_count(initial_data))
+
+        renderers, token = split_items(initial_items(initial_data))
+        index = 0
+        seen_tokens = set()
+
+        while True:
+            rows = []
+            for renderer in renderers:
+                index += 1
+                rows.append(renderer_to_row(renderer, index, origin))
+            yield rows
+
+            if not token or token in seen_tokens:
+                break
+            seen_tokens.add(token)
+            renderers, token = split_items(
+                continuation_items(self.fetch_continuation(origin, ytcfg, token))
+            )
+
+    def close(self):
+        self.session.close()